@@ -2,3 +2,14 @@ from partomatic.partomatic import *
 from partomatic.automatable_part import *
 from partomatic.partomatic_config import *
 from partomatic.partomatic_preview import *
+from partomatic.tessellation import *
+from partomatic.export_formats import *
+from partomatic.batch import *
+from partomatic.worker_pool import *
+from partomatic.daemon import *
+from partomatic.isolation import *
+from partomatic.sweep import *
+from partomatic.metrics import *
+from partomatic.export_cache import *
+from partomatic.session_pool import *
+from partomatic.single_flight import *
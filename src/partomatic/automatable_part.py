@@ -1,11 +1,30 @@
 __package__ = "partomatic"
 """AutomatablePart holds geometry and export/display metadata."""
 
+from contextlib import ExitStack, contextmanager
+from copy import copy
 from dataclasses import dataclass, field, fields, is_dataclass, MISSING
+from typing import Iterable, Iterator
+import hashlib
+import io
 from pathlib import Path
 from os import getcwd
+from threading import RLock
 
-from build123d import Part, Location
+from build123d import CenterOf, Part, Location
+from OCP.BinTools import BinTools, BinTools_FormatVersion
+from OCP.BRepTools import BRepTools
+
+from partomatic.tessellation import (
+    DEFAULT_ANGULAR_TOLERANCE,
+    DEFAULT_LINEAR_TOLERANCE,
+    TriangleMesh,
+    exact_bounding_box,
+    mesh_shapes,
+    scaled_tolerance,
+    tessellate,
+    triangulation_count,
+)
 
 
 @dataclass
@@ -16,12 +35,32 @@ class AutomatablePart:
         part: a build123d Part object.
         display_location: Placement used when rendering the part.
         stl_folder: Default export folder for generated files.
+        export_paths: Most recent export path for each format name.
+        file_hashes: SHA-256 of each exported file, recorded on release.
+        bounding_box: `((xmin, ymin, zmin), (xmax, ymax, zmax))`, recorded on release.
+        volume: Part volume, recorded on release.
+        metrics: Flat per-part measurements recorded by `measure()`: volume,
+            area, bounding box, center of mass, triangle count and the size
+            of each exported file.
+        mesh_tolerance: Linear mesh tolerance overriding the config's, or None.
+        mesh_angular_tolerance: Angular mesh tolerance overriding the
+            config's, or None.
+        adaptive_mesh_tolerance: Whether `mesh_tolerance` is a fraction of
+            the bounding-box diagonal, overriding the config's, or None.
     """
 
     part: Part = field(default_factory=Part)
     display_location: Location = field(default_factory=Location)
     stl_folder: str = getcwd()
     _file_name_base: str = "partomatic"
+    export_paths: dict[str, Path] = field(default_factory=dict)
+    file_hashes: dict[str, str] = field(default_factory=dict)
+    bounding_box: tuple | None = None
+    volume: float | None = None
+    metrics: dict[str, float] = field(default_factory=dict)
+    mesh_tolerance: float | None = None
+    mesh_angular_tolerance: float | None = None
+    adaptive_mesh_tolerance: bool | None = None
 
     def __init__(
         self,
@@ -29,6 +68,9 @@ class AutomatablePart:
         file_name_base: str,
         display_location: Location | None = None,
         stl_folder: str | None = None,
+        mesh_tolerance: float | None = None,
+        mesh_angular_tolerance: float | None = None,
+        adaptive_mesh_tolerance: bool | None = None,
     ):
         """Initialize an automatable part wrapper.
 
@@ -37,11 +79,26 @@ class AutomatablePart:
             file_name_base: Base file name used during export (extension removed).
             display_location: Placement used when rendering the part.
             stl_folder: Optional export folder. Defaults to current working directory.
+            mesh_tolerance: Optional linear mesh tolerance for this part.
+            mesh_angular_tolerance: Optional angular mesh tolerance for this part.
+            adaptive_mesh_tolerance: Optionally treat `mesh_tolerance` as a
+                fraction of this part's bounding-box diagonal.
         """
 
         self.display_location = Location()
         self.file_name_base = file_name_base
         self.part = part
+        self.export_paths = {}
+        self.file_hashes = {}
+        self.bounding_box = None
+        self.volume = None
+        self.metrics = {}
+        self._geometry_digest = None
+        self._meshes = None
+        self._meshed_at = None
+        self.mesh_tolerance = mesh_tolerance
+        self.mesh_angular_tolerance = mesh_angular_tolerance
+        self.adaptive_mesh_tolerance = adaptive_mesh_tolerance
         if display_location is not None and isinstance(display_location, Location):
             self.display_location = display_location
         if stl_folder is not None and isinstance(stl_folder, str):
@@ -56,3 +113,329 @@ class AutomatablePart:
     def file_name_base(self, value: str):
         """Set the base file name, stripping any extension."""
         self._file_name_base = Path(value).stem
+
+    @property
+    def is_released(self) -> bool:
+        """Whether the geometry has been dropped by `release_geometry()`."""
+        return self.part is None
+
+    def geometry_hash(self) -> str | None:
+        """Return a SHA-256 digest of the part's B-rep geometry.
+
+        The digest ignores any triangulation, so meshing a part does not
+        change it. It is computed once per `part` object and recomputed when
+        `part` is replaced.
+
+        Returns:
+            The hex digest, or None after `release_geometry()`.
+        """
+        if self.part is None:
+            return None
+        cached = getattr(self, "_geometry_digest", None)
+        if cached is not None and cached[0] is self.part:
+            return cached[1]
+        stream = io.BytesIO()
+        BinTools.Write_s(
+            self.part.wrapped,
+            stream,
+            False,
+            False,
+            BinTools_FormatVersion.BinTools_FormatVersion_CURRENT,
+        )
+        digest = hashlib.sha256(stream.getvalue()).hexdigest()
+        self._geometry_digest = (self.part, digest)
+        return digest
+
+    @property
+    def mesh_lock(self) -> RLock:
+        """Lock held while the part's triangulation is changed or read.
+
+        Meshing cleans and rewrites the triangulation stored on the shape,
+        so instances sharing compiled parts, e.g. through a
+        `CompiledPartsCache`, take this lock to keep one thread from
+        cleaning a mesh another is still reading. Use `mesh_locks` to hold
+        the locks of several parts.
+        """
+        # setdefault is atomic, so racing threads end up with one lock
+        return self.__dict__.setdefault("_mesh_lock", RLock())
+
+    def mesh_tolerances(
+        self,
+        tolerance: float = DEFAULT_LINEAR_TOLERANCE,
+        angular_tolerance: float = DEFAULT_ANGULAR_TOLERANCE,
+        adaptive: bool = False,
+    ) -> tuple[float, float, bool]:
+        """Resolve the mesher settings this part is meshed with.
+
+        Settings on the part win over the arguments, which are normally the
+        config's. By default the linear tolerance is relative to each edge,
+        as in build123d's `export_stl`. In adaptive mode it is taken as a
+        fraction of the part's bounding-box diagonal and applied as an
+        absolute deflection, so a long frame member is meshed coarser than
+        a small clip.
+
+        Returns:
+            `(tolerance, angular_tolerance, relative)` for `mesh()` and
+            `triangle_mesh()`.
+        """
+        if self.mesh_tolerance is not None:
+            tolerance = self.mesh_tolerance
+        if self.mesh_angular_tolerance is not None:
+            angular_tolerance = self.mesh_angular_tolerance
+        if self.adaptive_mesh_tolerance is not None:
+            adaptive = self.adaptive_mesh_tolerance
+        if adaptive and self.part is not None:
+            return scaled_tolerance(self.part, tolerance), angular_tolerance, False
+        return tolerance, angular_tolerance, True
+
+    def mesh(
+        self,
+        tolerance: float = DEFAULT_LINEAR_TOLERANCE,
+        angular_tolerance: float = DEFAULT_ANGULAR_TOLERANCE,
+        relative: bool = True,
+        parallel: bool = True,
+    ):
+        """Triangulate the part's B-rep in place with exactly these settings.
+
+        OCC keeps an existing finer triangulation when asked for a coarser
+        one, so a part meshed with other settings is cleaned first. Meshing
+        again with the same settings does nothing. Use `mesh_parts` to mesh
+        several parts in one parallel run.
+
+        Args:
+            tolerance: Linear deflection used by the OCC mesher.
+            angular_tolerance: Angular deflection in radians used by the OCC mesher.
+            relative: Scale `tolerance` by each edge's size, as build123d does.
+            parallel: Mesh faces concurrently on OCC's thread pool.
+
+        Raises:
+            ValueError: After `release_geometry()`.
+        """
+        mesh_parts([(self, (tolerance, angular_tolerance, relative))], parallel)
+
+    def _prepare_mesh(self, settings: tuple[float, float, bool]) -> bool:
+        """Return whether the part needs meshing with `settings`.
+
+        Any other triangulation is cleaned off first, including one the
+        viewer left on the shared shape, since OCC would keep a finer mesh.
+
+        Raises:
+            ValueError: After `release_geometry()`.
+        """
+        if self.part is None:
+            raise ValueError(
+                f"Part {self.file_name_base} was released and cannot be meshed"
+            )
+        if self.part.is_null:
+            return False
+        meshed_at = getattr(self, "_meshed_at", None)
+        if meshed_at is not None and meshed_at[0] is self.part:
+            if meshed_at[1] == settings:
+                return False
+        BRepTools.Clean_s(self.part.wrapped)
+        return True
+
+    def triangle_mesh(
+        self,
+        tolerance: float = DEFAULT_LINEAR_TOLERANCE,
+        angular_tolerance: float = DEFAULT_ANGULAR_TOLERANCE,
+        relative: bool = True,
+    ) -> TriangleMesh:
+        """Return the part's triangle mesh, tessellating it once per setting.
+
+        Meshes are cached per `mesh()` setting for the current `part` object
+        and dropped when `part` is replaced. Tessellating also leaves OCC's
+        triangulation on the part, so `display()` reuses it instead of
+        meshing again.
+
+        Args:
+            tolerance: Linear deflection used by the OCC mesher.
+            angular_tolerance: Angular deflection in radians used by the OCC mesher.
+            relative: Scale `tolerance` by each edge's size, as build123d does.
+
+        Returns:
+            The cached or newly built mesh.
+
+        Raises:
+            ValueError: After `release_geometry()`.
+        """
+        with self.mesh_lock:
+            if self.part is None:
+                raise ValueError(
+                    f"Part {self.file_name_base} was released and cannot be meshed"
+                )
+            cached = getattr(self, "_meshes", None)
+            if cached is None or cached[0] is not self.part:
+                cached = (self.part, {})
+                self._meshes = cached
+            key = (tolerance, angular_tolerance, relative)
+            mesh = cached[1].get(key)
+            if mesh is None:
+                self.mesh(*key)
+                # mesh() just triangulated the part, so only read the buffers
+                mesh = tessellate(self.part, tolerance, angular_tolerance, mesh=False)
+                cached[1][key] = mesh
+            return mesh
+
+    def record_export(self, format_name: str, path: Path):
+        """Remember the file written for an export format."""
+        self.export_paths[format_name] = Path(path)
+
+    def measure(
+        self, mesh_settings: tuple[float, float, bool] | None = None
+    ) -> dict[str, float]:
+        """Record geometric metrics and export file sizes in `metrics`.
+
+        Geometry metrics need the part, so after `release_geometry()` the
+        values recorded at release are returned unchanged. The triangle
+        count is taken from the part's mesh with `mesh_settings`, the same
+        mesh its exports write.
+
+        Args:
+            mesh_settings: `(tolerance, angular_tolerance, relative)` to count
+                triangles at. Defaults to the settings the part was last
+                meshed with, or else its own `mesh_tolerances()`.
+
+        Returns:
+            The updated `metrics` mapping.
+        """
+        with self.mesh_lock:
+            return self._measure(mesh_settings)
+
+    def _measure(
+        self, mesh_settings: tuple[float, float, bool] | None
+    ) -> dict[str, float]:
+        """Body of `measure()`, run with `mesh_lock` held."""
+        if self.part is not None and not self.part.is_null:
+            if mesh_settings is None:
+                meshed_at = getattr(self, "_meshed_at", None)
+                if meshed_at is not None and meshed_at[0] is self.part:
+                    mesh_settings = meshed_at[1]
+                else:
+                    mesh_settings = self.mesh_tolerances()
+            self.mesh(*mesh_settings)
+            box = exact_bounding_box(self.part)
+            self.bounding_box = (
+                (box.min.X, box.min.Y, box.min.Z),
+                (box.max.X, box.max.Y, box.max.Z),
+            )
+            self.volume = self.part.volume
+            center = self.part.center(CenterOf.MASS)
+            self.metrics.update(
+                volume=self.volume,
+                area=self.part.area,
+                bbox_min_x=box.min.X,
+                bbox_min_y=box.min.Y,
+                bbox_min_z=box.min.Z,
+                bbox_max_x=box.max.X,
+                bbox_max_y=box.max.Y,
+                bbox_max_z=box.max.Z,
+                center_x=center.X,
+                center_y=center.Y,
+                center_z=center.Z,
+                triangles=triangulation_count(self.part),
+            )
+        for format_name, path in self.export_paths.items():
+            if path.is_file():
+                self.metrics[f"{format_name}_bytes"] = path.stat().st_size
+        return self.metrics
+
+    def release_geometry(self, mesh_settings: tuple[float, float, bool] | None = None):
+        """Drop the build123d geometry and keep only export metadata.
+
+        Metrics from `measure()` and hashes of recorded export files are
+        captured before the `part` reference is cleared, so batch runs can
+        keep results without holding OCC shapes in memory.
+
+        Args:
+            mesh_settings: Passed to `measure()` for the triangle count.
+        """
+        with self.mesh_lock:
+            if self.part is None:
+                return
+            self.measure(mesh_settings)
+            for format_name, path in self.export_paths.items():
+                if path.is_file():
+                    self.file_hashes[format_name] = _file_sha256(path)
+            self.part = None
+            self._meshes = None
+            self._meshed_at = None
+
+    def __getstate__(self) -> dict:
+        """Return pickle state with the part's modeling history stripped.
+
+        build123d keeps OCC history objects on shapes made by builders; they
+        cannot be pickled and are not needed once a part is compiled, so
+        parts can be returned from worker processes.
+        """
+        state = self.__dict__.copy()
+        # locks cannot be pickled; a copy gets its own on first use
+        state.pop("_mesh_lock", None)
+        # the part keeps its OCC triangulation, so buffers are cheap to rebuild
+        state["_meshes"] = None
+        if getattr(self.part, "_history", None) is not None:
+            part = copy(self.part)
+            part._history = None
+            state["part"] = part
+            for name in ("_geometry_digest", "_meshed_at"):
+                cached = state.get(name)
+                if cached is not None and cached[0] is self.part:
+                    state[name] = (part, cached[1])
+        return state
+
+
+def mesh_parts(
+    parts: Iterable[tuple[AutomatablePart, tuple[float, float, bool]]],
+    parallel: bool = True,
+):
+    """Triangulate several parts, meshing parts that share settings together.
+
+    Parts are grouped by their `(tolerance, angular_tolerance, relative)`
+    settings and each group is meshed in one `mesh_shapes` run, so OCC
+    spreads the faces of every part in the group over its thread pool.
+    Parts already meshed with their settings are skipped.
+
+    Args:
+        parts: `(part, settings)` pairs, e.g. from `AutomatablePart.mesh_tolerances`.
+        parallel: Mesh faces concurrently on OCC's thread pool.
+
+    Raises:
+        ValueError: If any part has been released.
+    """
+    parts = list(parts)
+    with mesh_locks(part for part, _ in parts):
+        groups: dict[tuple[float, float, bool], list[AutomatablePart]] = {}
+        for part, settings in parts:
+            if part._prepare_mesh(settings):
+                groups.setdefault(settings, []).append(part)
+        for settings, group in groups.items():
+            mesh_shapes([part.part for part in group], *settings, parallel=parallel)
+            for part in group:
+                part._meshed_at = (part.part, settings)
+
+
+@contextmanager
+def mesh_locks(parts: Iterable[AutomatablePart]) -> Iterator[None]:
+    """Hold the `mesh_lock` of every part in `parts`.
+
+    Locks are taken in one global order, so threads locking overlapping
+    sets of parts cannot deadlock.
+
+    Args:
+        parts: Parts to lock; duplicates are locked once.
+    """
+    # dataclass equality makes parts unhashable, so dedupe by identity
+    unique = {id(part): part for part in parts}
+    with ExitStack() as stack:
+        for key in sorted(unique):
+            stack.enter_context(unique[key].mesh_lock)
+        yield
+
+
+def _file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,191 @@
+"""Batch builds of one Partomatic class across many configurations."""
+
+from concurrent.futures import Future
+from copy import deepcopy
+from dataclasses import dataclass, field
+from functools import partial
+import gc
+import logging
+from typing import Any, Iterable, Sequence
+
+from partomatic.automatable_part import AutomatablePart
+from partomatic.single_flight import config_hash, shared_single_flight
+
+
+@dataclass
+class BatchResult:
+    """Outcome of building one configuration in a batch.
+
+    Attributes:
+        configuration: The configuration source that was loaded.
+        parts: Exported parts; geometry is released when the batch asks for it.
+        error: Exception raised while building this configuration, if any.
+    """
+
+    configuration: Any
+    parts: list[AutomatablePart] = field(default_factory=list)
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether this configuration compiled and exported successfully."""
+        return self.error is None
+
+
+def _load_batch_configuration(partomatic, configuration):
+    """Load one batch entry; mappings are applied as field overrides."""
+    if isinstance(configuration, dict):
+        partomatic.load_config(None, **configuration)
+    else:
+        partomatic.load_config(configuration)
+
+
+def partomate_batch(
+    partomatic,
+    configurations: Iterable,
+    export_steps: bool = False,
+    formats: Sequence[str] = (),
+    release_geometry: bool = True,
+    collect_garbage: bool = True,
+    stop_on_error: bool = False,
+    pool=None,
+) -> list[BatchResult]:
+    """Compile and export a Partomatic object once per configuration.
+
+    Every variant is loaded into a fresh copy of `partomatic`, so mapping
+    overrides apply to its config alone rather than accumulating from one
+    variant to the next, and `partomatic` itself is left untouched. By
+    default each variant's geometry is dropped as soon as it has been
+    exported, so only paths, hashes, bounding boxes and volumes are retained,
+    and garbage collection runs between variants to free OCC handles.
+
+    Args:
+        partomatic: Partomatic instance whose config every variant starts from.
+        configurations: Configuration sources accepted by `load_config`, or
+            mappings of field overrides.
+        export_steps: When True, also export STEP files.
+        formats: Additional registered export format names to write.
+        release_geometry: Drop each part's geometry after export.
+        collect_garbage: Run `gc.collect()` after each variant.
+        stop_on_error: Re-raise the first build error instead of recording it.
+        pool: Optional `PartomaticWorkerPool`; when given, every variant is
+            built in parallel on the pool's warm workers instead of in
+            this process.
+
+    Returns:
+        One `BatchResult` per configuration, in input order.
+    """
+    if pool is not None:
+        return _partomate_batch_on_pool(
+            partomatic,
+            configurations,
+            pool,
+            export_steps=export_steps,
+            formats=formats,
+            release_geometry=release_geometry,
+            collect_garbage=collect_garbage,
+            stop_on_error=stop_on_error,
+        )
+    results = []
+    for configuration in configurations:
+        try:
+            # copies leave compiled parts behind, like the pool jobs below
+            variant = deepcopy(partomatic)
+            _load_batch_configuration(variant, configuration)
+            variant.partomate(
+                export_steps=export_steps,
+                formats=formats,
+                release_geometry=release_geometry,
+            )
+            results.append(BatchResult(configuration, list(variant.parts)))
+        except Exception as error:
+            if stop_on_error:
+                raise
+            _log_batch_error(configuration, error)
+            results.append(BatchResult(configuration, error=error))
+        finally:
+            if collect_garbage:
+                gc.collect()
+    return results
+
+
+def _log_batch_error(configuration, error: Exception):
+    """Log a recorded batch failure."""
+    logging.getLogger("partomatic").warning(
+        f"batch build failed for {configuration}: {error}"
+    )
+
+
+def _cancel_pending(futures: list):
+    """Cancel pool jobs that have not started yet."""
+    for future in futures:
+        future.cancel()
+
+
+def _partomate_batch_on_pool(
+    partomatic,
+    configurations: Iterable,
+    pool,
+    export_steps: bool,
+    formats: Sequence[str],
+    release_geometry: bool,
+    collect_garbage: bool,
+    stop_on_error: bool,
+) -> list[BatchResult]:
+    """Submit one pool job per configuration and collect results in order.
+
+    Identical variants, within this batch or already building for another
+    caller in this process, share one job through `shared_single_flight()`.
+    """
+    flight = shared_single_flight()
+    submitted = []
+    # jobs started by this batch, the only ones it may cancel
+    started = []
+
+    def start(variant) -> Future:
+        future = pool.submit_partomate(
+            variant,
+            export_steps=export_steps,
+            formats=formats,
+            release_geometry=release_geometry,
+            collect_garbage=collect_garbage,
+        )
+        started.append(future)
+        return future
+
+    for configuration in configurations:
+        # copies leave compiled parts behind, so each job builds one variant
+        variant = deepcopy(partomatic)
+        try:
+            _load_batch_configuration(variant, configuration)
+        except Exception as error:
+            if stop_on_error:
+                _cancel_pending(started)
+                raise
+            submitted.append((configuration, error))
+            continue
+        key = (
+            "partomate",
+            config_hash(variant),
+            export_steps,
+            tuple(formats),
+            release_geometry,
+        )
+        future = flight.submit(key, partial(start, variant))
+        submitted.append((configuration, future))
+
+    results = []
+    for configuration, outcome in submitted:
+        if isinstance(outcome, Exception):
+            _log_batch_error(configuration, outcome)
+            results.append(BatchResult(configuration, error=outcome))
+            continue
+        try:
+            results.append(BatchResult(configuration, list(outcome.result())))
+        except Exception as error:
+            if stop_on_error:
+                _cancel_pending(started)
+                raise
+            _log_batch_error(configuration, error)
+            results.append(BatchResult(configuration, error=error))
+    return results
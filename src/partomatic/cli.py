@@ -0,0 +1,131 @@
+"""Command-line entry point: `partomatic build` and `partomatic daemon`."""
+
+import argparse
+import logging
+import os
+from pathlib import Path
+import sys
+from typing import Sequence
+
+from partomatic.daemon import (
+    BuildService,
+    DaemonUnavailableError,
+    send_daemon_request,
+    serve_daemon,
+)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the `partomatic` command."""
+    parser = argparse.ArgumentParser(
+        prog="partomatic", description="Build and export Partomatic parts."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser(
+        "build",
+        help="compile and export a part",
+        description="Compile and export a part, using the daemon when one is running.",
+    )
+    build.add_argument(
+        "target", help="module:ClassName or path/to/file.py:ClassName to build"
+    )
+    build.add_argument("--config", help="YAML configuration file to load")
+    build.add_argument("--step", action="store_true", help="also export STEP files")
+    build.add_argument(
+        "--format",
+        action="append",
+        default=[],
+        dest="formats",
+        metavar="NAME",
+        help="additional export format, e.g. 3mf or glb; may be repeated",
+    )
+    build.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="always build in this process",
+    )
+    build.add_argument("--socket", help="daemon socket path")
+
+    daemon = commands.add_parser(
+        "daemon",
+        help="run a resident build daemon",
+        description="Keep build123d, part modules and compiled geometry in memory "
+        "and serve `partomatic build` requests over a Unix socket.",
+    )
+    daemon.add_argument("--socket", help="socket path to listen on")
+    daemon.add_argument(
+        "--stop", action="store_true", help="stop a running daemon and exit"
+    )
+    return parser
+
+
+def _build_request(arguments: argparse.Namespace) -> dict:
+    """Turn `build` arguments into a daemon request."""
+    configuration = arguments.config
+    if configuration is not None:
+        configuration = str(Path(configuration).resolve())
+    target = arguments.target
+    module_ref, separator, class_name = target.rpartition(":")
+    if separator and module_ref.endswith(".py"):
+        target = f"{Path(module_ref).resolve()}:{class_name}"
+    return {
+        "command": "build",
+        "target": target,
+        "config": configuration,
+        "export_steps": arguments.step,
+        "formats": arguments.formats,
+        "cwd": os.getcwd(),
+    }
+
+
+def _run_build(arguments: argparse.Namespace) -> int:
+    """Forward a build to the daemon, or run it here when none is running."""
+    request = _build_request(arguments)
+    response = None
+    if not arguments.no_daemon:
+        try:
+            response = send_daemon_request(request, arguments.socket)
+        except DaemonUnavailableError as error:
+            logging.getLogger("partomatic").debug(f"{error}; building in-process")
+    if response is None:
+        response = BuildService().handle(request)
+
+    if not response["ok"]:
+        print(f"partomatic: {response['error']}", file=sys.stderr)
+        return 1
+    for paths in response["exports"].values():
+        for path in paths:
+            print(path)
+    return 0
+
+
+def _run_daemon(arguments: argparse.Namespace) -> int:
+    """Serve build requests, or stop a running daemon."""
+    if arguments.stop:
+        try:
+            send_daemon_request({"command": "shutdown"}, arguments.socket)
+        except DaemonUnavailableError as error:
+            print(f"partomatic: {error}", file=sys.stderr)
+            return 1
+        return 0
+    try:
+        serve_daemon(arguments.socket)
+    except RuntimeError as error:
+        print(f"partomatic: {error}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the `partomatic` command and return its exit status."""
+    arguments = _build_parser().parse_args(argv)
+    if arguments.command == "daemon":
+        return _run_daemon(arguments)
+    return _run_build(arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
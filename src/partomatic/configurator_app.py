@@ -13,15 +13,23 @@ if __name__ == "__main__":
     if src_root not in sys.path:
         sys.path.insert(0, src_root)
 
+import asyncio
 import socket
+from dataclasses import dataclass
+from functools import partial
 import io
 import inspect
 from pathlib import Path
-import tempfile
-from urllib.parse import urlparse
-import zipfile
-
-from nicegui import ui
+import secrets
+from threading import Lock
+import time
+from typing import AsyncIterator, Callable, Iterator
+from urllib.parse import urlparse, urlunparse
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+from nicegui import app, run, ui
 from pydantic import ValidationError
 import yaml
 
@@ -31,11 +39,23 @@ from partomatic.config_editor_app import (
     _component_value,
     _to_yaml_document,
 )
+from partomatic.export_cache import (
+    DEFAULT_EXPORT_CACHE_SIZE,
+    ExportCache,
+    iter_file_chunks,
+)
+from partomatic.export_formats import get_export_format, registered_export_formats
 from partomatic.partomatic_preview import PreviewState
 from partomatic.partomatic_preview_app import (
     _ensure_viewer_running,
     _viewer_embed_url,
 )
+from partomatic.session_pool import (
+    CompiledPartsCache,
+    PartomaticSessionPool,
+    ViewerPortPool,
+)
+from partomatic.worker_pool import shared_worker_pool
 
 # ---------------------------------------------------------------------------
 # Port utilities
@@ -121,23 +141,278 @@ def _apply_values_to_component_tree(component_tree: dict, values: dict):
             target.value = value
 
 
-def _download_payload_from_paths(
-    exported_paths: list[Path],
+STREAMED_DOWNLOAD_PATH = "/_partomatic/download"
+# seconds a registered download waits for the browser before it is dropped
+STREAMED_DOWNLOAD_TTL = 300.0
+# most downloads waiting at once; the oldest is dropped to make room
+MAX_STREAMED_DOWNLOADS = 64
+
+
+@dataclass
+class _StreamedDownload:
+    """A registered download waiting to be fetched."""
+
+    chunks: Iterator[bytes]
+    filename: str
+    media_type: str
+    owner: str | None
+    expires: float
+
+
+# downloads waiting for the browser to fetch them, by URL token, oldest first
+_streamed_downloads: dict[str, _StreamedDownload] = {}
+_streamed_downloads_lock = Lock()
+
+
+def _close_chunks(chunks: Iterator[bytes]):
+    """Close a download's chunk iterator, releasing any file it holds."""
+    close = getattr(chunks, "close", None)
+    if close is not None:
+        close()
+
+
+class _ReportedChunks:
+    """Chunks of a streamed zip export that report progress as they are sent.
+
+    `iter_export_zip` yields once per exported part and then the archive
+    directory, so each of the first `total` chunks is one more part done.
+    The response pulls chunks on a worker thread, so callbacks are handed
+    to the event loop of the page that started the download.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterator[bytes],
+        total: int,
+        loop: asyncio.AbstractEventLoop,
+        on_progress: Callable[[int, int], None] | None = None,
+        on_finished: Callable[[BaseException | None], None] | None = None,
+    ):
+        self._chunks = chunks
+        self._total = total
+        self._done = 0
+        self._loop = loop
+        self._on_progress = on_progress
+        self._on_finished = on_finished
+        self._finished = False
+
+    def __iter__(self) -> "_ReportedChunks":
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._finish(None)
+            raise
+        except Exception as error:
+            self._finish(error)
+            raise
+        if self._done < self._total:
+            self._done += 1
+            self._report(self._on_progress, self._done, self._total)
+        return chunk
+
+    def close(self):
+        """Close the export, e.g. when the download is dropped or abandoned."""
+        _close_chunks(self._chunks)
+        self._finish(None)
+
+    def _finish(self, error: BaseException | None):
+        """Report the end of the stream once."""
+        if not self._finished:
+            self._finished = True
+            self._report(self._on_finished, error)
+
+    def _report(self, callback: Callable | None, *args):
+        """Run `callback(*args)` on the page's event loop."""
+        if callback is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # the loop has shut down, so nobody is waiting for the report
+            pass
+
+
+async def _iterate_and_close(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Pull `chunks` on a worker thread and close them however the response ends."""
+    try:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+    finally:
+        _close_chunks(chunks)
+
+
+def _expire_streamed_downloads(now: float) -> list[_StreamedDownload]:
+    """Remove and return downloads past their expiry; hold the lock to call."""
+    expired = []
+    while _streamed_downloads:
+        token, entry = next(iter(_streamed_downloads.items()))
+        if entry.expires > now:
+            break
+        expired.append(_streamed_downloads.pop(token))
+    return expired
+
+
+@app.get(STREAMED_DOWNLOAD_PATH + "/{token}")
+def _streamed_download(token: str) -> StreamingResponse:
+    """Serve a registered download once, streaming its chunks as they are made."""
+    with _streamed_downloads_lock:
+        expired = _expire_streamed_downloads(time.monotonic())
+        entry = _streamed_downloads.pop(token, None)
+    for stale in expired:
+        _close_chunks(stale.chunks)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Download not found")
+    return StreamingResponse(
+        _iterate_and_close(entry.chunks),
+        media_type=entry.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{entry.filename}"'},
+    )
+
+
+def _register_streamed_download(
+    chunks: Iterator[bytes],
+    filename: str,
+    media_type: str,
+    owner: str | None = None,
+) -> str:
+    """Register chunks for `_streamed_download` and return their relative URL.
+
+    Downloads not fetched within `STREAMED_DOWNLOAD_TTL` seconds are
+    dropped, as is the oldest one when `MAX_STREAMED_DOWNLOADS` are already
+    waiting; dropped chunk iterators are closed.
+
+    Args:
+        chunks: Payload chunks, closed if the download is dropped unfetched.
+        filename: Name the browser saves the download as.
+        media_type: Content type of the payload.
+        owner: Session the download belongs to, for
+            `_drop_streamed_downloads`.
+    """
+    token = secrets.token_urlsafe(16)
+    now = time.monotonic()
+    with _streamed_downloads_lock:
+        dropped = _expire_streamed_downloads(now)
+        while len(_streamed_downloads) >= MAX_STREAMED_DOWNLOADS:
+            dropped.append(_streamed_downloads.pop(next(iter(_streamed_downloads))))
+        _streamed_downloads[token] = _StreamedDownload(
+            chunks, filename, media_type, owner, now + STREAMED_DOWNLOAD_TTL
+        )
+    for entry in dropped:
+        _close_chunks(entry.chunks)
+    return f"{STREAMED_DOWNLOAD_PATH}/{token}"
+
+
+def _drop_streamed_downloads(owner: str):
+    """Drop and close every unfetched download registered for `owner`."""
+    with _streamed_downloads_lock:
+        tokens = [
+            token
+            for token, entry in _streamed_downloads.items()
+            if entry.owner == owner
+        ]
+        dropped = [_streamed_downloads.pop(token) for token in tokens]
+    for entry in dropped:
+        _close_chunks(entry.chunks)
+
+
+async def _download_for_export(
+    partomatic,
+    kind: str,
     zip_filename: str,
-    single_media_type: str,
-) -> tuple[bytes, str, str]:
-    """Build download payload bytes for one file or a zipped multi-file export."""
-    if not exported_paths:
+    export_cache: ExportCache | None = None,
+    cache_key: str | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    owner: str | None = None,
+    on_finished: Callable[[BaseException | None], None] | None = None,
+) -> tuple[bytes | str, str, str]:
+    """Export every compiled part in the named format as a background job.
+
+    Exports run on worker threads, so the event loop, and every other
+    session on the server, stays responsive while OCC writes large STEP
+    files. A single part is written into an in-memory buffer before this
+    returns. Several parts are not exported yet: the returned URL streams a
+    zip straight from `iter_export_zip`, exporting each part as the browser
+    downloads the one before, and progress is reported as parts are sent.
+    With an `export_cache`, the payload is also stored under `cache_key`
+    once it has been sent in full.
+
+    Args:
+        partomatic: Compiled Partomatic instance to export.
+        kind: Registered export format name, such as "stl" or "step".
+        zip_filename: Download file name used when there are several parts.
+        export_cache: Optional cache to store the finished payload in.
+        cache_key: Key of the payload in `export_cache`.
+        on_progress: Called on the event loop with `(parts_done, parts_total)`
+            after each part is exported.
+        owner: Session the streamed download belongs to.
+        on_finished: Called on the event loop once every part has been
+            exported, with None, or with the error that stopped the export.
+            A zip that is dropped unfetched or abandoned by the browser
+            also finishes with None.
+
+    Returns:
+        `(payload, filename, media_type)`, where `payload` is the file bytes
+        or the relative URL of a streamed zip archive.
+
+    Raises:
+        ValueError: If there are no compiled parts.
+    """
+    parts = list(partomatic.parts)
+    if not parts:
         raise ValueError("No files were generated for download")
-    if len(exported_paths) == 1:
-        export_path = exported_paths[0]
-        return export_path.read_bytes(), export_path.name, single_media_type
+    total = len(parts)
+    if total == 1:
+        buffer = io.BytesIO()
+        exported_name = await run.io_bound(
+            partomatic.export_to_stream, kind, parts[0], buffer
+        )
+        # browsers save downloads by base name; a file_prefix folder would be lost
+        filename = Path(exported_name).name
+        if on_progress is not None:
+            on_progress(1, 1)
+        if export_cache is not None:
+            export_cache.put(cache_key, filename, buffer.getvalue())
+        if on_finished is not None:
+            on_finished(None)
+        return buffer.getvalue(), filename, get_export_format(kind).media_type
+    chunks = partomatic.iter_export_zip(kind)
+    if export_cache is not None:
+        chunks = export_cache.store_chunks(cache_key, zip_filename, chunks)
+    chunks = _ReportedChunks(
+        chunks, total, asyncio.get_running_loop(), on_progress, on_finished
+    )
+    url = _register_streamed_download(chunks, zip_filename, "application/zip", owner)
+    return url, zip_filename, "application/zip"
+
+
+def _cached_download(
+    export_cache: ExportCache, cache_key: str, kind: str, owner: str | None = None
+) -> tuple[str, str, str] | None:
+    """Return a streamed download of a cached payload, or None on a miss."""
+    cached_path = export_cache.get(cache_key)
+    if cached_path is None:
+        return None
+    filename = ExportCache.file_name(cached_path)
+    media_type = (
+        "application/zip"
+        if filename.endswith(".zip")
+        else get_export_format(kind).media_type
+    )
+    url = _register_streamed_download(
+        iter_file_chunks(cached_path), filename, media_type, owner
+    )
+    return url, filename, media_type
 
-    buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
-        for export_path in exported_paths:
-            archive.write(export_path, arcname=export_path.name)
-    return buffer.getvalue(), zip_filename, "application/zip"
+
+def _viewer_url_with_port(viewer_url: str, port: int) -> str:
+    """Return `viewer_url` pointing at another port on the same host."""
+    parsed = urlparse(viewer_url)
+    return urlunparse(
+        parsed._replace(netloc=f"{parsed.hostname or '127.0.0.1'}:{port}")
+    )
 
 
 def find_available_port(
@@ -183,6 +458,14 @@ def run_configurator(
     host: str = "localhost",
     port: int = 8505,
     port_retries: int = MAX_PORT_RETRIES,
+    compile_timeout: float | None = None,
+    compile_memory_limit: int | None = None,
+    export_cache_size: int = DEFAULT_EXPORT_CACHE_SIZE,
+    max_sessions: int = 32,
+    session_idle_timeout: float = 1800.0,
+    max_cached_builds: int = 16,
+    compile_workers: int | None = 0,
+    max_viewers: int = 8,
 ):
     """Launch the combined configurator window.
 
@@ -190,12 +473,38 @@ def run_configurator(
     Right panel: OCP viewer iframe.
     Re-render button: applies config to the Partomatic object and triggers a display.
 
+    Each browser session edits its own copy of `partomatic`, taken from a
+    bounded `PartomaticSessionPool`, and renders into its own standalone OCP
+    viewer on a port from a `ViewerPortPool` starting at the viewer URL's
+    port. Compiled geometry is shared between sessions by config, so a
+    configuration compiled for one user is reused for everyone else.
+
     Args:
-        partomatic: Partomatic instance to configure, compile, preview, and export.
+        partomatic: Partomatic instance whose config every session starts from.
         spec: UI specification containing class name, viewer URL, and config spec.
         host: Hostname/interface for the NiceGUI server.
         port: Preferred starting port for the NiceGUI server.
         port_retries: Additional ports to try if `port` is unavailable.
+        compile_timeout: When set, compile in a child process that is killed
+            after this many seconds instead of in the server process.
+        compile_memory_limit: Optional `RLIMIT_AS` cap in bytes for isolated
+            compiles.
+        export_cache_size: Bytes of disk used to cache downloads by config
+            and format, evicting the least recently used; 0 disables the
+            cache.
+        max_sessions: Most browser sessions with their own Partomatic
+            instance; the least recently used session is dropped beyond this.
+        session_idle_timeout: Seconds a session may go unused before its
+            instance is dropped.
+        max_cached_builds: Compiled configurations kept for reuse across
+            sessions.
+        compile_workers: Worker processes that compile for every session,
+            from `shared_worker_pool()`; `None` uses one per CPU core and 0
+            compiles in the server process. Ignored for compiles isolated
+            by `compile_timeout` or `compile_memory_limit`.
+        max_viewers: Standalone viewers started for sessions, on consecutive
+            ports from the viewer URL's port; beyond this, the least
+            recently used session's viewer is handed to the new session.
 
     Returns:
         None. This function starts the NiceGUI app server.
@@ -205,14 +514,28 @@ def run_configurator(
     root_node = config_spec.get("root_node", "config")
     fields_spec = config_spec.get("fields", {})
     viewer_url = spec.get("viewer_url", "http://127.0.0.1:3939")
-    embed_url = _viewer_embed_url(viewer_url)
     parsed_viewer_url = urlparse(viewer_url)
     viewer_host = parsed_viewer_url.hostname or "127.0.0.1"
     viewer_port = parsed_viewer_url.port or 3939
 
     model = _build_model(f"{class_name}EditorModel", fields_spec)
-
-    _ensure_viewer_running(viewer_url)
+    export_cache = (
+        ExportCache(max_bytes=export_cache_size) if export_cache_size else None
+    )
+    sessions = PartomaticSessionPool(
+        partomatic,
+        max_sessions=max_sessions,
+        idle_timeout=session_idle_timeout,
+        compiled_parts=CompiledPartsCache(max_cached_builds),
+    )
+    viewers = ViewerPortPool(viewer_port, max_viewers=max_viewers)
+    compile_pool = (
+        None
+        if compile_workers == 0
+        else shared_worker_pool(
+            max_workers=compile_workers, preload_modules=[type(partomatic)]
+        )
+    )
 
     port = find_available_port(host=host, start_port=port, retries=port_retries)
 
@@ -220,6 +543,35 @@ def run_configurator(
         """Build the combined configurator and preview interface."""
         ui.page_title("configurator")
         step_download_item = None
+        session_id = ui.context.client.id
+        # the port the viewer iframe currently shows
+        shown_viewer = {"port": None}
+
+        def _forget_session():
+            """Free the session's viewer and drop downloads it never fetched."""
+            viewers.release(session_id)
+            # downloads the browser never fetched would hold their files open
+            _drop_streamed_downloads(session_id)
+
+        ui.context.client.on_delete(_forget_session)
+
+        async def _session_viewer() -> tuple[int, bool]:
+            """Start this session's viewer if needed and point the iframe at it.
+
+            Returns:
+                tuple[int, bool]: The viewer port, and whether the iframe was
+                    just pointed at it, so everything must be sent again.
+            """
+            session_port = viewers.acquire(session_id)
+            session_url = _viewer_url_with_port(viewer_url, session_port)
+            await run.io_bound(_ensure_viewer_running, session_url)
+            if shown_viewer["port"] == session_port:
+                return session_port, False
+            shown_viewer["port"] = session_port
+            viewer_frame.props(
+                f'src="{_viewer_embed_url(session_url)}" title="OCP Viewer"'
+            )
+            return session_port, True
 
         # top bar
         with ui.row().classes("w-full items-center px-6 py-3 bg-slate-800"):
@@ -268,6 +620,7 @@ def run_configurator(
                     Returns:
                         bool: True when STEP exports are enabled in the active config.
                     """
+                    partomatic = sessions.acquire(session_id)
                     return bool(
                         output_data.get(
                             "enable_step_exports",
@@ -298,49 +651,87 @@ def run_configurator(
                         media_type="application/x-yaml",
                     )
 
-                def _download_export(kind: str):
-                    """Compile and download generated geometry files.
+                async def _download_export(kind: str):
+                    """Compile and download generated geometry files in the background.
+
+                    Compiling and exporting run on worker threads while an
+                    ongoing notification reports how many parts are done. A
+                    single part downloads once it is exported; a zip of
+                    several starts downloading at once and the notification
+                    follows the parts as they are streamed.
 
                     Args:
-                        kind: Export file type, either "stl" or "step".
+                        kind: Registered export format name, such as "stl" or "step".
                     """
                     output_data, ok = _current_validated()
                     if not ok:
                         return
+                    partomatic = sessions.acquire(session_id)
+                    notification = None
                     try:
                         partomatic._config.update_from_mapping(output_data)
                         partomatic.invalidate_preview()
-                        if partomatic.is_dirty:
-                            partomatic.compile()
-                        partomatic.display(
-                            viewer_host=viewer_host,
-                            viewer_port=viewer_port,
-                        )
-                        with tempfile.TemporaryDirectory(
-                            prefix=f"partomatic-{kind}-"
-                        ) as export_dir:
-                            if kind == "stl":
-                                exported_paths = partomatic.export_stls_to_directory(
-                                    export_dir
-                                )
-                                payload, filename, media_type = (
-                                    _download_payload_from_paths(
-                                        [Path(path) for path in exported_paths],
-                                        f"{root_node}-stls.zip",
-                                        "model/stl",
-                                    )
-                                )
-                            else:
-                                exported_paths = partomatic.export_steps_to_directory(
-                                    export_dir
-                                )
-                                payload, filename, media_type = (
-                                    _download_payload_from_paths(
-                                        [Path(path) for path in exported_paths],
-                                        f"{root_node}-steps.zip",
-                                        "model/step",
-                                    )
+                        cache_key = None
+                        download = None
+                        if export_cache is not None:
+                            cache_key = export_cache.key(partomatic, kind)
+                            download = _cached_download(
+                                export_cache, cache_key, kind, owner=session_id
+                            )
+                        if download is None:
+                            label = get_export_format(kind).label
+                            notification = ui.notification(
+                                f"Compiling for {label} export...",
+                                type="ongoing",
+                                spinner=True,
+                                timeout=None,
+                            )
+                            await run.io_bound(
+                                sessions.compiled_parts.compile_for_preview,
+                                partomatic,
+                                timeout=compile_timeout,
+                                memory_limit=compile_memory_limit,
+                                pool=compile_pool,
+                            )
+                            session_port, new_viewer = await _session_viewer()
+                            await run.io_bound(
+                                partomatic.display,
+                                viewer_host=viewer_host,
+                                viewer_port=session_port,
+                                force=new_viewer,
+                            )
+
+                            progress = notification
+
+                            def _show_progress(done: int, total: int):
+                                progress.message = (
+                                    f"Exported {done} of {total} {label} parts"
                                 )
+
+                            def _finish_export(error: BaseException | None):
+                                if error is None:
+                                    progress.dismiss()
+                                    return
+                                validation_label.set_text(f"Export error: {error}")
+                                progress.message = f"Export failed: {error}"
+                                progress.type = "negative"
+                                progress.spinner = False
+                                progress.close_button = True
+
+                            _show_progress(0, len(partomatic.parts))
+                            download = await _download_for_export(
+                                partomatic,
+                                kind,
+                                f"{root_node}-{kind}s.zip",
+                                export_cache=export_cache,
+                                cache_key=cache_key,
+                                on_progress=_show_progress,
+                                owner=session_id,
+                                on_finished=_finish_export,
+                            )
+                            # _finish_export closes it, maybe after the zip is sent
+                            notification = None
+                        payload, filename, media_type = download
                         ui.download(
                             payload,
                             filename=filename,
@@ -350,6 +741,9 @@ def run_configurator(
                     except Exception as ex:
                         validation_label.set_text(f"Export error: {ex}")
                         ui.notify(f"Export failed: {ex}", type="negative")
+                    finally:
+                        if notification is not None:
+                            notification.dismiss()
 
                 async def _load_yaml_upload(upload_event):
                     """Load uploaded YAML into form controls and trigger a render.
@@ -365,7 +759,7 @@ def run_configurator(
                         _apply_values_to_component_tree(component_tree, output_data)
                         validation_label.set_text("")
                         on_field_change()
-                        _trigger_render()
+                        await _trigger_render()
                         file_name = getattr(upload_event, "name", None)
                         if file_name is None:
                             file_name = getattr(
@@ -423,14 +817,24 @@ def run_configurator(
                             "STEP Files",
                             on_click=lambda: _download_export("step"),
                         )
+                        for export_format in registered_export_formats():
+                            if export_format.name in ("stl", "step"):
+                                continue
+                            ui.menu_item(
+                                f"{export_format.label} Files",
+                                on_click=partial(_download_export, export_format.name),
+                            )
 
             # right column: viewer iframe
             with ui.column().classes("w-2/3 relative p-0"):
 
-                # OCP viewer embedded in an iframe
-                ui.element("iframe").props(
-                    f'src="{embed_url}" title="OCP Viewer"'
-                ).style("width:100%;height:calc(100vh - 56px);border:0;")
+                # OCP viewer embedded in an iframe, pointed at the session's
+                # viewer once it is running
+                viewer_frame = (
+                    ui.element("iframe")
+                    .props('title="OCP Viewer"')
+                    .style("width:100%;height:calc(100vh - 56px);border:0;")
+                )
 
                 # Dirty state overlay (badge removed, overlay retained).
                 dirty_overlay = (
@@ -450,8 +854,20 @@ def run_configurator(
 
         def _sync_overlay_state():
             """Show or hide the dirty-state overlay based on preview status."""
+            partomatic = sessions.acquire(session_id)
             dirty_overlay.set_visibility(partomatic.preview_state == PreviewState.DIRTY)
 
+        def _show_feasibility() -> bool:
+            """Show failed feasibility predicates for the applied config.
+
+            Returns:
+                bool: True when the config passes every feasibility predicate.
+            """
+            violations = sessions.acquire(session_id)._config.feasibility_violations()
+            if violations:
+                validation_label.set_text("\n".join(violations))
+            return not violations
+
         def on_field_change(_event=None):
             """Apply form edits to config and update dependent UI state.
 
@@ -463,8 +879,10 @@ def run_configurator(
             if not ok:
                 _sync_overlay_state()
                 return
+            partomatic = sessions.acquire(session_id)
             partomatic._config.update_from_mapping(output_data)
             partomatic.invalidate_preview()
+            _show_feasibility()
             _sync_overlay_state()
 
         for component in form_state.values():
@@ -474,18 +892,39 @@ def run_configurator(
         # seed YAML preview and show dirty state on first load
         on_field_change()
 
-        def _trigger_render():
-            """Compile and display the part using current validated form values."""
+        async def _trigger_render(force: bool = False):
+            """Compile and display the part using current validated form values.
+
+            The compile runs on the I/O thread pool, or on `compile_pool`
+            workers, and the viewer update on the I/O thread pool, so other
+            sessions stay responsive while they run.
+
+            Args:
+                force: Resend every part even if the viewer already shows them.
+            """
             output_data, ok = _current_validated()
             if not ok:
                 return
+            partomatic = sessions.acquire(session_id)
             try:
                 partomatic._config.update_from_mapping(output_data)
                 partomatic.invalidate_preview()
-                partomatic.compile_for_preview()
-                partomatic.display(
+                if not _show_feasibility():
+                    _sync_overlay_state()
+                    return
+                await run.io_bound(
+                    sessions.compiled_parts.compile_for_preview,
+                    partomatic,
+                    timeout=compile_timeout,
+                    memory_limit=compile_memory_limit,
+                    pool=compile_pool,
+                )
+                session_port, new_viewer = await _session_viewer()
+                await run.io_bound(
+                    partomatic.display,
                     viewer_host=viewer_host,
-                    viewer_port=viewer_port,
+                    viewer_port=session_port,
+                    force=force or new_viewer,
                 )
                 _sync_overlay_state()
             except Exception as ex:
@@ -495,7 +934,8 @@ def run_configurator(
                 _sync_overlay_state()
 
         # initial render on load
-        ui.timer(1.5, lambda: _trigger_render(), once=True)
+        # a new page may be showing a restarted viewer, so send everything
+        ui.timer(1.5, lambda: _trigger_render(force=True), once=True)
 
     ui.run(
         host=host,
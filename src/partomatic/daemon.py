@@ -0,0 +1,333 @@
+"""Resident build daemon that keeps modules and compiled geometry in memory."""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import getpass
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+import os
+from pathlib import Path
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+from typing import Sequence
+
+SOCKET_ENVIRONMENT_VARIABLE = "PARTOMATIC_DAEMON_SOCKET"
+
+
+class DaemonUnavailableError(ConnectionError):
+    """Raised when no build daemon is listening on the requested socket."""
+
+
+def default_socket_path() -> Path:
+    """Return the daemon socket path for the current user.
+
+    The `PARTOMATIC_DAEMON_SOCKET` environment variable overrides the default
+    location in the system temporary directory.
+    """
+    configured = os.environ.get(SOCKET_ENVIRONMENT_VARIABLE)
+    if configured:
+        return Path(configured)
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    return Path(tempfile.gettempdir()) / f"partomatic-{user}.sock"
+
+
+def _check_socket_owner(socket_path: Path):
+    """Refuse a socket path that is not a socket owned by the current user.
+
+    The default path lives in the shared temporary directory, where another
+    user could create it first and answer our build requests.
+
+    Raises:
+        DaemonUnavailableError: If nothing exists at `socket_path`, or it is
+            not a socket owned by the current user.
+    """
+    try:
+        status = socket_path.lstat()
+    except FileNotFoundError:
+        raise DaemonUnavailableError(f"No partomatic daemon at {socket_path}") from None
+    if not stat.S_ISSOCK(status.st_mode) or (
+        hasattr(os, "getuid") and status.st_uid != os.getuid()
+    ):
+        raise DaemonUnavailableError(
+            f"{socket_path} is not a partomatic daemon socket owned by this user"
+        )
+
+
+@contextmanager
+def _working_directory(path: str | None):
+    """Temporarily change into the directory a build request came from."""
+    if path is None:
+        yield
+        return
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _load_module_from_file(module_name: str, path: Path):
+    """Execute a source file as a module registered under `module_name`."""
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class BuildService:
+    """Resolve build targets and run builds, caching modules and geometry.
+
+    Targets are `package.module:ClassName` or `path/to/file.py:ClassName`.
+    Modules stay imported between builds and are reloaded when their source
+    file changes; compiled parts are kept for the most recent
+    configurations, so rebuilding an unchanged configuration only exports.
+
+    Args:
+        max_cached_builds: How many compiled configurations to keep.
+    """
+
+    def __init__(self, max_cached_builds: int = 16):
+        self.max_cached_builds = max_cached_builds
+        self._module_mtimes: dict[str, float] = {}
+        self._compiled_parts: OrderedDict = OrderedDict()
+
+    def _module_for_target(self, module_ref: str):
+        """Import, or reload when its source changed, the module of a target."""
+        if module_ref.endswith(".py"):
+            path = Path(module_ref).resolve()
+            digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:12]
+            module_name = f"_partomatic_target_{path.stem}_{digest}"
+            if str(path.parent) not in sys.path:
+                sys.path.insert(0, str(path.parent))
+        else:
+            module_name = module_ref
+            path = None
+            # match `python -m`: modules next to the caller are importable
+            if os.getcwd() not in sys.path:
+                sys.path.insert(0, os.getcwd())
+
+        module = sys.modules.get(module_name)
+        source = getattr(module, "__file__", None)
+        if source and os.path.getmtime(source) == self._module_mtimes.get(module_name):
+            return module
+        if path is not None:
+            module = _load_module_from_file(module_name, path)
+        elif module is None:
+            module = importlib.import_module(module_name)
+        elif source and module_name in self._module_mtimes:
+            module = importlib.reload(module)
+        if getattr(module, "__file__", None):
+            self._module_mtimes[module_name] = os.path.getmtime(module.__file__)
+        return module
+
+    def resolve_target(self, target: str) -> type:
+        """Return the Partomatic subclass named by `target`.
+
+        Raises:
+            ValueError: If `target` is not `module:ClassName` or the class
+                cannot be found.
+        """
+        module_ref, separator, class_name = target.rpartition(":")
+        if not separator or not module_ref or not class_name:
+            raise ValueError(
+                f"Build target {target} must look like module:ClassName "
+                "or path/to/file.py:ClassName"
+            )
+        module = self._module_for_target(module_ref)
+        try:
+            return getattr(module, class_name)
+        except AttributeError:
+            raise ValueError(
+                f"Module {module_ref} has no class named {class_name}"
+            ) from None
+
+    def build(
+        self,
+        target: str,
+        configuration: str | None = None,
+        export_steps: bool = False,
+        formats: Sequence[str] = (),
+    ) -> dict[str, list[str]]:
+        """Build one target and return the exported paths by format name.
+
+        Args:
+            target: `module:ClassName` or `path/to/file.py:ClassName`.
+            configuration: Optional configuration source for `load_config`.
+            export_steps: When True, also export STEP files.
+            formats: Additional registered export format names to write.
+        """
+        partomatic_class = self.resolve_target(target)
+        partomatic = partomatic_class(configuration)
+        cache_key = (
+            partomatic_class,
+            json.dumps(partomatic._config_snapshot(), sort_keys=True, default=str),
+        )
+        cached_parts = self._compiled_parts.get(cache_key)
+        if cached_parts is not None:
+            self._compiled_parts.move_to_end(cache_key)
+            partomatic.parts = cached_parts
+            partomatic._mark_compiled()
+        partomatic.partomate(
+            export_steps=export_steps, formats=formats, reuse_compiled=True
+        )
+        self._compiled_parts[cache_key] = partomatic.parts
+        while len(self._compiled_parts) > self.max_cached_builds:
+            self._compiled_parts.popitem(last=False)
+
+        exported = {}
+        for part in partomatic.parts:
+            for format_name, path in part.export_paths.items():
+                exported.setdefault(format_name, []).append(str(path))
+        return exported
+
+    def handle(self, request: dict) -> dict:
+        """Run one JSON request and return its JSON response."""
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if command != "build":
+            return {"ok": False, "error": f"Unknown daemon command {command}"}
+        try:
+            with _working_directory(request.get("cwd")):
+                exported = self.build(
+                    request["target"],
+                    configuration=request.get("config"),
+                    export_steps=request.get("export_steps", False),
+                    formats=request.get("formats", ()),
+                )
+        except Exception as error:
+            logging.getLogger("partomatic").warning(f"daemon build failed: {error}")
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+        return {"ok": True, "exports": exported}
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Read one JSON request line and write one JSON response line."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            response = {"ok": False, "error": f"Malformed request: {error}"}
+        else:
+            if request.get("command") == "shutdown":
+                response = {"ok": True}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                response = self.server.build_service.handle(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def send_daemon_request(
+    request: dict, socket_path: str | Path | None = None, timeout: float | None = None
+) -> dict:
+    """Send one request to a running daemon and return its response.
+
+    Raises:
+        DaemonUnavailableError: If no daemon owned by the current user is
+            listening on `socket_path`, or it does not answer with a
+            well-formed response.
+    """
+    socket_path = Path(socket_path or default_socket_path())
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonUnavailableError(f"No partomatic daemon at {socket_path}")
+    _check_socket_owner(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        try:
+            connection.connect(str(socket_path))
+        except OSError as error:
+            raise DaemonUnavailableError(
+                f"No partomatic daemon at {socket_path}"
+            ) from error
+        try:
+            connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with connection.makefile("rb") as stream:
+                line = stream.readline()
+        except OSError as error:
+            raise DaemonUnavailableError(
+                f"The partomatic daemon at {socket_path} did not respond: {error}"
+            ) from error
+    if not line:
+        raise DaemonUnavailableError(
+            f"The partomatic daemon at {socket_path} closed the connection "
+            "without responding"
+        )
+    try:
+        return json.loads(line)
+    except ValueError as error:
+        raise DaemonUnavailableError(
+            f"The partomatic daemon at {socket_path} sent a malformed response"
+        ) from error
+
+
+def serve_daemon(
+    socket_path: str | Path | None = None,
+    preload_modules: Sequence[str] = ("build123d", "OCP"),
+):
+    """Run the build daemon until it receives a `shutdown` request.
+
+    Requests are handled one at a time, each in the working directory of the
+    client that sent it, so relative export folders behave as they would
+    in-process.
+
+    Args:
+        socket_path: Unix socket to listen on; defaults to
+            `default_socket_path()`.
+        preload_modules: Modules imported before accepting requests.
+
+    Raises:
+        RuntimeError: If Unix sockets are unavailable, another daemon is
+            already listening on `socket_path`, or something not owned by the
+            current user is in its place.
+    """
+    if not hasattr(socketserver, "UnixStreamServer"):
+        raise RuntimeError("The partomatic daemon requires Unix domain sockets")
+    socket_path = Path(socket_path or default_socket_path())
+    if os.path.lexists(socket_path):
+        try:
+            _check_socket_owner(socket_path)
+        except DaemonUnavailableError as error:
+            raise RuntimeError(f"Refusing to replace {socket_path}: {error}") from None
+        try:
+            send_daemon_request({"command": "ping"}, socket_path, timeout=5)
+        except DaemonUnavailableError:
+            socket_path.unlink()
+        else:
+            raise RuntimeError(
+                f"A partomatic daemon is already running at {socket_path}"
+            )
+    for module_name in preload_modules:
+        importlib.import_module(module_name)
+
+    server = socketserver.UnixStreamServer(
+        str(socket_path), _DaemonRequestHandler, bind_and_activate=False
+    )
+    try:
+        server.server_bind()
+        # restrict the socket before listening so no other user can connect
+        os.chmod(socket_path, 0o600)
+        server.server_activate()
+    except BaseException:
+        server.server_close()
+        raise
+    server.build_service = BuildService()
+    logging.getLogger("partomatic").info(
+        f"partomatic daemon listening on {socket_path}"
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if socket_path.exists():
+            socket_path.unlink()
@@ -0,0 +1,247 @@
+"""Size-bounded on-disk cache of exported download payloads."""
+
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+import secrets
+import stat
+from typing import BinaryIO, Iterable, Iterator
+
+EXPORT_CACHE_ENVIRONMENT_VARIABLE = "PARTOMATIC_EXPORT_CACHE"
+DEFAULT_EXPORT_CACHE_SIZE = 512 * 2**20
+
+# separates the cache key from the download file name in entry file names
+_KEY_SEPARATOR = "--"
+
+
+def default_export_cache_dir() -> Path:
+    """Return the export cache folder for the current user.
+
+    The default is `partomatic/exports` in the user's cache folder:
+    `$XDG_CACHE_HOME` or `~/.cache`, or `%LOCALAPPDATA%` on Windows. The
+    `PARTOMATIC_EXPORT_CACHE` environment variable overrides it.
+    """
+    configured = os.environ.get(EXPORT_CACHE_ENVIRONMENT_VARIABLE)
+    if configured:
+        return Path(configured)
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", "")
+        # the XDG spec says relative paths are to be ignored
+        if not os.path.isabs(base):
+            base = Path.home() / ".cache"
+    return Path(base) / "partomatic" / "exports"
+
+
+def _ensure_private_directory(directory: Path):
+    """Create `directory` for the current user only, refusing one others control.
+
+    Cached payloads are served to browsers, so a folder another user can
+    write to would let them plant downloads.
+
+    Raises:
+        PermissionError: If `directory` is a symlink or not a folder, belongs
+            to another user, or is writable by its group or by others.
+    """
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        # Windows has no POSIX owners; the default lives in the user's profile
+        return
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"Export cache {directory} is not a directory")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"Export cache {directory} belongs to another user")
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(
+            f"Export cache {directory} is writable by other users; "
+            f"run chmod go-w on it or choose another folder"
+        )
+
+
+def _source_version(partomatic_class: type) -> int | None:
+    """Return the modification time of the module defining `partomatic_class`."""
+    try:
+        return Path(inspect.getfile(partomatic_class)).stat().st_mtime_ns
+    except (TypeError, OSError):
+        return None
+
+
+class ExportCache:
+    """LRU cache of download payloads keyed by part class, config and format.
+
+    Each entry is one file named `<key>--<download file name>`. Reading an
+    entry marks it as recently used, and after every write the least recently
+    used entries are removed until the folder fits in `max_bytes`. Entries are
+    written to a temporary file and renamed into place, so several servers
+    run by one user can share a cache folder. The folder is created readable
+    by its owner only, and one that another user owns or can write to is
+    refused with `PermissionError`.
+
+    Attributes:
+        directory: Folder holding the cached payloads.
+        max_bytes: Total size the cache is trimmed to after each write.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_bytes: int = DEFAULT_EXPORT_CACHE_SIZE,
+    ):
+        self.directory = Path(directory) if directory else default_export_cache_dir()
+        self.max_bytes = max_bytes
+        _ensure_private_directory(self.directory)
+
+    def key(self, partomatic, format_name: str) -> str:
+        """Return the cache key for `partomatic`'s current config in a format.
+
+        The key covers the part class, the module it is defined in (by
+        modification time, so edited part code is re-exported), the config
+        snapshot and the format name. It does not compile anything.
+        """
+        partomatic_class = type(partomatic)
+        identity = {
+            "class": f"{partomatic_class.__module__}.{partomatic_class.__qualname__}",
+            "source": _source_version(partomatic_class),
+            "config": partomatic._config_snapshot(),
+            "format": format_name.lower(),
+        }
+        encoded = json.dumps(identity, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Path | None:
+        """Return the cached payload for `key` and mark it recently used."""
+        for path in self.directory.glob(f"{key}{_KEY_SEPARATOR}*"):
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # evicted by another process since the glob
+                continue
+            return path
+        return None
+
+    @staticmethod
+    def file_name(path: Path) -> str:
+        """Return the download file name stored in a cache entry's name."""
+        return path.name.split(_KEY_SEPARATOR, 1)[1]
+
+    def put(self, key: str, file_name: str, payload: bytes) -> Path:
+        """Store a payload under `key` and trim the cache.
+
+        Returns:
+            Path of the new cache entry.
+        """
+        temporary = self._temporary_path(key)
+        try:
+            temporary.write_bytes(payload)
+            return self._commit(temporary, key, file_name)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+    def store_chunks(
+        self, key: str, file_name: str, chunks: Iterable[bytes]
+    ) -> Iterator[bytes]:
+        """Pass `chunks` through while writing them to the cache.
+
+        The entry is only added once every chunk has been consumed; a
+        download abandoned part way leaves nothing behind.
+
+        Yields:
+            Each chunk of `chunks`, unchanged.
+        """
+        temporary = self._temporary_path(key)
+        try:
+            with open(temporary, "wb") as stream:
+                for chunk in chunks:
+                    stream.write(chunk)
+                    yield chunk
+            self._commit(temporary, key, file_name)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+    def clear(self):
+        """Remove every cache entry."""
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+
+    def _temporary_path(self, key: str) -> Path:
+        """Return a unique hidden path for an entry being written."""
+        return self.directory / f".{key}.{secrets.token_hex(4)}.part"
+
+    def _commit(self, temporary: Path, key: str, file_name: str) -> Path:
+        """Move a fully written entry into place and trim the cache."""
+        path = self.directory / f"{key}{_KEY_SEPARATOR}{file_name}"
+        os.replace(temporary, path)
+        self._evict()
+        return path
+
+    def _entries(self) -> list[Path]:
+        """Return the committed cache entries."""
+        return [
+            path
+            for path in self.directory.glob(f"*{_KEY_SEPARATOR}*")
+            if not path.name.startswith(".")
+        ]
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits `max_bytes`."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+class _FileChunks:
+    """Iterator over an open binary stream that closes it when done.
+
+    Unlike a generator, `close()` releases the stream even if iteration
+    never started, so abandoned downloads don't leak file handles.
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self._stream = stream
+        self._chunk_size = chunk_size
+
+    def __iter__(self) -> "_FileChunks":
+        return self
+
+    def __next__(self) -> bytes:
+        chunk = b"" if self._stream.closed else self._stream.read(self._chunk_size)
+        if not chunk:
+            self.close()
+            raise StopIteration
+        return chunk
+
+    def close(self):
+        """Close the underlying stream."""
+        self._stream.close()
+
+
+def iter_file_chunks(
+    path: str | Path | BinaryIO, chunk_size: int = 2**20
+) -> Iterator[bytes]:
+    """Open `path` now and return an iterator over its contents.
+
+    Opening eagerly means the data stays readable even if the file is
+    evicted from a cache before the iterator is consumed. An open binary
+    stream is read from the start. The stream is closed once exhausted, or
+    when the iterator's `close()` is called.
+    """
+    if hasattr(path, "read"):
+        stream = path
+        stream.seek(0)
+    else:
+        stream = open(path, "rb")
+    return _FileChunks(stream, chunk_size)
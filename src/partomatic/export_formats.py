@@ -0,0 +1,374 @@
+"""Named export formats and mesh writers used by Partomatic exports."""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import io
+import json
+from pathlib import Path
+import shutil
+import struct
+import tempfile
+from typing import BinaryIO, Callable, Iterable, Iterator
+import zipfile
+
+import numpy as np
+from build123d import Shape, export_step
+
+from partomatic.tessellation import (
+    DEFAULT_ANGULAR_TOLERANCE,
+    DEFAULT_LINEAR_TOLERANCE,
+    TriangleMesh,
+    tessellate,
+)
+
+
+@contextmanager
+def _binary_target(target):
+    """Yield a writable binary stream for a file path or an open stream."""
+    if hasattr(target, "write"):
+        yield target
+        return
+    with open(target, "wb") as stream:
+        yield stream
+
+
+def _mesh_name(target) -> str:
+    """Return an object name for a mesh written to `target`."""
+    name = getattr(target, "name", target)
+    if isinstance(name, (str, Path)):
+        return Path(name).stem
+    return "partomatic"
+
+
+def _require_triangles(mesh: TriangleMesh):
+    """Raise when a mesh has nothing to write."""
+    if mesh.triangle_count == 0:
+        raise ValueError("Cannot export a mesh with no triangles")
+
+
+_STL_FACET_DTYPE = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")]
+)
+
+
+def write_stl(mesh: TriangleMesh, target):
+    """Write a mesh as a binary STL file.
+
+    Args:
+        mesh: Triangle buffers to write.
+        target: Destination file path or writable binary stream.
+    """
+    facets = np.zeros(mesh.triangle_count, dtype=_STL_FACET_DTYPE)
+    facets["normal"] = mesh.facet_normals()
+    facets["vertices"] = mesh.triangle_vertices
+    header = f"partomatic {_mesh_name(target)}".encode("ascii", "replace")[:80]
+    with _binary_target(target) as stream:
+        stream.write(header.ljust(80, b"\x00"))
+        stream.write(struct.pack("<I", mesh.triangle_count))
+        stream.write(facets.tobytes())
+
+
+_3MF_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>
+"""
+
+_3MF_RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+
+
+def _xml_rows(template: str, rows: np.ndarray) -> str:
+    """Render one XML element per array row using a `%`-style template."""
+    return "\n".join(template % row for row in map(tuple, rows.tolist()))
+
+
+def write_3mf(mesh: TriangleMesh, target):
+    """Write a mesh as a deflate-compressed 3MF package.
+
+    Args:
+        mesh: Triangle buffers to write, in millimeters.
+        target: Destination file path or writable binary stream.
+
+    Raises:
+        ValueError: If the mesh has no triangles.
+    """
+    _require_triangles(mesh)
+    vertices = _xml_rows('<vertex x="%.7g" y="%.7g" z="%.7g"/>', mesh.vertices)
+    triangles = _xml_rows('<triangle v1="%d" v2="%d" v3="%d"/>', mesh.triangles)
+    model = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<model unit="millimeter" xml:lang="en-US" '
+        'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+        f'<resources>\n<object id="1" name="{_mesh_name(target)}" type="model">\n'
+        f"<mesh>\n<vertices>\n{vertices}\n</vertices>\n"
+        f"<triangles>\n{triangles}\n</triangles>\n</mesh>\n</object>\n</resources>\n"
+        '<build>\n<item objectid="1"/>\n</build>\n</model>\n'
+    )
+    with _binary_target(target) as stream:
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("[Content_Types].xml", _3MF_CONTENT_TYPES)
+            archive.writestr("_rels/.rels", _3MF_RELATIONSHIPS)
+            archive.writestr("3D/3dmodel.model", model)
+
+
+# glTF is Y-up and measured in meters; CAD geometry is Z-up millimeters.
+_GLTF_Z_UP_MM_TO_Y_UP_M = [
+    0.001, 0.0, 0.0, 0.0,
+    0.0, 0.0, -0.001, 0.0,
+    0.0, 0.001, 0.0, 0.0,
+    0.0, 0.0, 0.0, 1.0,
+]  # fmt: skip
+
+
+def write_glb(mesh: TriangleMesh, target):
+    """Write a mesh as a binary glTF 2.0 (`.glb`) file.
+
+    Args:
+        mesh: Triangle buffers to write, in millimeters.
+        target: Destination file path or writable binary stream.
+
+    Raises:
+        ValueError: If the mesh has no triangles.
+    """
+    _require_triangles(mesh)
+    indices = np.ascontiguousarray(mesh.triangles, dtype="<u4").tobytes()
+    positions = np.ascontiguousarray(mesh.vertices, dtype="<f4")
+    binary = indices + positions.tobytes()
+    minimum, maximum = mesh.bounds()
+    document = {
+        "asset": {"version": "2.0", "generator": "partomatic"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [
+            {"mesh": 0, "name": _mesh_name(target), "matrix": _GLTF_Z_UP_MM_TO_Y_UP_M}
+        ],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 1}, "indices": 0}]}],
+        "buffers": [{"byteLength": len(binary)}],
+        "bufferViews": [
+            {"buffer": 0, "byteLength": len(indices), "target": 34963},
+            {
+                "buffer": 0,
+                "byteOffset": len(indices),
+                "byteLength": positions.nbytes,
+                "target": 34962,
+            },
+        ],
+        "accessors": [
+            {
+                "bufferView": 0,
+                "componentType": 5125,
+                "count": int(mesh.triangles.size),
+                "type": "SCALAR",
+            },
+            {
+                "bufferView": 1,
+                "componentType": 5126,
+                "count": int(positions.shape[0]),
+                "type": "VEC3",
+                "min": minimum.tolist(),
+                "max": maximum.tolist(),
+            },
+        ],
+    }
+    json_chunk = json.dumps(document, separators=(",", ":")).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    binary += b"\x00" * (-len(binary) % 4)
+    total_length = 12 + 8 + len(json_chunk) + 8 + len(binary)
+    with _binary_target(target) as stream:
+        stream.write(struct.pack("<4sII", b"glTF", 2, total_length))
+        stream.write(struct.pack("<I4s", len(json_chunk), b"JSON"))
+        stream.write(json_chunk)
+        stream.write(struct.pack("<I4s", len(binary), b"BIN\x00"))
+        stream.write(binary)
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    """A named export target selectable from `partomate()` and the configurator.
+
+    Attributes:
+        name: Registry key, e.g. `"stl"` or `"3mf"`.
+        suffix: File suffix including the leading dot.
+        media_type: MIME type used for browser downloads.
+        label: Short human-readable name used in menus.
+        shape_writer: Callable writing a build123d shape to a file path.
+        mesh_writer: Callable writing a `TriangleMesh` to a path or stream.
+            When both writers are set, `mesh_writer` is used, so every export
+            of a format goes through the same tessellation.
+    """
+
+    name: str
+    suffix: str
+    media_type: str
+    label: str
+    shape_writer: Callable | None = None
+    mesh_writer: Callable | None = None
+
+    def __post_init__(self):
+        """Reject formats that have no way to write a part."""
+        if self.shape_writer is None and self.mesh_writer is None:
+            raise ValueError(
+                f"Export format {self.name} needs a shape_writer or mesh_writer"
+            )
+
+    @property
+    def is_mesh_based(self) -> bool:
+        """Whether this format is written from triangle buffers."""
+        return self.mesh_writer is not None
+
+    def write(
+        self,
+        shape: Shape,
+        file_path: str,
+        tolerance: float = DEFAULT_LINEAR_TOLERANCE,
+        angular_tolerance: float = DEFAULT_ANGULAR_TOLERANCE,
+    ):
+        """Write one shape to one file in this format.
+
+        Args:
+            shape: build123d shape to export.
+            file_path: Destination file path.
+            tolerance: Linear tessellation tolerance for mesh-based formats.
+            angular_tolerance: Angular tessellation tolerance for mesh-based formats.
+        """
+        if self.mesh_writer is not None:
+            self.mesh_writer(tessellate(shape, tolerance, angular_tolerance), file_path)
+            return
+        self.shape_writer(shape, file_path)
+
+    def write_stream(
+        self,
+        shape: Shape,
+        stream: BinaryIO,
+        tolerance: float = DEFAULT_LINEAR_TOLERANCE,
+        angular_tolerance: float = DEFAULT_ANGULAR_TOLERANCE,
+    ):
+        """Write one shape to a writable binary stream in this format.
+
+        Mesh-based formats write straight into the stream. Formats with only
+        a `shape_writer` need a file path, so they are written to a temporary
+        file that is copied into the stream and removed.
+
+        Args:
+            shape: build123d shape to export.
+            stream: Destination binary stream; it does not need to be seekable.
+            tolerance: Linear tessellation tolerance for mesh-based formats.
+            angular_tolerance: Angular tessellation tolerance for mesh-based formats.
+        """
+        if self.mesh_writer is not None:
+            self.mesh_writer(tessellate(shape, tolerance, angular_tolerance), stream)
+            return
+        with tempfile.TemporaryDirectory(prefix="partomatic-") as directory:
+            file_path = Path(directory) / f"part{self.suffix}"
+            self.shape_writer(shape, str(file_path))
+            with open(file_path, "rb") as source:
+                shutil.copyfileobj(source, stream)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable stream that holds written bytes until they are drained."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip_chunks(
+    entries: Iterable[tuple[str, Callable[[BinaryIO], None]]],
+) -> Iterator[bytes]:
+    """Build a deflate-compressed zip archive incrementally.
+
+    Each entry's writer is called with the archive member stream, and the
+    compressed bytes are yielded as soon as that member is complete, so only
+    one member is held in memory and a consumer can send early members while
+    later ones are still being written.
+
+    Args:
+        entries: `(archive name, writer)` pairs; writers are called lazily,
+            in order.
+
+    Yields:
+        Consecutive chunks of the zip archive.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, write in entries:
+            with archive.open(name, "w") as member:
+                write(member)
+            yield sink.drain()
+    yield sink.drain()
+
+
+_export_formats: dict[str, ExportFormat] = {}
+
+
+def register_export_format(export_format: ExportFormat, replace: bool = False):
+    """Add an export format to the registry.
+
+    Args:
+        export_format: Format to register under `export_format.name`.
+        replace: When True, overwrite an existing format with the same name.
+
+    Raises:
+        ValueError: If the name is already registered and `replace` is False.
+    """
+    key = export_format.name.lower()
+    if key in _export_formats and not replace:
+        raise ValueError(f"Export format {key} is already registered")
+    _export_formats[key] = export_format
+
+
+def get_export_format(name: str) -> ExportFormat:
+    """Return a registered export format by name.
+
+    Raises:
+        ValueError: If no format is registered under `name`.
+    """
+    try:
+        return _export_formats[name.lower()]
+    except KeyError:
+        known = ", ".join(sorted(_export_formats))
+        raise ValueError(
+            f"Unknown export format {name}; expected one of: {known}"
+        ) from None
+
+
+def registered_export_formats() -> list[ExportFormat]:
+    """Return all registered export formats in registration order."""
+    return list(_export_formats.values())
+
+
+register_export_format(
+    ExportFormat("stl", ".stl", "model/stl", "STL", mesh_writer=write_stl)
+)
+register_export_format(
+    ExportFormat("step", ".step", "model/step", "STEP", shape_writer=export_step)
+)
+register_export_format(
+    ExportFormat("3mf", ".3mf", "model/3mf", "3MF", mesh_writer=write_3mf)
+)
+register_export_format(
+    ExportFormat("glb", ".glb", "model/gltf-binary", "glTF", mesh_writer=write_glb)
+)
@@ -0,0 +1,105 @@
+"""Run `compile()` in a child process with a deadline and a memory limit."""
+
+from partomatic.automatable_part import AutomatablePart
+from partomatic.worker_pool import (
+    DEFAULT_PRELOAD_MODULES,
+    _default_start_method,
+    _process_context,
+)
+
+
+class CompileTimeoutError(TimeoutError):
+    """Raised when an isolated compile does not finish before its deadline."""
+
+
+class CompileCrashedError(RuntimeError):
+    """Raised when an isolated compile process dies without returning parts."""
+
+
+def _limit_address_space(memory_limit: int):
+    """Cap this process's virtual address space at `memory_limit` bytes."""
+    import resource
+
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+def _isolated_compile_main(connection, partomatic, memory_limit: int | None):
+    """Child process entry point: compile and send the parts back."""
+    try:
+        if memory_limit is not None:
+            _limit_address_space(memory_limit)
+        partomatic.compile()
+        # shapes are pickled as binary BREP; builder history is stripped
+        # by AutomatablePart.__getstate__
+        connection.send((True, partomatic.parts))
+    except BaseException as error:
+        try:
+            connection.send((False, error))
+        except Exception:
+            connection.send((False, RuntimeError(f"{type(error).__name__}: {error}")))
+    finally:
+        connection.close()
+
+
+def compile_isolated(
+    partomatic,
+    timeout: float | None = None,
+    memory_limit: int | None = None,
+) -> list[AutomatablePart]:
+    """Compile a Partomatic instance in a child process and return its parts.
+
+    The child is killed if it runs past `timeout`, so a hung OCC operation
+    cannot wedge the calling process, and a crash in OCC only takes down the
+    child. `partomatic` itself is not modified.
+
+    Args:
+        partomatic: Instance whose current config is compiled.
+        timeout: Wall-clock limit in seconds, including process start-up;
+            `None` waits indefinitely.
+        memory_limit: Optional `RLIMIT_AS` cap for the child in bytes. This
+            limits virtual address space, so it must leave room for Python
+            and OCC themselves (typically well over 1 GB). POSIX only.
+
+    Returns:
+        The compiled parts.
+
+    Raises:
+        CompileTimeoutError: If the deadline passes; the child is killed.
+        CompileCrashedError: If the child exits without returning a result.
+        Exception: Any exception raised by `compile()` is re-raised here.
+    """
+    context = _process_context(
+        _default_start_method(),
+        [*DEFAULT_PRELOAD_MODULES, type(partomatic).__module__],
+    )
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_isolated_compile_main,
+        args=(sender, partomatic, memory_limit),
+        name="partomatic-compile",
+        daemon=True,
+    )
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            process.kill()
+            process.join()
+            raise CompileTimeoutError(
+                f"{type(partomatic).__name__}.compile did not finish "
+                f"within {timeout} seconds"
+            )
+        try:
+            succeeded, result = receiver.recv()
+        except EOFError:
+            process.join()
+            raise CompileCrashedError(
+                f"{type(partomatic).__name__}.compile process exited "
+                f"with code {process.exitcode}"
+            ) from None
+    finally:
+        receiver.close()
+    process.join()
+    if not succeeded:
+        raise result
+    return result
@@ -0,0 +1,186 @@
+"""Columnar per-part metrics tables for batches and sweeps."""
+
+import csv
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+import yaml
+
+from partomatic.partomatic_config import PartomaticConfig
+
+# metric columns always present, in this order, ahead of export sizes
+GEOMETRY_METRICS = (
+    "volume",
+    "area",
+    "bbox_min_x",
+    "bbox_min_y",
+    "bbox_min_z",
+    "bbox_max_x",
+    "bbox_max_y",
+    "bbox_max_z",
+    "center_x",
+    "center_y",
+    "center_z",
+    "triangles",
+)
+
+
+def _flatten(mapping: Mapping, prefix: str = "") -> dict[str, Any]:
+    """Flatten nested mappings into dotted keys."""
+    flat = {}
+    for key, value in mapping.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, Mapping):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, np.ndarray):
+            # array fields are inputs, not table parameters
+            continue
+        elif isinstance(value, Enum):
+            flat[name] = value.name
+        else:
+            flat[name] = value
+    return flat
+
+
+def _yaml_parameters(configuration) -> Mapping | None:
+    """Return the field mapping of YAML text or a YAML file, if it has one.
+
+    Like `PartomaticConfig.load_config`, the fields sit under a single
+    node named for the config class.
+    """
+    text = str(configuration)
+    if "\n" not in text:
+        path = Path(text)
+        if not path.is_file():
+            return None
+        text = path.read_text()
+    try:
+        document = yaml.safe_load(text)
+    except yaml.YAMLError:
+        return None
+    if not isinstance(document, Mapping) or len(document) != 1:
+        return None
+    fields = next(iter(document.values()))
+    return fields if isinstance(fields, Mapping) else None
+
+
+def _configuration_parameters(configuration) -> dict[str, Any]:
+    """Return the parameter columns describing one batch configuration."""
+    if isinstance(configuration, PartomaticConfig):
+        return _flatten(configuration.as_dict())
+    if isinstance(configuration, Mapping):
+        return _flatten(configuration)
+    if isinstance(configuration, (str, Path)):
+        parameters = _yaml_parameters(configuration)
+        if parameters is not None:
+            return _flatten(parameters)
+    return {"configuration": str(configuration)}
+
+
+def _column(values: list) -> np.ndarray:
+    """Build a float column when every value is numeric, else a string column."""
+    if all(
+        value is None
+        or (isinstance(value, (int, float)) and not isinstance(value, bool))
+        for value in values
+    ):
+        return np.array(
+            [np.nan if value is None else value for value in values], dtype=np.float64
+        )
+    return np.array(["" if value is None else str(value) for value in values])
+
+
+@dataclass
+class MetricsTable:
+    """Per-part metrics stored as one NumPy array per column.
+
+    Rows are parts; columns are the configuration parameters that produced
+    the part, `part` (its file name base), `ok`, and the metrics recorded by
+    `AutomatablePart.measure()`. Numeric columns are float64 with `NaN` for
+    missing values, so whole-sweep arithmetic is vectorized.
+
+    Attributes:
+        columns: Column name to array, all with the same length.
+    """
+
+    columns: dict[str, np.ndarray]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "MetricsTable":
+        """Build a table from row mappings; missing cells become empty."""
+        rows = list(rows)
+        names = []
+        for row in rows:
+            names.extend(name for name in row if name not in names)
+        return cls({name: _column([row.get(name) for row in rows]) for name in names})
+
+    @classmethod
+    def from_results(cls, results: Iterable) -> "MetricsTable":
+        """Build a table from `BatchResult`s returned by batches or sweeps.
+
+        Parts that still hold geometry are measured now; released parts use
+        the metrics recorded when their geometry was dropped. Failed
+        configurations contribute one row with `ok` set to 0.
+        """
+        rows = []
+        for result in results:
+            parameters = _configuration_parameters(result.configuration)
+            if not result.ok:
+                rows.append({**parameters, "part": "", "ok": 0})
+                continue
+            for part in result.parts:
+                metrics = part.measure()
+                rows.append(
+                    {
+                        **parameters,
+                        "part": part.file_name_base,
+                        "ok": 1,
+                        **{name: metrics.get(name) for name in GEOMETRY_METRICS},
+                        **{
+                            name: value
+                            for name, value in metrics.items()
+                            if name not in GEOMETRY_METRICS
+                        },
+                    }
+                )
+        return cls.from_rows(rows)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def to_csv(self, path: str | Path):
+        """Write the table as CSV with a header row; `NaN` cells are empty."""
+        names = list(self.columns)
+        with open(path, "w", newline="") as stream:
+            writer = csv.writer(stream)
+            writer.writerow(names)
+            for index in range(len(self)):
+                writer.writerow(
+                    [_csv_cell(self.columns[name][index]) for name in names]
+                )
+
+    def to_npz(self, path: str | Path):
+        """Write every column as an array in a compressed `.npz` archive."""
+        np.savez_compressed(path, **self.columns)
+
+    @classmethod
+    def from_npz(cls, path: str | Path) -> "MetricsTable":
+        """Load a table written by `to_npz`, keeping its column order."""
+        with np.load(path) as archive:
+            return cls({name: archive[name] for name in archive.files})
+
+
+def _csv_cell(value):
+    """Format one table cell for CSV output."""
+    if isinstance(value, np.floating):
+        if np.isnan(value):
+            return ""
+        value = value.item()
+        return int(value) if value.is_integer() else repr(value)
+    return str(value)
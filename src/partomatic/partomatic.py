@@ -15,22 +15,132 @@ if __name__ == "__main__":
 
 from dataclasses import field
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from functools import wraps
+from functools import partial, wraps
+import gc
+import hashlib
 import inspect
 from pathlib import Path
-from typing import Optional
+from threading import Lock, RLock
+from typing import BinaryIO, Iterator, Optional, Sequence
+import weakref
 
-from build123d import Location, export_step, export_stl
+from build123d import Location, export_step
+import numpy as np
 
 import ocp_vscode
 
 import logging
 
 from partomatic.partomatic_config import PartomaticConfig
-from partomatic.automatable_part import AutomatablePart
+from partomatic.automatable_part import AutomatablePart, mesh_locks, mesh_parts
+from partomatic.export_formats import (
+    ExportFormat,
+    get_export_format,
+    iter_zip_chunks,
+)
+from partomatic.isolation import compile_isolated
 from partomatic.partomatic_preview import PartomaticPreviewMixin
 
+# what display() last sent to each (host, port) viewer, one row per part
+_displayed_scenes: dict[tuple, tuple] = {}
+_displayed_scenes_lock = Lock()
+# content digest of each read-only config array by id(), while it is alive
+_array_digests: dict[int, tuple[weakref.ref, str]] = {}
+# reentrant, since a weakref callback may fire while the lock is held
+_array_digests_lock = RLock()
+
+
+def forget_displayed_scenes():
+    """Forget what was sent to every viewer, so the next `display()` resends."""
+    with _displayed_scenes_lock:
+        _displayed_scenes.clear()
+
+
+def _location_key(location: Location) -> tuple:
+    """Return a comparable `(position, orientation)` tuple for a location."""
+    return tuple(location.position), tuple(location.orientation)
+
+
+def _forget_array_digest(key: int, ref: weakref.ref):
+    """Drop a cached digest once its array is garbage collected."""
+    with _array_digests_lock:
+        if _array_digests.get(key, (None,))[0] is ref:
+            del _array_digests[key]
+
+
+def _is_read_only(value: np.ndarray) -> bool:
+    """Whether neither the array nor any array it views can be written to."""
+    while isinstance(value, np.ndarray):
+        if value.flags.writeable:
+            return False
+        value = value.base
+    return True
+
+
+def _array_digest(value: np.ndarray) -> str:
+    """Return the SHA-256 of an array's contents.
+
+    Writable arrays are hashed on every call, so an in-place edit changes
+    the digest and is seen by `is_dirty` and cache keys. Read-only arrays,
+    such as memory-mapped `.npy` sidecars, cannot change, so their digest
+    is computed once per array object.
+    """
+    read_only = _is_read_only(value)
+    key = id(value)
+    if read_only:
+        with _array_digests_lock:
+            entry = _array_digests.get(key)
+        if entry is not None and entry[0]() is value:
+            return entry[1]
+    digest = hashlib.sha256(np.ascontiguousarray(value).data).hexdigest()
+    if read_only:
+        ref = weakref.ref(value, lambda ref: _forget_array_digest(key, ref))
+        with _array_digests_lock:
+            _array_digests[key] = (ref, digest)
+    return digest
+
+
+def _snapshot_value(value):
+    """Deep-copy `as_dict()` output, replacing arrays with a content digest."""
+    if isinstance(value, np.ndarray):
+        return ("ndarray", str(value.dtype), value.shape, _array_digest(value))
+    if isinstance(value, dict):
+        return {key: _snapshot_value(item) for key, item in value.items()}
+    return deepcopy(value)
+
+
+def _track_compile(compile_function):
+    """Wrap a `compile` function so successful compiles update dirty state.
+
+    The config's feasibility predicates are checked first, so an infeasible
+    config raises `InfeasibleConfigError` before any geometry is built.
+    Generator compiles are drained into `self.parts`. Nested calls, such as a
+    subclass calling `super().compile()`, are left to the outermost wrapper.
+    """
+
+    @wraps(compile_function)
+    def compile(self, *args, **kwargs):
+        if getattr(self, "_compile_depth", 0):
+            return compile_function(self, *args, **kwargs)
+        self._config.validate_feasibility()
+        self._compile_depth = 1
+        try:
+            result = compile_function(self, *args, **kwargs)
+            if inspect.isgenerator(result):
+                self.parts.clear()
+                self.parts.extend(result)
+                result = None
+        finally:
+            self._compile_depth = 0
+        self._mark_compiled()
+        return result
+
+    compile._partomatic_tracks_compile = True
+    return compile
+
 
 class Partomatic(PartomaticPreviewMixin, ABC):
     """Base class for automatable CAD parts.
@@ -43,38 +153,137 @@ class Partomatic(PartomaticPreviewMixin, ABC):
     _config: PartomaticConfig
     parts: list[AutomatablePart] = field(default_factory=list)
 
+    # attributes _init_instance_state() rebuilds, left out of pickles and
+    # copies; subclasses add the names of caches or geometry they hold
+    _transient_state = frozenset(
+        {
+            "parts",
+            "_config",
+            "_source_dir",
+            "_compiled_config_snapshot",
+            "_compile_depth",
+            "_preview_state",
+            "_preview_error",
+        }
+    )
+
     @abstractmethod
     def compile(self):
-        """Build the part geometry and populate `self.parts`."""
+        """Build the part geometry and populate `self.parts`.
+
+        `compile` may instead be written as a generator that yields each
+        `AutomatablePart` as soon as it is built; Partomatic then collects the
+        yielded parts into `self.parts` and can export them incrementally.
+        """
 
     def display(
         self,
         viewer_host: Optional[str] = None,
         viewer_port: Optional[int] = None,
-    ):
+        force: bool = False,
+    ) -> bool:
         """Show current parts in the OCP CAD viewer.
 
         If `viewer_port` is provided, the standalone endpoint is configured
-        via `ocp_vscode.set_port(...)`. Otherwise display uses ocp_vscode's
-        default integration behavior.
+        via `ocp_vscode.set_port(...)` and the parts are sent to that port,
+        so threads showing to different viewers don't redirect each other.
+        Otherwise display uses ocp_vscode's default integration behavior.
+
+        What was last sent to each viewer is remembered as one
+        `(name, geometry hash, location)` row per part, across all
+        instances. When the rows are unchanged nothing is sent, so no-op
+        updates cost nothing. Otherwise the whole scene is sent again,
+        keeping the camera, and the viewer rebuilds it; unchanged parts are
+        not skipped.
+
+        Parts are shown as moved views that share the stored shapes'
+        triangulation, so a part already meshed for export is shown with
+        that mesh. Display never meshes at export quality itself; parts
+        without a mesh are tessellated by the viewer at preview quality.
 
         Args:
             viewer_host: Hostname used with `viewer_port` for standalone viewer.
             viewer_port: Standalone viewer port to target.
+            force: Send every part even if the viewer already shows them,
+                e.g. after the viewer was restarted.
+
+        Returns:
+            True when parts were sent, False when the viewer was up to date.
         """
         # Only set port if we're explicitly told to and it's configured
         if viewer_port is not None:
             ocp_vscode.set_port(viewer_port, host=viewer_host or "127.0.0.1")
+        viewer = (viewer_host or "127.0.0.1", viewer_port)
+
+        scene = tuple(
+            (
+                part.file_name_base,
+                part.geometry_hash(),
+                _location_key(part.display_location),
+            )
+            for part in self.parts
+        )
+        with _displayed_scenes_lock:
+            previous = _displayed_scenes.get(viewer)
+        if not force and scene == previous:
+            logging.getLogger("partomatic").debug(
+                f"viewer {viewer} already shows these {len(scene)} parts"
+            )
+            return False
+        changed = len(set(scene) - set(previous or ()))
+        logging.getLogger("partomatic").debug(
+            f"sending {len(scene)} parts to viewer {viewer}, {changed} changed"
+        )
 
-        # Clear the viewer before showing new parts to avoid accumulation
-        ocp_vscode.show_clear()
+        # moved() leaves stored parts in place but shares their triangulation,
+        # which a deep copy would drop
+        display_parts = [part.part.moved(part.display_location) for part in self.parts]
+        # without a port, show() uses the VS Code integration when available
+        show_options = {} if viewer_port is None else {"port": viewer_port}
+        if previous is not None and not force:
+            show_options["reset_camera"] = ocp_vscode.Camera.KEEP
+        # the viewer meshes those shared shapes, so keep exports of the same
+        # parts from cleaning them mid-tessellation
+        with mesh_locks(self.parts):
+            # show() replaces the whole scene, so no show_clear() round trip
+            ocp_vscode.show(display_parts, **show_options)
+        with _displayed_scenes_lock:
+            _displayed_scenes[viewer] = scene
+        return True
+
+    def _mesh_settings(self, part: AutomatablePart) -> tuple[float, float, bool]:
+        """Return the mesher settings for a part, defaulting to the config's.
 
-        # Display without port parameter to use VS Code integration when available
-        # Create deep copies of parts before moving to avoid mutating stored parts
-        display_parts = [
-            deepcopy(part.part).move(part.display_location) for part in self.parts
-        ]
-        ocp_vscode.show(display_parts)
+        Returns:
+            `(tolerance, angular_tolerance, relative)` as resolved by
+            `AutomatablePart.mesh_tolerances`.
+        """
+        return part.mesh_tolerances(
+            self._config.mesh_tolerance,
+            self._config.mesh_angular_tolerance,
+            self._config.adaptive_mesh_tolerance,
+        )
+
+    def mesh_parts(self, parallel: bool = True):
+        """Triangulate every compiled part with its mesh settings.
+
+        Parts sharing settings are meshed together in one OCC run, so with
+        `parallel` the faces of all of them are meshed concurrently on OCC's
+        thread pool (see `set_mesh_threads`). `display()` and exports with
+        a mesh format call this first; parts already meshed with their
+        settings are skipped.
+
+        Args:
+            parallel: Mesh faces concurrently on OCC's thread pool.
+        """
+        mesh_parts(
+            (
+                (part, self._mesh_settings(part))
+                for part in self.parts
+                if part.part is not None
+            ),
+            parallel,
+        )
 
     def complete_stl_file_path(self, part: AutomatablePart) -> str:
         """Return the final STL file path for a part.
@@ -119,10 +328,53 @@ class Partomatic(PartomaticPreviewMixin, ABC):
         )
         if not export_root.is_absolute():
             export_root = self._source_dir / export_root
+        return export_root / self._export_file_name(part, suffix)
+
+    def _export_file_name(self, part: AutomatablePart, suffix: str) -> str:
+        """Return a part's export file name, with prefix, suffix and extension.
+
+        A `file_prefix` such as `"sub/"` keeps its folder, so the name is
+        relative to the export folder and uses `/` separators.
+        """
         return (
-            export_root
-            / f"{self._config.file_prefix}{part.file_name_base}{self._config.file_suffix}"
-        ).with_suffix(suffix)
+            Path(
+                f"{self._config.file_prefix}{part.file_name_base}{self._config.file_suffix}"
+            )
+            .with_suffix(suffix)
+            .as_posix()
+        )
+
+    def _prepared_export_path(
+        self,
+        part: AutomatablePart,
+        suffix: str,
+        output_dir: Optional[str | Path] = None,
+    ) -> Path:
+        """Resolve a part's export path and make sure its directory exists.
+
+        Raises:
+            FileNotFoundError: If the export directory cannot be created/found.
+        """
+        export_path = self._complete_export_file_path(part, suffix, output_dir)
+        if not export_path.parent.exists():
+            export_path.parent.mkdir(
+                parents=True,
+                exist_ok=self._config.create_folders_if_missing,
+            )
+        if not export_path.parent.exists() or not export_path.parent.is_dir():
+            error_str = f"Directory {export_path.parent} does not exist."
+            logging.getLogger("partomatic").warning(error_str)
+            raise FileNotFoundError(error_str)
+        return export_path
+
+    def _exports_disabled(self, output_dir: Optional[str | Path]) -> bool:
+        """Whether exports are switched off by an `stl_folder` of NONE."""
+        if output_dir is None and self._config.stl_folder == "NONE":
+            logging.getLogger("partomatic").warning(
+                "stl_folder is set to NONE, skipping export"
+            )
+            return True
+        return False
 
     def _export_parts(
         self,
@@ -143,31 +395,24 @@ class Partomatic(PartomaticPreviewMixin, ABC):
         Raises:
             FileNotFoundError: If the export directory cannot be created/found.
         """
-        if output_dir is None and self._config.stl_folder == "NONE":
-            logging.getLogger("partomatic").warning(
-                "stl_folder is set to NONE, skipping export"
-            )
+        if self._exports_disabled(output_dir):
             return []
 
         exported_paths = []
         for part in self.parts:
-            export_path = self._complete_export_file_path(part, suffix, output_dir)
-            if not export_path.parent.exists():
-                export_path.parent.mkdir(
-                    parents=True,
-                    exist_ok=self._config.create_folders_if_missing,
-                )
-            if not export_path.parent.exists() or not export_path.parent.is_dir():
-                error_str = f"Directory {export_path.parent} does not exist."
-                logging.getLogger("partomatic").warning(error_str)
-                raise FileNotFoundError(error_str)
+            export_path = self._prepared_export_path(part, suffix, output_dir)
             exporter(part.part, str(export_path))
+            part.record_export(suffix.lstrip("."), export_path)
             exported_paths.append(export_path)
         return exported_paths
 
     def export_stls(self):
-        """Generate STL exports in the configured output folder."""
-        return self._export_parts(".stl", export_stl)
+        """Generate STL exports in the configured output folder.
+
+        Parts are written from their cached `triangle_mesh()` at their mesh
+        settings, the same path `export("stl")` and downloads use.
+        """
+        return self.export_many(["stl"])["stl"]
 
     def export_steps(self):
         """Generate STEP exports in the configured output folder."""
@@ -175,35 +420,256 @@ class Partomatic(PartomaticPreviewMixin, ABC):
 
     def export_stls_to_directory(self, output_dir: str | Path):
         """Generate STL exports into a specific directory."""
-        return self._export_parts(".stl", export_stl, output_dir=output_dir)
+        return self.export_many(["stl"], output_dir=output_dir)["stl"]
 
     def export_steps_to_directory(self, output_dir: str | Path):
         """Generate STEP exports into a specific directory."""
         return self._export_parts(".step", export_step, output_dir=output_dir)
 
+    def export(self, format_name: str, output_dir: Optional[str | Path] = None):
+        """Export all parts in a registered export format.
+
+        Args:
+            format_name: Name of a format in the export format registry,
+                such as `"stl"`, `"step"`, `"3mf"`, or `"glb"`.
+            output_dir: Optional override directory for exports.
+
+        Returns:
+            Paths written, in part order.
+
+        Raises:
+            ValueError: If `format_name` is not registered.
+        """
+        export_format = get_export_format(format_name)
+        return self.export_many([export_format.name], output_dir=output_dir)[
+            export_format.name
+        ]
+
+    def export_to_stream(
+        self, format_name: str, part: AutomatablePart, stream: BinaryIO
+    ) -> str:
+        """Write one compiled part to a binary stream, without touching disk.
+
+        Args:
+            format_name: Name of a registered export format.
+            part: One of `self.parts`.
+            stream: Writable binary stream, e.g. an `io.BytesIO`.
+
+        Returns:
+            The file name the part is exported under, e.g. `"wheel.stl"`,
+            relative to the export folder.
+
+        Raises:
+            ValueError: If `format_name` is not registered.
+        """
+        export_format = get_export_format(format_name)
+        self._write_part_stream(export_format, part, stream)
+        return self._export_file_name(part, export_format.suffix)
+
+    def _write_part_stream(
+        self, export_format: ExportFormat, part: AutomatablePart, stream: BinaryIO
+    ):
+        """Write one part to a stream, using its cached mesh for mesh formats."""
+        if export_format.is_mesh_based:
+            mesh = part.triangle_mesh(*self._mesh_settings(part))
+            export_format.mesh_writer(mesh, stream)
+        else:
+            export_format.write_stream(part.part, stream)
+
+    def iter_export_zip(self, format_name: str) -> Iterator[bytes]:
+        """Export every compiled part into a zip archive, yielded in chunks.
+
+        Parts are written straight into the archive one at a time and each
+        part's compressed bytes are yielded as soon as it is done, so memory
+        stays bounded by one part and the first chunks can be sent while
+        later parts are still being exported. The current parts are captured
+        when this is called; exports run as the chunks are consumed.
+
+        Args:
+            format_name: Name of a registered export format.
+
+        Returns:
+            An iterator of zip archive chunks.
+
+        Raises:
+            ValueError: If `format_name` is not registered.
+        """
+        export_format = get_export_format(format_name)
+        return iter_zip_chunks(
+            (
+                self._export_file_name(part, export_format.suffix),
+                partial(self._write_part_stream, export_format, part),
+            )
+            for part in list(self.parts)
+        )
+
+    def export_many(
+        self,
+        format_names: Sequence[str],
+        output_dir: Optional[str | Path] = None,
+    ) -> dict[str, list[Path]]:
+        """Export all parts in several formats, meshing each part at most once.
+
+        When two or more mesh-based formats are requested, each part is
+        tessellated once and every mesh writer is fed from the same triangle
+        buffers. B-rep formats such as STEP are written from the shape.
+
+        Args:
+            format_names: Registered export format names; duplicates are ignored.
+            output_dir: Optional override directory for exports.
+
+        Returns:
+            Mapping of format name to the paths written, in part order.
+
+        Raises:
+            ValueError: If any format name is not registered.
+            FileNotFoundError: If an export directory cannot be created/found.
+        """
+        selected = self._selected_export_formats(format_names)
+        exported_paths = {name: [] for name in selected}
+        if self._exports_disabled(output_dir):
+            return exported_paths
+
+        if any(export_format.is_mesh_based for export_format in selected.values()):
+            self.mesh_parts()
+        for part in self.parts:
+            part_paths = self._export_part_formats(part, selected, output_dir)
+            for name, export_path in part_paths.items():
+                exported_paths[name].append(export_path)
+        return exported_paths
+
+    def _selected_export_formats(
+        self, format_names: Sequence[str]
+    ) -> dict[str, ExportFormat]:
+        """Resolve format names to registered formats, dropping duplicates."""
+        selected = {}
+        for format_name in format_names:
+            export_format = get_export_format(format_name)
+            selected.setdefault(export_format.name, export_format)
+        return selected
+
+    def _export_part_formats(
+        self,
+        part: AutomatablePart,
+        selected: dict[str, ExportFormat],
+        output_dir: Optional[str | Path] = None,
+    ) -> dict[str, Path]:
+        """Export one part in every selected format, sharing one tessellation.
+
+        Mesh-based formats are written from the part's cached
+        `triangle_mesh()` at its `_mesh_settings`; B-rep formats such as
+        STEP are written from the shape.
+
+        Returns:
+            Mapping of format name to the path written for this part.
+        """
+        part_paths = {}
+        for export_format in selected.values():
+            export_path = self._prepared_export_path(
+                part, export_format.suffix, output_dir
+            )
+            if export_format.is_mesh_based:
+                mesh = part.triangle_mesh(*self._mesh_settings(part))
+                export_format.mesh_writer(mesh, str(export_path))
+            else:
+                export_format.write(part.part, str(export_path))
+            part.record_export(export_format.name, export_path)
+            part_paths[export_format.name] = export_path
+        return part_paths
+
     def _config_snapshot(self) -> dict:
-        """Return a deep-copied snapshot of current config values."""
-        return deepcopy(self._config.as_dict())
+        """Return a deep-copied snapshot of current config values.
+
+        Array fields are reduced to a digest so large arrays are neither
+        copied nor compared element by element.
+        """
+        return _snapshot_value(self._config.as_dict())
 
     def _mark_compiled(self):
         """Store the current config snapshot as the compiled baseline."""
         self._compiled_config_snapshot = self._config_snapshot()
 
-    def _wrap_compile_method(self):
-        """Wrap `compile` once so successful compiles update dirty state."""
-        if getattr(self, "_compile_is_wrapped", False):
-            return
+    @classmethod
+    def _compile_function(cls):
+        """Return the subclass `compile` function without dirty tracking."""
+        compile_method = cls.compile
+        return getattr(compile_method, "__wrapped__", compile_method)
+
+    def __init_subclass__(cls, **kwargs):
+        """Wrap each subclass `compile` once, at class creation."""
+        super().__init_subclass__(**kwargs)
+        compile_function = cls.__dict__.get("compile")
+        if callable(compile_function) and not getattr(
+            compile_function, "_partomatic_tracks_compile", False
+        ):
+            cls.compile = _track_compile(compile_function)
+
+    @property
+    def compiles_incrementally(self) -> bool:
+        """Whether `compile` is a generator that yields parts one at a time."""
+        return inspect.isgeneratorfunction(self._compile_function())
+
+    def iter_compile(self) -> Iterator[AutomatablePart]:
+        """Compile and yield parts as they are built.
+
+        When `compile` is written as a generator, each yielded part is appended
+        to `self.parts` and handed to the caller before the next part is
+        built, so callers can export or dispatch early parts while later parts
+        are still being modeled. A regular `compile` runs to completion first
+        and its parts are then yielded in order.
+
+        Yields:
+            Each compiled `AutomatablePart`, in build order.
+
+        Raises:
+            InfeasibleConfigError: If a config feasibility predicate fails.
+        """
+        if not self._compile_depth:
+            self._config.validate_feasibility()
+        self._compile_depth += 1
+        try:
+            result = self._compile_function()(self)
+            if inspect.isgenerator(result):
+                self.parts.clear()
+                for part in result:
+                    self.parts.append(part)
+                    yield part
+                compiled_parts = []
+            else:
+                compiled_parts = list(self.parts)
+        finally:
+            self._compile_depth -= 1
+        self._mark_compiled()
+        yield from compiled_parts
+
+    def compile_isolated(
+        self,
+        timeout: float | None = None,
+        memory_limit: int | None = None,
+    ) -> list[AutomatablePart]:
+        """Run `compile` in a child process and adopt the resulting parts.
 
-        original_compile = self.compile
+        A hung or crashing OCC operation only affects the child: it is killed
+        once `timeout` passes, and the parent keeps its previous parts.
 
-        @wraps(original_compile)
-        def wrapped_compile(*args, **kwargs):
-            result = original_compile(*args, **kwargs)
-            self._mark_compiled()
-            return result
+        Args:
+            timeout: Wall-clock limit in seconds; `None` waits indefinitely.
+            memory_limit: Optional `RLIMIT_AS` cap for the child in bytes.
+
+        Returns:
+            The compiled parts, also stored in `self.parts`.
 
-        self.compile = wrapped_compile
-        self._compile_is_wrapped = True
+        Raises:
+            CompileTimeoutError: If the deadline passes.
+            CompileCrashedError: If the child exits without returning parts.
+            InfeasibleConfigError: If a config feasibility predicate fails;
+                no child process is started.
+        """
+        self._config.validate_feasibility()
+        snapshot = self._config_snapshot()
+        self.parts = compile_isolated(self, timeout=timeout, memory_limit=memory_limit)
+        self._compiled_config_snapshot = snapshot
+        return self.parts
 
     @property
     def is_dirty(self) -> bool:
@@ -234,32 +700,176 @@ class Partomatic(PartomaticPreviewMixin, ABC):
             configuration: Optional configuration source passed to `load_config`.
             **kwargs: Field overrides passed to `load_config`.
         """
+        self._init_instance_state()
+        self.load_config(configuration, **kwargs)
+
+    def _init_instance_state(self, config: PartomaticConfig | None = None):
+        """Reset parts, compile tracking, and the per-instance config copy.
+
+        Args:
+            config: Config instance to adopt instead of copying the class
+                default.
+        """
         self.parts = []
-        # we have to call self.__class__.config so it can handle instanting
-        # the descendant class of PartomaticConfig instead of using the generic
-        # parent implementation
-        self._config = self.__class__._config
+        # we have to start from self.__class__._config so it can handle
+        # instantiating the descendant class of PartomaticConfig instead of the
+        # generic parent implementation; each instance gets its own copy so
+        # instances never mutate the shared class-level default
+        if config is None:
+            config = deepcopy(self.__class__._config)
+        self._config = config
         self._source_dir = Path(inspect.getfile(self.__class__)).parent
         self._compiled_config_snapshot = None
-        self._compile_is_wrapped = False
-        self._wrap_compile_method()
+        self._compile_depth = 0
         self._init_preview_state()
-        self.load_config(configuration, **kwargs)
 
-    def partomate(self, export_steps: bool = False):
+    def __getstate__(self) -> dict:
+        """Return pickle state holding a config snapshot and other attributes.
+
+        The class is pickled by reference and compiled geometry is not sent,
+        so instances can be shipped cheaply to worker processes, which
+        recompile as needed. Attributes a subclass sets, e.g. in `__init__`,
+        are carried along unless named in `_transient_state`.
+        """
+        state = {"config": self._config.as_dict()}
+        attributes = {
+            name: value
+            for name, value in self.__dict__.items()
+            if name not in self._transient_state
+        }
+        if attributes:
+            state["attributes"] = attributes
+        return state
+
+    def __setstate__(self, state: dict):
+        """Restore an instance from the config snapshot in `state`.
+
+        The snapshot was produced by `__getstate__`, so the config is rebuilt
+        with the trusted `PartomaticConfig.construct` path.
+        """
+        config_class = type(self.__class__._config)
+        self._init_instance_state(config_class.construct(state["config"]))
+        self.__dict__.update(state.get("attributes", {}))
+
+    def partomate(
+        self,
+        export_steps: bool = False,
+        formats: Sequence[str] = (),
+        release_geometry: bool = False,
+        max_pending_exports: int = 2,
+        reuse_compiled: bool = False,
+    ):
         """Compile this part and export output files.
 
         Args:
             export_steps: When True, also export STEP files.
+            formats: Additional registered export format names to write,
+                such as `("3mf", "glb")`.
+            release_geometry: When True, drop each part's geometry once it has
+                been exported and keep only paths, hashes, bounding box and
+                volume. With a generator `compile` this happens part by part.
+            max_pending_exports: For generator compiles, how many built parts
+                may wait for export before modeling pauses.
+            reuse_compiled: When True and the config has not changed since
+                the last compile, export the existing parts without
+                recompiling.
 
         Notes:
             Override `export_stls()` and/or `export_steps()` if a subclass wants
-            custom export behavior or to disable a format.
+            custom export behavior or to disable a format. When `formats` adds
+            another mesh-based format, STL and the extra formats are written
+            together through `export_many()` so each part is tessellated once.
+            When `compile` is a generator, parts are exported on a background
+            thread while later parts are still being built. Both shortcuts
+            bypass the two hooks, so a subclass that overrides either one is
+            compiled in full and exported through its hooks, with
+            `export_many()` writing only the remaining formats.
         """
-        self.compile()
-        self.export_stls()
+        format_names = [get_export_format(name).name for name in formats]
+        export_steps = export_steps or "step" in format_names
+        extra_formats = [name for name in format_names if name not in ("stl", "step")]
         if export_steps:
-            self.export_steps()
+            extra_formats.append("step")
+        recompile = not reuse_compiled or self.is_dirty
+        hooks_overridden = self._overrides_export_hooks()
+        if recompile and self.compiles_incrementally and not hooks_overridden:
+            self._partomate_streaming(
+                ["stl", *extra_formats], release_geometry, max_pending_exports
+            )
+            return
+        if recompile:
+            self.compile()
+        mesh_formats = [name for name in extra_formats if name != "step"]
+        if mesh_formats and not hooks_overridden:
+            self.export_many(["stl", *extra_formats])
+        else:
+            self.export_stls()
+            if export_steps:
+                self.export_steps()
+            if mesh_formats:
+                self.export_many(mesh_formats)
+        if release_geometry:
+            self.release_geometry()
+
+    def _overrides_export_hooks(self) -> bool:
+        """Whether a subclass overrides `export_stls()` or `export_steps()`."""
+        cls = type(self)
+        return (
+            cls.export_stls is not Partomatic.export_stls
+            or cls.export_steps is not Partomatic.export_steps
+        )
+
+    def _partomate_streaming(
+        self,
+        format_names: Sequence[str],
+        release_geometry: bool,
+        max_pending_exports: int,
+    ) -> dict[str, list[Path]]:
+        """Export parts from a generator compile while later parts are built."""
+        selected = self._selected_export_formats(format_names)
+        exported_paths = {name: [] for name in selected}
+        if self._exports_disabled(None):
+            self.compile()
+            return exported_paths
+
+        def export_one(part: AutomatablePart) -> dict[str, Path]:
+            part_paths = self._export_part_formats(part, selected)
+            if release_geometry:
+                part.release_geometry(self._mesh_settings(part))
+            return part_paths
+
+        def collect(future):
+            for name, export_path in future.result().items():
+                exported_paths[name].append(export_path)
+
+        pending = deque()
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="partomatic-export"
+        ) as executor:
+            for part in self.iter_compile():
+                pending.append(executor.submit(export_one, part))
+                while len(pending) > max(max_pending_exports, 1):
+                    collect(pending.popleft())
+            while pending:
+                collect(pending.popleft())
+        if release_geometry:
+            # geometry is gone, so the next preview or export must recompile
+            self._compiled_config_snapshot = None
+        return exported_paths
+
+    def release_geometry(self, collect_garbage: bool = False):
+        """Drop compiled geometry from every part, keeping export metadata.
+
+        Args:
+            collect_garbage: When True, run `gc.collect()` afterwards so
+                released OCC handles are freed before the next build.
+        """
+        for part in self.parts:
+            if part.part is not None:
+                part.release_geometry(self._mesh_settings(part))
+        self._compiled_config_snapshot = None
+        if collect_garbage:
+            gc.collect()
 
 
 if __name__ == "__main__":
@@ -3,10 +3,13 @@ __package__ = "partomatic"
 
 from dataclasses import field, fields, is_dataclass, MISSING
 from enum import Enum, Flag
+from functools import cache
 from pathlib import Path
-from typing import ClassVar, get_origin
+from typing import Annotated, Any, ClassVar, Iterable, Mapping, get_origin
 
+from pydantic import ConfigDict, Field, PlainValidator, TypeAdapter, ValidationError
 from pydantic.dataclasses import dataclass as pydantic_dataclass
+from typing_extensions import TypedDict
 import yaml
 
 if __name__ == "__main__":
@@ -20,7 +23,67 @@ if __name__ == "__main__":
     if src_root not in sys.path:
         sys.path.insert(0, src_root)
 
-from partomatic.partomatic_config_editor import PartomaticConfigEditorMixin
+from partomatic.tessellation import DEFAULT_ANGULAR_TOLERANCE, DEFAULT_LINEAR_TOLERANCE
+from partomatic.partomatic_config_editor import (
+    PartomaticConfigEditorMixin,
+    _is_array_type,
+    _load_array,
+    _resolve_sidecars,
+)
+
+# comparison symbol and check for each supported numeric/length constraint
+_CONSTRAINT_CHECKS = {
+    "ge": (">=", lambda value, bound: value >= bound),
+    "gt": (">", lambda value, bound: value > bound),
+    "le": ("<=", lambda value, bound: value <= bound),
+    "lt": ("<", lambda value, bound: value < bound),
+}
+_LENGTH_CONSTRAINT_CHECKS = {
+    "min_length": (">=", lambda length, bound: length >= bound),
+    "max_length": ("<=", lambda length, bound: length <= bound),
+}
+
+
+class ConstraintViolationError(ValueError):
+    """Raised when config values fall outside their declared field constraints.
+
+    Attributes:
+        violations: One human-readable message per violated constraint.
+    """
+
+    def __init__(self, violations: list[str]):
+        self.violations = list(violations)
+        super().__init__("; ".join(self.violations))
+
+
+class InfeasibleConfigError(ConstraintViolationError):
+    """Raised when config values fail a declared feasibility predicate."""
+
+
+def feasibility_check(method=None, *, message: str | None = None):
+    """Mark a config method as a cheap pre-compile feasibility predicate.
+
+    The method takes no arguments and returns True when the config can be
+    built. Use it bare (`@feasibility_check`) or with a message
+    (`@feasibility_check(message="bearing must fit inside the wheel")`).
+
+    Args:
+        method: Method being decorated when used without arguments.
+        message: Violation message; defaults to `"<method name> failed"`.
+
+    Returns:
+        The method, marked for `PartomaticConfig.feasibility_violations`.
+    """
+
+    def mark(function):
+        function._partomatic_feasibility_message = (
+            message or f"{function.__name__} failed"
+        )
+        return function
+
+    if method is not None:
+        return mark(method)
+    return mark
 
 
 class AutoDataclassMeta(type):
@@ -40,7 +103,12 @@ class AutoDataclassMeta(type):
         """
         original_init = dct.get("__init__")
         new_cls = super().__new__(cls, name, bases, dct)
-        new_cls = pydantic_dataclass(kw_only=True, repr=False)(new_cls)
+        new_cls = pydantic_dataclass(
+            kw_only=True,
+            repr=False,
+            # allows numpy.ndarray fields
+            config=ConfigDict(arbitrary_types_allowed=True),
+        )(new_cls)
 
         if original_init is not None:
             new_cls.__init__ = original_init
@@ -74,6 +142,9 @@ class PartomaticConfig(PartomaticConfigEditorMixin, metaclass=AutoDataclassMeta)
     file_prefix: str = ""
     file_suffix: str = ""
     create_folders_if_missing: bool = True
+    mesh_tolerance: float = DEFAULT_LINEAR_TOLERANCE
+    mesh_angular_tolerance: float = DEFAULT_ANGULAR_TOLERANCE
+    adaptive_mesh_tolerance: bool = False
 
     def _iter_annotated_field_names(self) -> list[str]:
         """Return unique public annotated field names from the class hierarchy."""
@@ -100,6 +171,114 @@ class PartomaticConfig(PartomaticConfigEditorMixin, metaclass=AutoDataclassMeta)
                     names.append(name)
         return names
 
+    def constraint_violations(self) -> list[str]:
+        """Check field values against their `ge`/`gt`/`le`/`lt` and length metadata.
+
+        Nested configs are checked recursively and reported with dotted
+        field paths such as `bearing.radius`.
+
+        Returns:
+            One message per violated constraint; empty when all values fit.
+        """
+        violations = []
+        for classfield in fields(self.__class__):
+            value = getattr(self, classfield.name, None)
+            if value is None:
+                continue
+            if isinstance(value, PartomaticConfig):
+                violations.extend(
+                    f"{classfield.name}.{violation}"
+                    for violation in value.constraint_violations()
+                )
+            for key, bound in self._constraint_map(classfield).items():
+                if key in _CONSTRAINT_CHECKS:
+                    symbol, check = _CONSTRAINT_CHECKS[key]
+                    if not check(value, bound):
+                        violations.append(
+                            f"{classfield.name} must be {symbol} {bound}, got {value!r}"
+                        )
+                elif key in _LENGTH_CONSTRAINT_CHECKS:
+                    symbol, check = _LENGTH_CONSTRAINT_CHECKS[key]
+                    if not check(len(value), bound):
+                        violations.append(
+                            f"{classfield.name} length must be {symbol} {bound}, "
+                            f"got {len(value)}"
+                        )
+        return violations
+
+    def _feasibility_predicates(self) -> list[tuple[str, callable]]:
+        """Return `(message, predicate)` pairs declared on fields and methods."""
+        predicates = []
+        for classfield in fields(self.__class__):
+            predicate = classfield.metadata.get("feasible")
+            if predicate is not None:
+                message = classfield.metadata.get(
+                    "infeasible_message", f"{classfield.name} is infeasible"
+                )
+                predicates.append((message, lambda p=predicate: p(self)))
+        seen = set()
+        for klass in self.__class__.__mro__:
+            for name, member in klass.__dict__.items():
+                if name in seen:
+                    continue
+                seen.add(name)
+                message = getattr(member, "_partomatic_feasibility_message", None)
+                if message is not None:
+                    predicates.append((message, getattr(self, name)))
+        return predicates
+
+    def feasibility_violations(self) -> list[str]:
+        """Evaluate feasibility predicates declared on this config.
+
+        Predicates are declared either as a `feasible` callable in field
+        metadata, which receives the config (with an optional
+        `infeasible_message`), or as methods decorated with
+        `feasibility_check`. They should be cheap checks across fields, such
+        as `bearing.radius < radius - wall`, that rule a config out before any
+        geometry is built. Nested configs are checked recursively.
+
+        Returns:
+            One message per failed predicate; empty when the config is
+            feasible. A predicate that raises is reported as failed.
+        """
+        violations = []
+        for classfield in fields(self.__class__):
+            value = getattr(self, classfield.name, None)
+            if isinstance(value, PartomaticConfig):
+                violations.extend(
+                    f"{classfield.name}.{violation}"
+                    for violation in value.feasibility_violations()
+                )
+        for message, predicate in self._feasibility_predicates():
+            try:
+                feasible = predicate()
+            except Exception as error:
+                violations.append(f"{message} ({error})")
+                continue
+            if not feasible:
+                violations.append(message)
+        return violations
+
+    def validate_feasibility(self):
+        """Raise when any feasibility predicate fails.
+
+        Raises:
+            InfeasibleConfigError: Listing every failed predicate.
+        """
+        violations = self.feasibility_violations()
+        if violations:
+            raise InfeasibleConfigError(violations)
+
+    def validate_constraints(self):
+        """Raise when any field value violates its declared constraints.
+
+        Raises:
+            ConstraintViolationError: Listing every violated constraint.
+        """
+        violations = self.constraint_violations()
+        if violations:
+            raise ConstraintViolationError(violations)
+
     def _safe_getattr(self, name: str):
         """Fetch an attribute and convert failures into a readable marker."""
         try:
@@ -222,6 +401,55 @@ class PartomaticConfig(PartomaticConfigEditorMixin, metaclass=AutoDataclassMeta)
             else:
                 raise ValueError(f"Field {field.name} has no default value")
 
+    @classmethod
+    def construct(cls, snapshot: Mapping[str, Any]):
+        """Rebuild a config from a snapshot partomatic produced itself.
+
+        This trusted path is for data that was validated when it was first
+        loaded, such as `as_dict()` snapshots sent to worker processes or
+        kept as cache keys. It skips validation and the YAML root-node lookup
+        in `load_config`: fields are assigned directly, nested configs are
+        constructed the same way, and enum names are mapped back to members.
+        Fields missing from `snapshot` take their declared defaults.
+        `__post_init__` still runs so derived values are recomputed.
+
+        Args:
+            snapshot: Field-name mapping, typically from `as_dict()`.
+
+        Returns:
+            A new instance of `cls`.
+        """
+        config = cls.__new__(cls)
+        for classfield in fields(cls):
+            if classfield.name not in snapshot:
+                if classfield.default is not MISSING:
+                    value = classfield.default
+                elif classfield.default_factory is not MISSING:
+                    value = classfield.default_factory()
+                else:
+                    raise ValueError(f"Field {classfield.name} has no default value")
+                setattr(config, classfield.name, value)
+                continue
+            value = snapshot[classfield.name]
+            field_type = cls.__pydantic_fields__[classfield.name].annotation
+            if _is_array_type(field_type):
+                value = _load_array(value)
+            elif isinstance(field_type, type) and issubclass(field_type, (Enum, Flag)):
+                if isinstance(value, str):
+                    value = field_type[value]
+            elif isinstance(value, Mapping) and is_dataclass(field_type):
+                if issubclass(field_type, PartomaticConfig):
+                    value = field_type.construct(value)
+                else:
+                    value = field_type(**value)
+            elif isinstance(value, list) and (
+                field_type is tuple or get_origin(field_type) is tuple
+            ):
+                value = tuple(value)
+            setattr(config, classfield.name, value)
+        config.__post_init__()
+        return config
+
     def load_config(self, configuration: any, **kwargs):
         """Load configuration values from object, YAML text, or YAML file.
 
@@ -236,10 +464,13 @@ class PartomaticConfig(PartomaticConfigEditorMixin, metaclass=AutoDataclassMeta)
             return
         if configuration is not None:
             configuration = str(configuration)
+            # `.npy` sidecars are found relative to the YAML file, or the cwd
+            base_dir = Path()
             if "\n" not in configuration:
                 path = Path(configuration)
                 if path.exists() and path.is_file():
                     configuration = path.read_text()
+                    base_dir = path.parent
             bracket_dict = yaml.safe_load(configuration)
             if self.__class__.__name__ in bracket_dict:
                 bracket_dict = bracket_dict[self.__class__.__name__]
@@ -253,6 +484,7 @@ class PartomaticConfig(PartomaticConfigEditorMixin, metaclass=AutoDataclassMeta)
                 raise ValueError(
                     f"Configuration file does not contain a node for {self.__class__.__name__}"
                 )
+            bracket_dict = _resolve_sidecars(bracket_dict, base_dir)
 
             for classfield in fields(self.__class__):
                 if classfield.name in bracket_dict:
@@ -265,6 +497,8 @@ class PartomaticConfig(PartomaticConfigEditorMixin, metaclass=AutoDataclassMeta)
                             classfield.name,
                             classfield.type[value.upper()],
                         )
+                    elif _is_array_type(classfield.type):
+                        setattr(self, classfield.name, _load_array(value))
                     elif is_dataclass(classfield.type) and isinstance(value, dict):
                         setattr(
                             self,
@@ -280,7 +514,9 @@ class PartomaticConfig(PartomaticConfigEditorMixin, metaclass=AutoDataclassMeta)
                     None,
                 )
                 if classfield:
-                    if is_dataclass(classfield.type):
+                    if _is_array_type(classfield.type):
+                        setattr(self, key, _load_array(value))
+                    elif is_dataclass(classfield.type):
                         if isinstance(value, dict):
                             setattr(self, key, classfield.type(**value))
                         else:
@@ -316,6 +552,92 @@ class PartomaticConfig(PartomaticConfigEditorMixin, metaclass=AutoDataclassMeta)
         pass
 
 
+def _enum_name_validator(enum_type):
+    """Accept enum members or their (case-insensitive) names, as `load_config` does."""
+
+    def coerce(value):
+        if isinstance(value, enum_type):
+            return value
+        if isinstance(value, str) and value.upper() in enum_type.__members__:
+            return enum_type[value.upper()]
+        raise ValueError(f"must be one of {', '.join(enum_type.__members__)}")
+
+    return PlainValidator(coerce)
+
+
+@cache
+def _mapping_schema(config_class: type) -> type:
+    """Return a `TypedDict` mirroring the fields and constraints of `config_class`.
+
+    Every key is optional, matching how `load_config` overlays a mapping on
+    defaults. Nested configs become nested `TypedDict`s.
+    """
+    annotations = {}
+    for classfield in fields(config_class):
+        annotation = config_class.__pydantic_fields__[classfield.name].annotation
+        if isinstance(annotation, type) and issubclass(annotation, (Enum, Flag)):
+            annotations[classfield.name] = Annotated[
+                Any, _enum_name_validator(annotation)
+            ]
+            continue
+        if _is_array_type(annotation):
+            # nested lists, arrays or sidecar references are all accepted
+            annotation = Any
+        elif is_dataclass(annotation):
+            annotation = _mapping_schema(annotation)
+        constraints = {
+            key: classfield.metadata[key]
+            for key in (*_CONSTRAINT_CHECKS, *_LENGTH_CONSTRAINT_CHECKS)
+            if key in classfield.metadata
+        }
+        annotations[classfield.name] = (
+            Annotated[annotation, Field(**constraints)] if constraints else annotation
+        )
+    schema = TypedDict(f"{config_class.__name__}Mapping", annotations, total=False)
+    schema.__pydantic_config__ = ConfigDict(arbitrary_types_allowed=True)
+    return schema
+
+
+@cache
+def _mappings_adapter(config_class: type) -> TypeAdapter:
+    """Return the cached adapter validating a list of mappings for `config_class`."""
+    return TypeAdapter(list[_mapping_schema(config_class)])
+
+
+def validate_configs(
+    config_class: type[PartomaticConfig], mappings: Iterable[Mapping]
+) -> list[list[str]]:
+    """Validate many config mappings in a single pydantic pass.
+
+    The mappings are checked against field types, enum names and
+    `ge`/`gt`/`le`/`lt`/length metadata without constructing config objects,
+    so large catalogs validate quickly. Keys are optional, as with
+    `load_config`, and unknown keys are ignored. Feasibility predicates need
+    a config instance and are not evaluated here.
+
+    Args:
+        config_class: The `PartomaticConfig` subclass the mappings describe.
+        mappings: Field-name mappings, such as the node under a config's
+            YAML root.
+
+    Returns:
+        One list of error messages per mapping, in input order; empty lists
+        mark valid mappings. Messages name the dotted field path, e.g.
+        `"bearing.radius: Input should be greater than 0"`.
+    """
+    mappings = list(mappings)
+    errors = [[] for _ in mappings]
+    try:
+        _mappings_adapter(config_class).validate_python(mappings)
+    except ValidationError as error:
+        for detail in error.errors():
+            index, *path = detail["loc"]
+            location = ".".join(str(part) for part in path)
+            message = detail["msg"]
+            errors[index].append(f"{location}: {message}" if location else message)
+    return errors
+
+
 if __name__ == "__main__":
 
     class DemoConfig(PartomaticConfig):
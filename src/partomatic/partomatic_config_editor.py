@@ -2,12 +2,48 @@
 
 from dataclasses import MISSING, fields, is_dataclass
 from enum import Enum, Flag
+import os
 from pathlib import Path
 from threading import Thread
-from typing import Any
+from typing import Any, Mapping, get_origin
 
+import numpy as np
 import yaml
 
+# key of the YAML node that points an array field at its `.npy` sidecar
+NPY_SIDECAR_KEY = "npy"
+
+
+def _is_array_type(annotation) -> bool:
+    """Whether a field annotation is `numpy.ndarray` or `numpy.typing.NDArray`."""
+    return annotation is np.ndarray or get_origin(annotation) is np.ndarray
+
+
+def _load_array(value) -> np.ndarray:
+    """Turn a loaded array value into an ndarray, memory-mapping `.npy` sidecars."""
+    if isinstance(value, np.ndarray):
+        return value
+    if isinstance(value, Mapping) and NPY_SIDECAR_KEY in value:
+        return np.load(value[NPY_SIDECAR_KEY], mmap_mode="r")
+    return np.asarray(value)
+
+
+def _resolve_sidecars(data, base_dir: Path):
+    """Make relative `.npy` sidecar paths in loaded YAML relative to `base_dir`."""
+    if isinstance(data, dict):
+        if set(data) == {NPY_SIDECAR_KEY}:
+            return {NPY_SIDECAR_KEY: str(base_dir / data[NPY_SIDECAR_KEY])}
+        return {key: _resolve_sidecars(value, base_dir) for key, value in data.items()}
+    return data
+
+
+def _save_array(array: np.ndarray, path: Path):
+    """Write `array` to `path` atomically, so a live memory map of it stays valid."""
+    temporary = path.with_name(f"{path.name}.tmp")
+    with open(temporary, "wb") as stream:
+        np.save(stream, array)
+    os.replace(temporary, path)
+
 
 class PartomaticConfigEditorMixin:
     """Serialization and editor-spec helpers for configuration objects."""
@@ -35,10 +71,13 @@ class PartomaticConfigEditorMixin:
             return [self._to_primitive(item) for item in value]
         if isinstance(value, dict):
             return {str(key): self._to_primitive(item) for key, item in value.items()}
+        # arrays stay arrays; to_yaml/save_yaml decide how to write them
         return value
 
     def _coerce_editor_value(self, field_type, value):
         """Coerce editor-submitted values to configured field types."""
+        if _is_array_type(field_type):
+            return _load_array(value)
         if isinstance(field_type, type) and issubclass(field_type, (Enum, Flag)):
             if isinstance(value, str):
                 return field_type[value.upper()]
@@ -75,7 +114,10 @@ class PartomaticConfigEditorMixin:
         self.__post_init__()
 
     def as_dict(self) -> dict:
-        """Serialize configuration fields to a plain dictionary."""
+        """Serialize configuration fields to a plain dictionary.
+
+        NumPy array fields are returned as the arrays themselves.
+        """
         return {
             classfield.name: self._to_primitive(getattr(self, classfield.name))
             for classfield in fields(self.__class__)
@@ -85,14 +127,52 @@ class PartomaticConfigEditorMixin:
         """Return default YAML root node name for this config class."""
         return self._clean_config_class_name.lower()
 
+    def _yaml_data(self, data, yaml_path: Path | None = None, field_path: str = ""):
+        """Prepare `as_dict()` output for YAML, writing arrays to sidecars.
+
+        Without `yaml_path` arrays are inlined as nested lists; with it each
+        array is saved as `<yaml stem>.<field path>.npy` next to the YAML
+        file and referenced by name.
+        """
+        if isinstance(data, dict):
+            return {
+                key: self._yaml_data(
+                    value, yaml_path, f"{field_path}.{key}" if field_path else key
+                )
+                for key, value in data.items()
+            }
+        if isinstance(data, np.ndarray):
+            if yaml_path is None:
+                return data.tolist()
+            sidecar = yaml_path.with_name(f"{yaml_path.stem}.{field_path}.npy")
+            _save_array(data, sidecar)
+            return {NPY_SIDECAR_KEY: sidecar.name}
+        return data
+
     def to_yaml(self, root_node: str = None) -> str:
-        """Serialize configuration to Partomatic-compatible YAML."""
+        """Serialize configuration to Partomatic-compatible YAML.
+
+        NumPy array fields are inlined as nested lists; use `save_yaml` to
+        keep them in `.npy` sidecar files instead.
+        """
         node_name = root_node or self._default_yaml_root()
-        return yaml.safe_dump({node_name: self.as_dict()}, sort_keys=False)
+        return yaml.safe_dump(
+            {node_name: self._yaml_data(self.as_dict())}, sort_keys=False
+        )
 
     def save_yaml(self, path: str, root_node: str = None):
-        """Write configuration to a YAML file."""
-        Path(path).write_text(self.to_yaml(root_node=root_node))
+        """Write configuration to a YAML file.
+
+        NumPy array fields are written to `<stem>.<field path>.npy` sidecars
+        beside the YAML file, which `load_config` memory-maps back.
+        """
+        path = Path(path)
+        node_name = root_node or self._default_yaml_root()
+        path.write_text(
+            yaml.safe_dump(
+                {node_name: self._yaml_data(self.as_dict(), path)}, sort_keys=False
+            )
+        )
 
     def _constraint_map(self, classfield) -> dict:
         """Collect supported validation/display constraints from field metadata."""
@@ -140,6 +220,9 @@ class PartomaticConfigEditorMixin:
         """Create editor schema for all dataclass fields on `cls`."""
         spec = {}
         for classfield in fields(cls):
+            if _is_array_type(classfield.type):
+                # arrays are edited as sidecar files, not form fields
+                continue
             current_value = (
                 getattr(value_obj, classfield.name)
                 if value_obj is not None
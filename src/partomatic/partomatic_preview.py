@@ -8,6 +8,8 @@ import time
 from enum import Enum
 from threading import Thread
 
+from partomatic.export_cache import DEFAULT_EXPORT_CACHE_SIZE
+
 
 class PreviewState(Enum):
     """Preview lifecycle state for rendered geometry."""
@@ -46,8 +48,23 @@ class PartomaticPreviewMixin:
             self._preview_state = PreviewState.DIRTY
         self._preview_error = None
 
-    def compile_for_preview(self):
-        """Compile the model and update preview state transitions."""
+    def compile_for_preview(
+        self,
+        timeout: float | None = None,
+        memory_limit: int | None = None,
+        pool=None,
+    ):
+        """Compile the model and update preview state transitions.
+
+        Args:
+            timeout: Wall-clock limit in seconds. When this or
+                `memory_limit` is set, the compile runs in a child process
+                via `compile_isolated`.
+            memory_limit: Optional `RLIMIT_AS` cap in bytes for the child.
+            pool: Optional `PartomaticWorkerPool`; when given, and no
+                isolation limit is set, the compile runs on a pool worker
+                that also meshes the parts for display.
+        """
         if hasattr(self, "is_dirty") and not self.is_dirty:
             self._preview_state = PreviewState.CLEAN
             self._preview_error = None
@@ -55,7 +72,14 @@ class PartomaticPreviewMixin:
         self._preview_state = PreviewState.RENDERING
         self._preview_error = None
         try:
-            self.compile()
+            if timeout is None and memory_limit is None:
+                if pool is None:
+                    self.compile()
+                else:
+                    self._config.validate_feasibility()
+                    pool.compile(self, mesh=True)
+            else:
+                self.compile_isolated(timeout=timeout, memory_limit=memory_limit)
         except Exception as ex:
             self._preview_state = PreviewState.ERROR
             self._preview_error = str(ex)
@@ -112,6 +136,14 @@ class PartomaticPreviewMixin:
         viewer_host: str = "127.0.0.1",
         viewer_port: int = 3939,
         background: bool = False,
+        compile_timeout: float | None = None,
+        compile_memory_limit: int | None = None,
+        export_cache_size: int = DEFAULT_EXPORT_CACHE_SIZE,
+        max_sessions: int = 32,
+        session_idle_timeout: float = 1800.0,
+        max_cached_builds: int = 16,
+        compile_workers: int | None = 0,
+        max_viewers: int = 8,
     ):
         """Launch a combined configurator window: config form + 3D preview in one page.
 
@@ -123,8 +155,27 @@ class PartomaticPreviewMixin:
             port: Starting port; incremented up to port_retries times if occupied.
             port_retries: Number of additional ports to try after start_port.
             viewer_host: OCP viewer standalone host.
-            viewer_port: OCP viewer standalone port.
+            viewer_port: First OCP viewer standalone port; each browser
+                session gets its own viewer on the next free port.
             background: When True run the UI server in a daemon thread.
+            compile_timeout: When set, every compile runs in a child process
+                that is killed after this many seconds, so a pathological
+                configuration cannot hang the server.
+            compile_memory_limit: Optional `RLIMIT_AS` cap in bytes for
+                isolated compiles; also enables isolation on its own.
+            export_cache_size: Disk space in bytes for cached downloads,
+                keyed by config and format; 0 disables the cache.
+            max_sessions: Most browser sessions with their own copy of this
+                part; the least recently used session is dropped beyond this.
+            session_idle_timeout: Seconds a session may go unused before its
+                copy is dropped.
+            max_cached_builds: Compiled configurations shared across
+                sessions.
+            compile_workers: Worker processes that compile for every
+                session; `None` uses one per CPU core and 0 compiles in the
+                server process.
+            max_viewers: Standalone viewers started for sessions; beyond
+                this the least recently used session's viewer is reused.
         """
         try:
             import nicegui  # noqa: F401
@@ -153,6 +204,14 @@ class PartomaticPreviewMixin:
             host=host,
             port=port,
             port_retries=port_retries,
+            compile_timeout=compile_timeout,
+            compile_memory_limit=compile_memory_limit,
+            export_cache_size=export_cache_size,
+            max_sessions=max_sessions,
+            session_idle_timeout=session_idle_timeout,
+            max_cached_builds=max_cached_builds,
+            compile_workers=compile_workers,
+            max_viewers=max_viewers,
         )
 
         if background:
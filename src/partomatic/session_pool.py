@@ -0,0 +1,212 @@
+"""Per-session instances and viewers, and shared compiled parts for servers."""
+
+from collections import OrderedDict
+from copy import deepcopy
+from functools import partial
+from threading import Lock
+import time
+
+from partomatic.single_flight import config_hash, single_flight_compile
+
+
+class CompiledPartsCache:
+    """Thread-safe LRU of compiled parts shared between Partomatic instances.
+
+    Entries are keyed by part class and config snapshot, so any instance
+    whose config matches an earlier compile adopts its parts instead of
+    compiling again. Parts are shared, not copied, and must be treated as
+    read-only by the instances that adopt them; meshing them for exports
+    and display is serialized by each part's `mesh_lock`.
+
+    Attributes:
+        max_entries: How many compiled configurations to keep.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def key(partomatic) -> str:
+        """Return the cache key for `partomatic`'s class and current config."""
+        return config_hash(partomatic)
+
+    def get(self, key: str) -> list | None:
+        """Return the parts compiled for `key` and mark them recently used."""
+        with self._lock:
+            parts = self._entries.get(key)
+            if parts is not None:
+                self._entries.move_to_end(key)
+            return parts
+
+    def put(self, key: str, parts: list):
+        """Store compiled parts under `key`, dropping the oldest entries."""
+        with self._lock:
+            self._entries[key] = list(parts)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def compile_for_preview(
+        self,
+        partomatic,
+        timeout: float | None = None,
+        memory_limit: int | None = None,
+        pool=None,
+    ):
+        """Compile `partomatic` for preview unless its config is cached.
+
+        On a hit the cached parts are adopted and the instance is marked
+        compiled without running `compile`; on a miss the compile runs as
+        `compile_for_preview` would and its parts are cached. Concurrent
+        misses for the same config share one compile through
+        `single_flight_compile`.
+
+        Args:
+            partomatic: Instance to compile.
+            timeout: Forwarded to `compile_for_preview`.
+            memory_limit: Forwarded to `compile_for_preview`.
+            pool: Forwarded to `compile_for_preview`.
+        """
+        key = self.key(partomatic) if partomatic.is_dirty else None
+        parts = self.get(key) if key is not None else None
+        compile_for_preview = partial(
+            partomatic.compile_for_preview,
+            timeout=timeout,
+            memory_limit=memory_limit,
+            pool=pool,
+        )
+        if key is not None and parts is None:
+            self.put(key, single_flight_compile(partomatic, compile_for_preview))
+            return
+        if parts is not None:
+            partomatic.parts = list(parts)
+            partomatic._mark_compiled()
+        # not dirty any more, so this only settles the preview state
+        compile_for_preview()
+
+
+class PartomaticSessionPool:
+    """Bounded pool of Partomatic instances, one per UI session.
+
+    Each session gets its own copy of `template`, so sessions never see each
+    other's config or geometry. Sessions unused for `idle_timeout` seconds
+    are dropped, and when the pool is full the least recently used session
+    is dropped to make room; a dropped session simply gets a fresh copy on
+    its next request.
+
+    Attributes:
+        template: Instance whose config each new session starts from.
+        max_sessions: Most sessions kept at once.
+        idle_timeout: Seconds a session may go unused before it is dropped.
+        compiled_parts: Compiled geometry shared by every session.
+    """
+
+    def __init__(
+        self,
+        template,
+        max_sessions: int = 32,
+        idle_timeout: float = 1800.0,
+        compiled_parts: CompiledPartsCache | None = None,
+    ):
+        if max_sessions < 1:
+            raise ValueError("A session pool needs room for at least one session")
+        self.template = template
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.compiled_parts = (
+            compiled_parts if compiled_parts is not None else CompiledPartsCache()
+        )
+        # session id -> (instance, last used time), least recently used first
+        self._sessions: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def acquire(self, session_id: str):
+        """Return the instance for `session_id`, creating it if needed."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                while len(self._sessions) >= self.max_sessions:
+                    self._sessions.popitem(last=False)
+                # pickling state leaves out compiled parts, so copies start uncompiled
+                partomatic = deepcopy(self.template)
+            else:
+                partomatic = entry[0]
+            self._sessions[session_id] = (partomatic, now)
+            return partomatic
+
+    def release(self, session_id: str):
+        """Drop the instance for `session_id`, if any."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def _evict_idle(self, now: float):
+        """Drop sessions unused for longer than `idle_timeout`."""
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used <= self.idle_timeout:
+                break
+            del self._sessions[session_id]
+
+
+class ViewerPortPool:
+    """Bounded set of OCP viewer ports, one per UI session.
+
+    Each session is given its own port from `base_port` upwards, so
+    sessions render into separate viewers instead of replacing each other's
+    scene. When every port is taken, the least recently used session's port
+    is handed over; that session gets another port the next time it asks.
+
+    Attributes:
+        base_port: Lowest port handed out.
+        max_viewers: How many ports, and so viewers, are used at most.
+    """
+
+    def __init__(self, base_port: int, max_viewers: int = 8):
+        if max_viewers < 1:
+            raise ValueError("A viewer pool needs room for at least one viewer")
+        self.base_port = base_port
+        self.max_viewers = max_viewers
+        # session id -> port, least recently used first
+        self._ports: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def acquire(self, session_id: str) -> int:
+        """Return the viewer port for `session_id`, assigning one if needed."""
+        with self._lock:
+            port = self._ports.pop(session_id, None)
+            if port is None:
+                taken = set(self._ports.values())
+                free = [
+                    candidate
+                    for candidate in range(
+                        self.base_port, self.base_port + self.max_viewers
+                    )
+                    if candidate not in taken
+                ]
+                if free:
+                    port = free[0]
+                else:
+                    _, port = self._ports.popitem(last=False)
+            self._ports[session_id] = port
+            return port
+
+    def release(self, session_id: str):
+        """Free the port of `session_id`, if any."""
+        with self._lock:
+            self._ports.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._ports)
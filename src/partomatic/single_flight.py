@@ -0,0 +1,119 @@
+"""Share one in-flight compile between concurrent callers for the same config."""
+
+from concurrent.futures import Future
+import hashlib
+import json
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+from partomatic.automatable_part import AutomatablePart
+
+
+def config_hash(partomatic) -> str:
+    """Return a digest of `partomatic`'s class and current config values."""
+    partomatic_class = type(partomatic)
+    identity = {
+        "class": f"{partomatic_class.__module__}.{partomatic_class.__qualname__}",
+        "config": partomatic._config_snapshot(),
+    }
+    encoded = json.dumps(identity, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key.
+
+    While a call for a key is in flight, further callers for that key get
+    the same `Future` instead of starting another call. The key is
+    forgotten as soon as the call finishes, so results are not cached;
+    pair this with a cache such as `CompiledPartsCache` for that.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = Lock()
+
+    def submit(self, key: Hashable, start: Callable[[], Future]) -> Future:
+        """Return the in-flight future for `key`, or the one `start()` returns.
+
+        `start` is only called when no call for `key` is in flight, so it can
+        submit a job to an executor without duplicating one already running.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future
+            future = start()
+            self._calls[key] = future
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def do(
+        self, key: Hashable, function: Callable, *args, **kwargs
+    ) -> tuple[Any, bool]:
+        """Call `function` unless a call for `key` is in flight, then return its result.
+
+        Callers that join an in-flight call block until it finishes and get
+        its result, or its exception re-raised.
+
+        Returns:
+            `(result, ran)`, where `ran` is True only for the caller that
+            actually called `function`.
+        """
+        leader = Future()
+        future = self.submit(key, lambda: leader)
+        if future is not leader:
+            return future.result(), False
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            leader.set_exception(error)
+            raise
+        leader.set_result(result)
+        return result, True
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, future: Future):
+        """Drop `key` once its call has finished."""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+# one process-wide instance so the configurator and batches share compiles
+_shared_flight = SingleFlight()
+
+
+def shared_single_flight() -> SingleFlight:
+    """Return the process-wide `SingleFlight` used for compiles and batches."""
+    return _shared_flight
+
+
+def single_flight_compile(
+    partomatic, compile_function: Callable[[], Any] | None = None
+) -> list[AutomatablePart]:
+    """Compile `partomatic`, sharing the work with concurrent identical compiles.
+
+    When another thread is already compiling the same class and config, this
+    waits for that compile and adopts its parts instead of compiling again.
+
+    Args:
+        partomatic: Instance to compile.
+        compile_function: Called instead of `partomatic.compile()` by the
+            caller that runs the compile, e.g. to compile for preview.
+
+    Returns:
+        The compiled parts, also assigned to `partomatic.parts`.
+    """
+
+    def run() -> list[AutomatablePart]:
+        (compile_function or partomatic.compile)()
+        return list(partomatic.parts)
+
+    parts, ran = _shared_flight.do(("compile", config_hash(partomatic)), run)
+    if not ran:
+        partomatic.parts = list(parts)
+        partomatic._mark_compiled()
+    return partomatic.parts
@@ -0,0 +1,229 @@
+"""Parameter sweeps: generate config points and build them as a batch."""
+
+from copy import deepcopy
+from dataclasses import fields, is_dataclass
+from itertools import product
+from numbers import Integral, Real
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from partomatic.batch import BatchResult, partomate_batch
+from partomatic.partomatic_config import (
+    ConstraintViolationError,
+    InfeasibleConfigError,
+)
+from partomatic.worker_pool import shared_worker_pool
+
+
+def _python_value(value):
+    """Convert NumPy scalars to plain Python values for configs and YAML."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def grid_points(axes: Mapping[str, Iterable]) -> list[dict[str, Any]]:
+    """Return the cartesian product of per-field values.
+
+    Args:
+        axes: Dotted field path (e.g. `"bearing.radius"`) to the values it
+            takes, such as a list or `numpy.linspace(...)`.
+
+    Returns:
+        One `{field_path: value}` point per combination, with the last axis
+        varying fastest.
+    """
+    paths = list(axes)
+    value_lists = [[_python_value(value) for value in axes[path]] for path in paths]
+    return [dict(zip(paths, combination)) for combination in product(*value_lists)]
+
+
+def _is_numeric_range(axis) -> bool:
+    """Whether an axis is a continuous `(low, high)` range rather than levels."""
+    return (
+        isinstance(axis, tuple)
+        and len(axis) == 2
+        and all(
+            isinstance(bound, Real) and not isinstance(bound, bool) for bound in axis
+        )
+    )
+
+
+def latin_hypercube_points(
+    axes: Mapping[str, Any],
+    samples: int,
+    seed: int | None = None,
+) -> list[dict[str, Any]]:
+    """Return a Latin-hypercube sample over per-field ranges.
+
+    Each axis is split into `samples` equal strata and every stratum is used
+    exactly once, so a few dozen points cover a large space evenly.
+
+    Args:
+        axes: Dotted field path to either a `(low, high)` tuple, sampled
+            uniformly (as integers when both bounds are integers), or a list
+            of discrete levels.
+        samples: Number of points to generate.
+        seed: Optional seed for reproducible samples.
+
+    Returns:
+        `samples` points of the form `{field_path: value}`.
+
+    Raises:
+        ValueError: If `samples` is not positive or an axis is empty.
+    """
+    if samples < 1:
+        raise ValueError("A Latin-hypercube sweep needs at least one sample")
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for path, axis in axes.items():
+        strata = (rng.permutation(samples) + rng.random(samples)) / samples
+        if _is_numeric_range(axis):
+            low, high = axis
+            if isinstance(low, Integral) and isinstance(high, Integral):
+                column = low + np.floor(strata * (high - low + 1)).astype(int)
+            else:
+                column = low + strata * (high - low)
+        else:
+            levels = list(axis)
+            if not levels:
+                raise ValueError(f"Sweep axis {path} has no values")
+            column = [levels[index] for index in (strata * len(levels)).astype(int)]
+        columns[path] = [_python_value(value) for value in column]
+    return [
+        {path: columns[path][index] for path in columns} for index in range(samples)
+    ]
+
+
+def _nested_mapping(config, point: Mapping[str, Any]) -> dict:
+    """Turn `{"a.b": value}` into `{"a": {"b": value}}`, checking each path.
+
+    Raises:
+        ValueError: If a path does not name a field of `config`.
+    """
+    nested = {}
+    for path, value in point.items():
+        names = path.split(".")
+        target = nested
+        config_class = type(config)
+        for depth, name in enumerate(names):
+            field_types = {
+                classfield.name: classfield.type for classfield in fields(config_class)
+            }
+            if name not in field_types:
+                raise ValueError(
+                    f"Unknown config field {path} for {type(config).__name__}"
+                )
+            if depth == len(names) - 1:
+                target[name] = value
+            else:
+                config_class = field_types[name]
+                if not is_dataclass(config_class):
+                    raise ValueError(f"Config field {name} in {path} is not nested")
+                target = target.setdefault(name, {})
+    return nested
+
+
+def sweep_configurations(
+    partomatic, points: Iterable[Mapping[str, Any]]
+) -> list[tuple[dict, Any]]:
+    """Apply each point to a copy of `partomatic`'s config.
+
+    Returns:
+        `(point, config)` pairs in input order. `config` is a
+        `ConstraintViolationError` instead when the point breaks a field's
+        `ge`/`gt`/`le`/`lt` or length constraints, or an
+        `InfeasibleConfigError` when it fails a feasibility predicate.
+
+    Raises:
+        ValueError: If a point names a field that does not exist.
+    """
+    configurations = []
+    for point in points:
+        point = dict(point)
+        config = deepcopy(partomatic._config)
+        config.update_from_mapping(_nested_mapping(config, point))
+        violations = config.constraint_violations()
+        if violations:
+            configurations.append((point, ConstraintViolationError(violations)))
+            continue
+        violations = config.feasibility_violations()
+        if violations:
+            configurations.append((point, InfeasibleConfigError(violations)))
+        else:
+            configurations.append((point, config))
+    return configurations
+
+
+def partomate_sweep(
+    partomatic,
+    points: Iterable[Mapping[str, Any]],
+    export_steps: bool = False,
+    formats: Sequence[str] = (),
+    pool=None,
+    parallel: bool = True,
+    release_geometry: bool = True,
+    stop_on_error: bool = False,
+) -> list[BatchResult]:
+    """Build and export every point of a parameter sweep.
+
+    Points are validated against field constraints and feasibility
+    predicates before anything is compiled; points that fail either are
+    reported without spending time in OCC. The remaining points are built
+    with `partomate_batch`, in parallel on a worker pool by default.
+
+    Args:
+        partomatic: Instance whose config is the base for every point.
+        points: `{field_path: value}` mappings, e.g. from `grid_points` or
+            `latin_hypercube_points`.
+        export_steps: When True, also export STEP files.
+        formats: Additional registered export format names to write.
+        pool: `PartomaticWorkerPool` to build on; defaults to
+            `shared_worker_pool()` when `parallel` is True.
+        parallel: When False, build every point in this process.
+        release_geometry: Drop each part's geometry after export.
+        stop_on_error: Re-raise the first build error instead of recording it.
+
+    Returns:
+        One `BatchResult` per point, in input order, whose `configuration`
+        is the point mapping.
+
+    Raises:
+        ValueError: If a point names a field that does not exist.
+    """
+    configurations = sweep_configurations(partomatic, points)
+    feasible = [
+        (point, config)
+        for point, config in configurations
+        if not isinstance(config, ConstraintViolationError)
+    ]
+    if stop_on_error and len(feasible) < len(configurations):
+        raise next(
+            config
+            for _, config in configurations
+            if isinstance(config, ConstraintViolationError)
+        )
+    if not parallel:
+        pool = None
+    elif pool is None:
+        pool = shared_worker_pool(preload_modules=[type(partomatic)])
+
+    built = partomate_batch(
+        partomatic,
+        [config for _, config in feasible],
+        export_steps=export_steps,
+        formats=formats,
+        release_geometry=release_geometry,
+        stop_on_error=stop_on_error,
+        pool=pool,
+    )
+    built_by_point = iter(built)
+    results = []
+    for point, config in configurations:
+        if isinstance(config, ConstraintViolationError):
+            results.append(BatchResult(point, error=config))
+        else:
+            result = next(built_by_point)
+            results.append(BatchResult(point, result.parts, result.error))
+    return results
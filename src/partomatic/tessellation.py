@@ -0,0 +1,269 @@
+"""Triangle-buffer tessellation of build123d shapes for mesh-based exporters."""
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Sequence
+
+import numpy as np
+from build123d import BoundBox, Shape
+from OCP.Bnd import Bnd_Box
+from OCP.BRep import BRep_Builder, BRep_Tool
+from OCP.BRepBndLib import BRepBndLib
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.OSD import OSD_ThreadPool
+from OCP.TopAbs import TopAbs_Orientation
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS_Compound
+
+DEFAULT_LINEAR_TOLERANCE = 1e-3
+DEFAULT_ANGULAR_TOLERANCE = 0.1
+
+
+@dataclass(frozen=True)
+class TriangleMesh:
+    """Indexed triangle mesh stored as NumPy buffers.
+
+    Attributes:
+        vertices: `(n, 3)` float32 array of vertex coordinates.
+        triangles: `(m, 3)` uint32 array of counter-clockwise vertex indices.
+    """
+
+    vertices: np.ndarray
+    triangles: np.ndarray
+
+    @property
+    def triangle_count(self) -> int:
+        """Return the number of triangles in the mesh."""
+        return int(self.triangles.shape[0])
+
+    @property
+    def triangle_vertices(self) -> np.ndarray:
+        """Return a `(m, 3, 3)` array with the corner coordinates of each triangle."""
+        return self.vertices[self.triangles]
+
+    def facet_normals(self) -> np.ndarray:
+        """Return unit normals for every triangle as a `(m, 3)` float32 array."""
+        corners = self.triangle_vertices.astype(np.float64)
+        normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        np.divide(normals, lengths, out=normals, where=lengths > 0)
+        return normals.astype(np.float32)
+
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return per-axis minimum and maximum vertex coordinates."""
+        if self.vertices.shape[0] == 0:
+            zeros = np.zeros(3, dtype=np.float32)
+            return zeros, zeros
+        return self.vertices.min(axis=0), self.vertices.max(axis=0)
+
+
+def _face_buffers(face, offset: int) -> tuple[np.ndarray, np.ndarray] | None:
+    """Extract transformed vertices and oriented triangles for one meshed face."""
+    location = TopLoc_Location()
+    poly = BRep_Tool.Triangulation_s(face.wrapped, location)
+    if poly is None:
+        return None
+
+    node_count = poly.NbNodes()
+    node = poly.Node
+    nodes = np.fromiter(
+        chain.from_iterable(node(index).Coord() for index in range(1, node_count + 1)),
+        dtype=np.float64,
+        count=3 * node_count,
+    ).reshape(node_count, 3)
+    if not location.IsIdentity():
+        trsf = location.Transformation()
+        matrix = np.array(
+            [[trsf.Value(row, col) for col in range(1, 5)] for row in range(1, 4)]
+        )
+        nodes = nodes @ matrix[:, :3].T + matrix[:, 3]
+
+    triangle_count = poly.NbTriangles()
+    triangles = np.fromiter(
+        chain.from_iterable(triangle.Get() for triangle in poly.InternalTriangles()),
+        dtype=np.int64,
+        count=3 * triangle_count,
+    ).reshape(triangle_count, 3)
+    triangles += offset - 1
+    if face.wrapped.Orientation() == TopAbs_Orientation.TopAbs_REVERSED:
+        triangles = triangles[:, [0, 2, 1]]
+    return nodes, triangles
+
+
+def _weld(vertices: np.ndarray, triangles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Merge coincident vertices so faces share their edge nodes.
+
+    OCC triangulates each face on its own, so nodes on a shared edge are
+    duplicated. Welding them makes a closed solid a closed mesh; triangles
+    that collapse to a line, such as those at a sphere's poles, are dropped.
+    """
+    vertices, inverse = np.unique(vertices, axis=0, return_inverse=True)
+    triangles = inverse.reshape(-1)[triangles]
+    keep = (
+        (triangles[:, 0] != triangles[:, 1])
+        & (triangles[:, 1] != triangles[:, 2])
+        & (triangles[:, 2] != triangles[:, 0])
+    )
+    return vertices, triangles[keep]
+
+
+def exact_bounding_box(shape: Shape) -> BoundBox:
+    """Return a shape's precise bounding box without touching its mesh.
+
+    build123d's `Shape.bounding_box()` cleans the triangulation off the
+    shape first, which would throw away a mesh `mesh_shapes` just built.
+    """
+    box = Bnd_Box()
+    BRepBndLib.AddOptimal_s(shape.wrapped, box, False)
+    return BoundBox(box)
+
+
+def scaled_tolerance(shape: Shape, fraction: float) -> float:
+    """Return a linear tolerance proportional to a shape's size.
+
+    Args:
+        shape: build123d shape whose bounding box sets the scale.
+        fraction: Tolerance as a fraction of the bounding-box diagonal.
+
+    Returns:
+        `fraction` times the diagonal, or `fraction` itself for an empty or
+        zero-size shape.
+    """
+    if shape.is_null:
+        return fraction
+    diagonal = exact_bounding_box(shape).diagonal
+    return fraction * diagonal if diagonal > 0 else fraction
+
+
+def set_mesh_threads(threads: int | None = None) -> int:
+    """Size the OCC thread pool used by parallel meshing.
+
+    OCC sizes the pool to every logical processor by default. Lower it when
+    several processes mesh at once, such as worker pool jobs, so they do not
+    oversubscribe the machine. Call this while no meshing is running.
+
+    Args:
+        threads: Number of meshing threads; None uses every logical processor.
+
+    Returns:
+        The number of threads the pool now has.
+    """
+    pool = OSD_ThreadPool.DefaultPool_s()
+    pool.Init(threads if threads else -1)
+    return pool.NbThreads()
+
+
+def mesh_shapes(
+    shapes: Sequence[Shape],
+    tolerance: float = DEFAULT_LINEAR_TOLERANCE,
+    angular_tolerance: float = DEFAULT_ANGULAR_TOLERANCE,
+    relative: bool = True,
+    parallel: bool = True,
+):
+    """Triangulate several shapes in place with one OCC mesher run.
+
+    The shapes are gathered in a compound that shares their geometry, so
+    with `parallel` OCC meshes the faces of every shape concurrently on its
+    thread pool instead of one shape after another. Each shape keeps its
+    triangulation afterwards, as if meshed on its own.
+
+    Args:
+        shapes: Non-empty build123d shapes to mesh.
+        tolerance: Linear deflection used by the OCC mesher.
+        angular_tolerance: Angular deflection in radians used by the OCC mesher.
+        relative: Scale `tolerance` by each edge's size, as build123d does.
+        parallel: Mesh faces on OCC's thread pool (see `set_mesh_threads`).
+    """
+    if not shapes:
+        return
+    if len(shapes) == 1:
+        target = shapes[0].wrapped
+    else:
+        target = TopoDS_Compound()
+        builder = BRep_Builder()
+        builder.MakeCompound(target)
+        for shape in shapes:
+            builder.Add(target, shape.wrapped)
+    BRepMesh_IncrementalMesh(target, tolerance, relative, angular_tolerance, parallel)
+
+
+def triangle_count(
+    shape: Shape,
+    tolerance: float = DEFAULT_LINEAR_TOLERANCE,
+    angular_tolerance: float = DEFAULT_ANGULAR_TOLERANCE,
+) -> int:
+    """Return how many triangles a shape's mesh has at the given tolerances.
+
+    The shape is meshed in place if needed; a shape already meshed for an
+    export at the same tolerances is counted without re-meshing.
+    """
+    shape.mesh(tolerance, angular_tolerance)
+    return triangulation_count(shape)
+
+
+def triangulation_count(shape: Shape) -> int:
+    """Return how many triangles a shape's current triangulation has.
+
+    Unlike `triangle_count` this never meshes, so faces without a
+    triangulation count as zero.
+    """
+    count = 0
+    for face in shape.faces():
+        poly = BRep_Tool.Triangulation_s(face.wrapped, TopLoc_Location())
+        if poly is not None:
+            count += poly.NbTriangles()
+    return count
+
+
+def tessellate(
+    shape: Shape,
+    tolerance: float = DEFAULT_LINEAR_TOLERANCE,
+    angular_tolerance: float = DEFAULT_ANGULAR_TOLERANCE,
+    mesh: bool = True,
+) -> TriangleMesh:
+    """Mesh a shape once and return its triangles as NumPy buffers.
+
+    Vertices shared by neighbouring faces are welded, so the mesh of a
+    closed solid is closed too.
+
+    Args:
+        shape: build123d shape to tessellate.
+        tolerance: Linear deflection used by the OCC mesher.
+        angular_tolerance: Angular deflection in radians used by the OCC mesher.
+        mesh: When False, read the triangulation already on `shape`, e.g.
+            right after `mesh_shapes`, instead of meshing it again.
+
+    Returns:
+        Indexed triangle mesh for every face of `shape`; a shape without
+        faces gives a mesh with no vertices or triangles.
+
+    Raises:
+        ValueError: If `shape` is null, e.g. an empty `Part()`.
+    """
+    if shape.is_null:
+        raise ValueError("Cannot tessellate an empty shape")
+    if mesh:
+        shape.mesh(tolerance, angular_tolerance)
+
+    vertex_blocks = []
+    triangle_blocks = []
+    offset = 0
+    for face in shape.faces():
+        buffers = _face_buffers(face, offset)
+        if buffers is None:
+            continue
+        nodes, triangles = buffers
+        vertex_blocks.append(nodes)
+        triangle_blocks.append(triangles)
+        offset += nodes.shape[0]
+
+    if not vertex_blocks:
+        return TriangleMesh(
+            vertices=np.zeros((0, 3), dtype=np.float32),
+            triangles=np.zeros((0, 3), dtype=np.uint32),
+        )
+    vertices, triangles = _weld(
+        np.concatenate(vertex_blocks).astype(np.float32),
+        np.concatenate(triangle_blocks),
+    )
+    return TriangleMesh(vertices=vertices, triangles=triangles.astype(np.uint32))
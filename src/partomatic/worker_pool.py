@@ -0,0 +1,250 @@
+"""Reusable process pool whose workers import build123d and OCP only once."""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+import gc
+import importlib
+import multiprocessing
+import os
+import threading
+from typing import Iterable, Sequence
+
+from partomatic.automatable_part import AutomatablePart
+from partomatic.tessellation import set_mesh_threads
+
+# imported by every worker before it accepts its first job; importing OCC
+# costs seconds per fresh interpreter, which dominates short compile jobs
+DEFAULT_PRELOAD_MODULES = ("build123d", "OCP", "partomatic")
+
+
+def _module_name(module) -> str:
+    """Return an importable module name for a module name or a class."""
+    if isinstance(module, str):
+        return module
+    return module.__module__
+
+
+def _import_modules(module_names: Sequence[str]):
+    """Import modules in a worker so later jobs find them in `sys.modules`."""
+    for module_name in module_names:
+        importlib.import_module(module_name)
+
+
+def _init_worker(module_names: Sequence[str], mesh_threads: int):
+    """Import preload modules and size OCC's meshing threads in a new worker."""
+    _import_modules(module_names)
+    set_mesh_threads(mesh_threads)
+
+
+def _warm_job() -> bool:
+    """No-op job used to start and warm idle workers."""
+    return True
+
+
+def _compile_job(partomatic, mesh: bool = False) -> list[AutomatablePart]:
+    """Compile a pickled Partomatic instance and return its parts.
+
+    With `mesh`, each part is also triangulated here with its configured
+    mesh settings; the triangulation is pickled with the shape, so the
+    parent does not mesh it again.
+    """
+    partomatic.compile()
+    if mesh:
+        partomatic.mesh_parts()
+    return partomatic.parts
+
+
+def _partomate_job(
+    partomatic,
+    export_steps: bool,
+    formats: Sequence[str],
+    release_geometry: bool,
+    collect_garbage: bool,
+) -> list[AutomatablePart]:
+    """Compile and export a pickled Partomatic instance and return its parts."""
+    try:
+        partomatic.partomate(
+            export_steps=export_steps,
+            formats=formats,
+            release_geometry=release_geometry,
+        )
+        return partomatic.parts
+    finally:
+        if collect_garbage:
+            gc.collect()
+
+
+def _default_start_method() -> str:
+    """Prefer `forkserver`, falling back to `spawn` where it is unavailable."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return "forkserver"
+    return "spawn"
+
+
+def _process_context(start_method: str, preload_modules: Sequence[str]):
+    """Return a multiprocessing context, preloading modules in a fork server."""
+    context = multiprocessing.get_context(start_method)
+    if start_method == "forkserver":
+        context.set_forkserver_preload(
+            [name for name in preload_modules if name != "__main__"]
+        )
+    return context
+
+
+class PartomaticWorkerPool:
+    """Process pool that keeps warm workers for compile and export jobs.
+
+    Workers are started once and import build123d, OCP and any
+    `preload_modules` (typically the module defining your Partomatic
+    subclass) before accepting jobs, so each job only pays for modeling and
+    export. With the `forkserver` start method the imports happen once in the
+    fork server and every worker inherits them.
+
+    Partomatic instances are pickled as a config snapshot, so submitting a
+    job is cheap; the worker compiles and the resulting parts are returned.
+
+    Args:
+        max_workers: Number of worker processes; defaults to the CPU count.
+        preload_modules: Module names, or classes whose modules should be
+            imported in every worker.
+        start_method: Multiprocessing start method; defaults to
+            `forkserver` where available, otherwise `spawn`.
+        mesh_threads: OCC meshing threads per worker; defaults to the CPU
+            count divided between the workers, so parallel meshing in
+            every worker at once does not oversubscribe the machine.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        preload_modules: Iterable = (),
+        start_method: str | None = None,
+        mesh_threads: int | None = None,
+    ):
+        module_names = list(DEFAULT_PRELOAD_MODULES)
+        for module in preload_modules:
+            module_name = _module_name(module)
+            if module_name not in module_names:
+                module_names.append(module_name)
+        self.preload_modules = tuple(module_names)
+        self.start_method = start_method or _default_start_method()
+        context = _process_context(self.start_method, self.preload_modules)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.mesh_threads = mesh_threads or max(
+            1, (os.cpu_count() or 1) // self.max_workers
+        )
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.preload_modules, self.mesh_threads),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def warm(self):
+        """Start every worker now instead of on the first job."""
+        futures = [self._executor.submit(_warm_job) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def submit_compile(self, partomatic, mesh: bool = False) -> Future:
+        """Compile a Partomatic instance in a worker.
+
+        Args:
+            partomatic: Instance whose current config is compiled.
+            mesh: Also triangulate every part in the worker with its mesh
+                settings, so display and mesh exports in this process reuse
+                the triangulation.
+
+        Returns:
+            A future resolving to the compiled `AutomatablePart` list.
+        """
+        return self._executor.submit(_compile_job, partomatic, mesh)
+
+    def submit_partomate(
+        self,
+        partomatic,
+        export_steps: bool = False,
+        formats: Sequence[str] = (),
+        release_geometry: bool = True,
+        collect_garbage: bool = True,
+    ) -> Future:
+        """Compile and export a Partomatic instance in a worker.
+
+        Args:
+            partomatic: Instance whose current config is built.
+            export_steps: When True, also export STEP files.
+            formats: Additional registered export format names to write.
+            release_geometry: Drop geometry in the worker after export, so
+                only export metadata is sent back.
+            collect_garbage: Run `gc.collect()` in the worker after the job.
+
+        Returns:
+            A future resolving to the exported `AutomatablePart` list.
+        """
+        return self._executor.submit(
+            _partomate_job,
+            partomatic,
+            export_steps,
+            tuple(formats),
+            release_geometry,
+            collect_garbage,
+        )
+
+    def compile(self, partomatic, mesh: bool = False) -> list[AutomatablePart]:
+        """Compile in a worker and store the parts on `partomatic`.
+
+        The instance is marked as compiled for the config it had when the job
+        was submitted, exactly as an in-process `compile()` would.
+
+        Args:
+            partomatic: Instance to compile.
+            mesh: Also triangulate every part in the worker.
+
+        Returns:
+            The compiled parts, also assigned to `partomatic.parts`.
+        """
+        snapshot = partomatic._config_snapshot()
+        parts = self.submit_compile(partomatic, mesh=mesh).result()
+        partomatic.parts = parts
+        partomatic._compiled_config_snapshot = snapshot
+        return parts
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+_shared_pool: PartomaticWorkerPool | None = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_worker_pool(
+    max_workers: int | None = None, preload_modules: Iterable = ()
+) -> PartomaticWorkerPool:
+    """Return the process-wide worker pool, creating it on first use.
+
+    The arguments only apply when the pool is created; later calls return
+    the existing pool so sweeps, the batch API and the configurator share
+    the same warm workers.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = PartomaticWorkerPool(
+                max_workers=max_workers, preload_modules=preload_modules
+            )
+        return _shared_pool
+
+
+def shutdown_shared_worker_pool(wait: bool = True):
+    """Stop the process-wide worker pool, if one has been started."""
+    global _shared_pool
+    with _shared_pool_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
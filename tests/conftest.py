@@ -1,6 +1,13 @@
 import pytest
 from tempfile import TemporaryDirectory
 
+from partomatic import forget_displayed_scenes
+
+
+@pytest.fixture(autouse=True)
+def _fresh_viewer_scenes():
+    forget_displayed_scenes()
+
 
 @pytest.fixture
 def wheel_config_yaml():
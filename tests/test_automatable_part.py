@@ -5,7 +5,7 @@ from unittest.mock import patch
 from pathlib import Path
 
 from partomatic import AutomatablePart
-from build123d import BuildPart, Box, Sphere, Align, Mode, Location, Part
+from build123d import BuildPart, Box, Cylinder, Sphere, Align, Mode, Location, Part
 
 
 class TestAutomatablePart:
@@ -24,3 +24,121 @@ class TestAutomatablePart:
         )
         assert wheel_automatable.display_location.position.X == 100
         assert wheel_automatable.stl_folder == "/tmp/test/folder"
+
+    def test_release_geometry_keeps_metadata(self, tmp_path):
+        export_path = tmp_path / "box.stl"
+        export_path.write_bytes(b"solid")
+        automatable = AutomatablePart(Box(2, 4, 6), "box")
+        automatable.record_export("stl", export_path)
+
+        automatable.release_geometry()
+        automatable.release_geometry()
+
+        assert automatable.is_released
+        assert automatable.volume == pytest.approx(48)
+        assert automatable.bounding_box[1] == pytest.approx((1, 2, 3))
+        assert automatable.file_hashes["stl"].startswith("4b3d")
+
+    def test_release_empty_part_skips_measurements(self):
+        automatable = AutomatablePart(Part(), "empty")
+        automatable.release_geometry()
+        assert automatable.part is None
+        assert automatable.volume is None
+
+    def test_pickles_builder_parts(self):
+        import pickle
+
+        with BuildPart() as holebox:
+            Box(10, 10, 10)
+            Sphere(6, mode=Mode.SUBTRACT)
+        automatable = AutomatablePart(holebox.part, "holebox")
+
+        restored = pickle.loads(pickle.dumps(automatable))
+
+        assert restored.part.volume == pytest.approx(holebox.part.volume)
+        assert restored.file_name_base == "holebox"
+        assert holebox.part._history is not None
+
+    def test_triangle_mesh_is_cached_per_tolerance(self):
+        automatable = AutomatablePart(Sphere(5), "ball")
+
+        coarse = automatable.triangle_mesh(0.5, 0.5)
+        mesh = automatable.triangle_mesh()
+
+        assert automatable.triangle_mesh() is mesh
+        assert automatable.triangle_mesh(0.5, 0.5) is coarse
+        assert coarse.triangle_count < mesh.triangle_count
+        automatable.part = Sphere(5)
+        assert automatable.triangle_mesh() is not mesh
+        automatable.release_geometry()
+        with pytest.raises(ValueError, match="released"):
+            automatable.triangle_mesh()
+
+    def test_mesh_tolerances_prefer_part_settings(self):
+        automatable = AutomatablePart(Box(300, 400, 0.1), "plate")
+
+        assert automatable.mesh_tolerances(0.01, 0.2) == (0.01, 0.2, True)
+        tolerance, _, relative = automatable.mesh_tolerances(0.01, adaptive=True)
+        assert tolerance == pytest.approx(5, rel=1e-3)
+        assert relative is False
+
+        automatable.mesh_tolerance = 0.5
+        automatable.mesh_angular_tolerance = 0.3
+        automatable.adaptive_mesh_tolerance = False
+        assert automatable.mesh_tolerances(0.01, 0.2, True) == (0.5, 0.3, True)
+
+    def test_mesh_replaces_finer_triangulation(self):
+        automatable = AutomatablePart(Sphere(5), "ball")
+
+        fine = automatable.triangle_mesh(1e-3, 0.1)
+        coarse = automatable.triangle_mesh(0.5, 0.5, False)
+
+        assert coarse.triangle_count < fine.triangle_count
+        assert automatable.triangle_mesh(1e-3, 0.1) is fine
+
+    def test_triangle_mesh_runs_the_mesher_once(self):
+        from build123d import Shape
+        from partomatic.tessellation import mesh_shapes
+
+        automatable = AutomatablePart(Sphere(5), "ball")
+
+        with (
+            patch(
+                "partomatic.automatable_part.mesh_shapes", wraps=mesh_shapes
+            ) as mesh_mock,
+            patch.object(Shape, "mesh") as build123d_mesh,
+        ):
+            mesh = automatable.triangle_mesh(1e-3, 0.1)
+
+        mesh_mock.assert_called_once()
+        build123d_mesh.assert_not_called()
+        assert mesh.triangle_count > 0
+
+    def test_measure_records_metrics(self, tmp_path):
+        export_path = tmp_path / "box.stl"
+        export_path.write_bytes(b"solid box")
+        automatable = AutomatablePart(Box(2, 4, 6), "box")
+        automatable.record_export("stl", export_path)
+
+        metrics = automatable.measure()
+
+        assert metrics["volume"] == pytest.approx(48)
+        assert metrics["area"] == pytest.approx(88)
+        assert metrics["bbox_max_z"] == pytest.approx(3)
+        assert metrics["center_x"] == pytest.approx(0)
+        assert metrics["triangles"] == 12
+        assert metrics["stl_bytes"] == 9
+        automatable.release_geometry()
+        assert automatable.metrics == metrics
+
+    def test_measure_counts_triangles_at_part_mesh_settings(self):
+        automatable = AutomatablePart(Cylinder(5, 10), "can", mesh_tolerance=0.5)
+        settings = automatable.mesh_tolerances()
+        exported = automatable.triangle_mesh(*settings)
+
+        metrics = automatable.measure()
+
+        assert metrics["triangles"] == exported.triangle_count
+        assert automatable._meshed_at[1] == settings
+        assert automatable.triangle_mesh(*settings) is exported
+        assert automatable.measure()["triangles"] == exported.triangle_count
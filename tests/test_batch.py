@@ -0,0 +1,102 @@
+from concurrent.futures import Future
+from threading import Timer
+from unittest.mock import patch
+
+import pytest
+
+from partomatic import BatchResult, partomate_batch
+from test_partomatic import StreamingWidget, Widget
+
+
+class TestPartomateBatch:
+    def test_batch_releases_geometry_and_keeps_metadata(self, tmp_path):
+        widget = Widget(stl_folder=str(tmp_path))
+
+        with patch("partomatic.batch.gc.collect") as collect:
+            results = partomate_batch(
+                widget,
+                [{"radius": 9}, {"radius": 10, "file_suffix": "-b"}],
+                formats=("3mf",),
+            )
+
+        assert collect.call_count == 2
+        assert [result.ok for result in results] == [True, True]
+        first, second = (result.parts[0] for result in results)
+        assert first.is_released and second.is_released
+        assert first.export_paths["stl"] == tmp_path / "stls" / "test.stl"
+        assert second.export_paths["3mf"] == tmp_path / "stls" / "test-b.3mf"
+        assert len(second.file_hashes["stl"]) == 64
+        assert second.bounding_box == (
+            pytest.approx((-8.5, -8.5, -8.5)),
+            pytest.approx((8.5, 8.5, 8.5)),
+        )
+        assert first.volume > second.volume
+        assert widget.is_dirty is True
+
+    def test_batch_records_errors_and_can_stop(self, tmp_path):
+        widget = Widget(stl_folder=str(tmp_path))
+
+        results = partomate_batch(widget, ["not: [valid"], collect_garbage=False)
+        assert isinstance(results[0], BatchResult)
+        assert results[0].ok is False
+
+        with pytest.raises(Exception):
+            partomate_batch(widget, ["not: [valid"], stop_on_error=True)
+
+    def test_partial_mappings_do_not_carry_over(self, tmp_path):
+        widget = Widget(stl_folder=str(tmp_path), radius=5)
+
+        results = partomate_batch(
+            widget,
+            [{"radius": 7}, {"length": 20}],
+            release_geometry=False,
+            collect_garbage=False,
+        )
+
+        second = results[1].parts[0].part.bounding_box()
+        assert second.max.X == pytest.approx(10)
+        assert second.min.X == pytest.approx(-10)
+        assert results[1].parts[0].part.volume == pytest.approx(
+            Widget(radius=5, length=20).complete_wheel().volume
+        )
+        assert widget._config.radius == 5
+        assert widget._config.length == 17
+        assert widget.parts == []
+
+    def test_streaming_batch_keeps_geometry_when_asked(self, tmp_path, monkeypatch):
+        widget = StreamingWidget(stl_folder=str(tmp_path))
+        # variants are copies, so give every instance a build log
+        monkeypatch.setattr(StreamingWidget, "build_log", [], raising=False)
+
+        results = partomate_batch(widget, [{"file_suffix": ""}], release_geometry=False)
+
+        assert [part.is_released for part in results[0].parts] == [False, False]
+        assert results[0].parts[0].export_paths["stl"] == tmp_path / "first.stl"
+
+    def test_pool_batch_builds_identical_variants_once(self, tmp_path):
+        class SlowPool:
+            def __init__(self):
+                self.jobs = []
+
+            def submit_partomate(self, variant, **_kwargs):
+                future = Future()
+                self.jobs.append(variant)
+                # still running while the batch submits the duplicate
+                Timer(
+                    0.2, future.set_result, [[f"part-{variant._config.radius}"]]
+                ).start()
+                return future
+
+        pool = SlowPool()
+        widget = Widget(stl_folder=str(tmp_path))
+        configurations = [{"radius": 9}, {"radius": 9}, {"radius": 8}]
+
+        results = partomate_batch(widget, configurations, pool=pool)
+
+        assert len(pool.jobs) == 2
+        assert [result.parts for result in results] == [
+            ["part-9"],
+            ["part-9"],
+            ["part-8"],
+        ]
+        assert results[0].parts is not results[1].parts
@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+import pytest
+
+from partomatic.cli import main
+from test_daemon import CUBE_SOURCE
+
+
+@pytest.fixture
+def cube_file(tmp_path):
+    path = tmp_path / "cube.py"
+    path.write_text(CUBE_SOURCE.format(depth=1))
+    return path
+
+
+class TestBuildCommand:
+    def test_builds_in_process_without_daemon(self, cube_file, tmp_path, capsys):
+        config = tmp_path / "small.yaml"
+        config.write_text("cube:\n  size: 3\n")
+
+        status = main(
+            [
+                "build",
+                f"{cube_file}:Cube",
+                "--config",
+                str(config),
+                "--format",
+                "glb",
+                "--socket",
+                str(tmp_path / "missing.sock"),
+            ]
+        )
+
+        assert status == 0
+        printed = capsys.readouterr().out.split()
+        assert printed == [
+            str(tmp_path / "out" / "cube.stl"),
+            str(tmp_path / "out" / "cube.glb"),
+        ]
+
+    def test_builds_in_process_when_socket_is_not_a_daemon(
+        self, cube_file, tmp_path, capsys
+    ):
+        impostor = tmp_path / "daemon.sock"
+        impostor.write_text("not a socket")
+
+        status = main(["build", f"{cube_file}:Cube", "--socket", str(impostor)])
+
+        assert status == 0
+        assert capsys.readouterr().out.split() == [str(tmp_path / "out" / "cube.stl")]
+
+    def test_forwards_to_running_daemon(self, cube_file, tmp_path, capsys):
+        response = {"ok": True, "exports": {"stl": ["/tmp/cube.stl"]}}
+        with patch(
+            "partomatic.cli.send_daemon_request", return_value=response
+        ) as send, patch("partomatic.cli.BuildService") as service:
+            status = main(["build", f"{cube_file}:Cube", "--step"])
+
+        assert status == 0
+        request = send.call_args.args[0]
+        assert request["target"] == f"{cube_file}:Cube"
+        assert request["export_steps"] is True
+        service.assert_not_called()
+        assert capsys.readouterr().out == "/tmp/cube.stl\n"
+
+    def test_no_daemon_flag_skips_the_socket(self, cube_file, capsys):
+        with patch("partomatic.cli.send_daemon_request") as send:
+            status = main(["build", f"{cube_file}:Missing", "--no-daemon"])
+
+        assert status == 1
+        send.assert_not_called()
+        assert "no class named Missing" in capsys.readouterr().err
+
+
+class TestDaemonCommand:
+    def test_stop_without_daemon_fails(self, tmp_path, capsys):
+        status = main(["daemon", "--stop", "--socket", str(tmp_path / "none.sock")])
+        assert status == 1
+        assert "No partomatic daemon" in capsys.readouterr().err
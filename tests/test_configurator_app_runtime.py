@@ -6,7 +6,12 @@ from types import SimpleNamespace
 import pytest
 
 import partomatic.configurator_app as configurator_app
-from partomatic import PreviewState
+from partomatic import EXPORT_CACHE_ENVIRONMENT_VARIABLE, PreviewState
+
+
+@pytest.fixture(autouse=True)
+def _isolated_export_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv(EXPORT_CACHE_ENVIRONMENT_VARIABLE, str(tmp_path / "cache"))
 
 
 class _FakeElement:
@@ -53,16 +58,28 @@ class _FakeElement:
         return None
 
 
+class _FakeClient:
+    def __init__(self, client_id):
+        self.id = client_id
+        self.delete_handlers = []
+
+    def on_delete(self, handler):
+        self.delete_handlers.append(handler)
+
+
 class _FakeUI:
     def __init__(self):
         self.buttons = []
         self.badges = []
+        self.labels = []
         self.uploads = []
         self.menu_items = []
         self.downloads = []
+        self.notifications = []
         self.last_notify = None
         self.last_run = None
         self.last_title = None
+        self.context = SimpleNamespace(client=_FakeClient("client-1"))
 
     def page_title(self, value):
         self.last_title = value
@@ -77,7 +94,9 @@ class _FakeUI:
         return _FakeElement()
 
     def label(self, *_args, **_kwargs):
-        return _FakeElement()
+        element = _FakeElement()
+        self.labels.append(element)
+        return element
 
     def badge(self, *_args, **_kwargs):
         element = _FakeElement()
@@ -122,11 +141,24 @@ class _FakeUI:
 
     def timer(self, _interval, callback, once=False):
         if once:
-            callback()
+            _invoke_maybe_async(callback)
 
     def notify(self, message, type=None):
         self.last_notify = (message, type)
 
+    def notification(self, message="", **kwargs):
+        element = _FakeElement()
+        element.message = message
+        element.kwargs = kwargs
+        element.dismissed = False
+
+        def dismiss():
+            element.dismissed = True
+
+        element.dismiss = dismiss
+        self.notifications.append(element)
+        return element
+
     def download(self, src, filename=None, media_type=""):
         self.downloads.append((src, filename, media_type))
 
@@ -179,18 +211,37 @@ class _Config:
         for key, item in value.items():
             setattr(self, key, item)
 
+    def feasibility_violations(self):
+        return ["size must exceed value"] if self.size <= self.value else []
+
     def as_dict(self):
         return {
             key: value for key, value in self.__dict__.items() if key != "updated_with"
         }
 
 
+def _take_streamed_download(url):
+    entry = configurator_app._streamed_downloads.pop(url.rsplit("/", 1)[-1])
+    return b"".join(entry.chunks)
+
+
+async def _fetch_streamed_download(url):
+    response = configurator_app._streamed_download(url.rsplit("/", 1)[-1])
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    # let callbacks posted from the response's worker thread run
+    await asyncio.sleep(0)
+    return body
+
+
 class _Partomatic:
     def __init__(self, fail_display=False):
         self._config = _Config()
+        self.parts = ["part-a", "part-b"]
         self.fail_display = fail_display
         self.invalidate_called = 0
         self.compile_called = 0
+        self.compile_limits = []
+        self.compile_pools = []
         self.display_calls = []
         self._compiled_config_snapshot = None
         self._preview_state = PreviewState.DIRTY
@@ -218,7 +269,9 @@ class _Partomatic:
             self._preview_state = PreviewState.DIRTY
         self._preview_error = None
 
-    def compile_for_preview(self):
+    def compile_for_preview(self, timeout=None, memory_limit=None, pool=None):
+        self.compile_limits.append((timeout, memory_limit))
+        self.compile_pools.append(pool)
         if not self.is_dirty:
             self._preview_state = PreviewState.CLEAN
             self._preview_error = None
@@ -228,28 +281,32 @@ class _Partomatic:
         self.compile()
         self._preview_state = PreviewState.CLEAN
 
+    def __deepcopy__(self, _memo):
+        # every session shares this stub so tests can inspect it directly
+        return self
+
     def compile(self):
         self.compile_called += 1
+        self._mark_compiled()
+
+    def _mark_compiled(self):
         self._compiled_config_snapshot = dict(self._config.as_dict())
 
+    def _config_snapshot(self):
+        return dict(self._config.as_dict())
+
     def display(self, **kwargs):
         if self.fail_display:
             raise RuntimeError("display failed")
         self.display_calls.append(kwargs)
 
-    def export_stls_to_directory(self, output_dir):
-        output_path = Path(output_dir)
-        first = output_path / "part-a.stl"
-        second = output_path / "part-b.stl"
-        first.write_bytes(b"stl-a")
-        second.write_bytes(b"stl-b")
-        return [first, second]
+    def export_to_stream(self, format_name, part, stream):
+        stream.write(format_name.encode("utf-8"))
+        return f"{part}.{format_name}"
 
-    def export_steps_to_directory(self, output_dir):
-        output_path = Path(output_dir)
-        step_path = output_path / "part.step"
-        step_path.write_bytes(b"step")
-        return [step_path]
+    def iter_export_zip(self, format_name):
+        for part in self.parts:
+            yield f"{part}.{format_name}".encode("utf-8")
 
 
 class _Component:
@@ -385,9 +442,160 @@ def test_yaml_to_config_data_error_branches_and_apply_values_skip_unknown():
     assert tree["nested"]["x"].value == 11
 
 
-def test_download_payload_from_paths_raises_when_empty():
+def test_download_for_export_raises_when_empty():
+    part = _Partomatic()
+    part.parts = []
     with pytest.raises(ValueError, match="No files"):
-        configurator_app._download_payload_from_paths([], "files.zip", "model/stl")
+        asyncio.run(configurator_app._download_for_export(part, "stl", "files.zip"))
+
+
+def test_download_for_export_streams_zip_and_reports_progress_per_part():
+    part = _Partomatic()
+    progress, finished = [], []
+
+    async def download():
+        url, filename, media_type = await configurator_app._download_for_export(
+            part,
+            "stl",
+            "files.zip",
+            on_progress=lambda done, total: progress.append((done, total)),
+            on_finished=finished.append,
+        )
+        # the URL is handed out before any part is exported
+        assert (progress, finished) == ([], [])
+        assert (filename, media_type) == ("files.zip", "application/zip")
+        return await _fetch_streamed_download(url)
+
+    assert asyncio.run(download()) == b"part-a.stlpart-b.stl"
+    assert progress == [(1, 2), (2, 2)]
+    assert finished == [None]
+
+
+def test_streamed_zip_reports_an_export_error():
+    class _FailingPartomatic(_Partomatic):
+        def iter_export_zip(self, format_name):
+            yield b"part-a"
+            raise RuntimeError("export failed")
+
+    finished = []
+
+    async def download():
+        url, _, _ = await configurator_app._download_for_export(
+            _FailingPartomatic(), "stl", "files.zip", on_finished=finished.append
+        )
+        with pytest.raises(RuntimeError, match="export failed"):
+            await _fetch_streamed_download(url)
+        await asyncio.sleep(0)
+
+    asyncio.run(download())
+    (error,) = finished
+    assert str(error) == "export failed"
+
+
+def test_single_part_download_drops_prefix_folder():
+    part = _Partomatic()
+    part.parts = ["sub/part-a"]
+
+    payload, filename, _ = asyncio.run(
+        configurator_app._download_for_export(part, "stl", "files.zip")
+    )
+
+    assert (payload, filename) == (b"stl", "part-a.stl")
+
+
+def test_dropped_zip_download_finishes_without_exporting():
+    exported, finished = [], []
+
+    class _TrackingPartomatic(_Partomatic):
+        def iter_export_zip(self, format_name):
+            for chunk in super().iter_export_zip(format_name):
+                exported.append(chunk)
+                yield chunk
+
+    async def download_and_drop():
+        await configurator_app._download_for_export(
+            _TrackingPartomatic(),
+            "stl",
+            "files.zip",
+            owner="client-9",
+            on_finished=finished.append,
+        )
+        configurator_app._drop_streamed_downloads("client-9")
+        await asyncio.sleep(0)
+
+    asyncio.run(download_and_drop())
+
+    assert exported == []
+    assert finished == [None]
+    assert not configurator_app._streamed_downloads
+
+
+def test_streamed_download_serves_registered_chunks_once():
+    url = configurator_app._register_streamed_download(
+        iter([b"PK", b"data"]), "kit.zip", "application/zip"
+    )
+    token = url.rsplit("/", 1)[-1]
+
+    response = configurator_app._streamed_download(token)
+
+    assert url.startswith(configurator_app.STREAMED_DOWNLOAD_PATH)
+    assert response.media_type == "application/zip"
+    assert response.headers["content-disposition"] == 'attachment; filename="kit.zip"'
+    with pytest.raises(configurator_app.HTTPException):
+        configurator_app._streamed_download(token)
+
+
+def test_unfetched_streamed_downloads_expire_and_close(monkeypatch):
+    monkeypatch.setattr(configurator_app, "STREAMED_DOWNLOAD_TTL", 0.0)
+    stream = io.BytesIO(b"zip")
+    url = configurator_app._register_streamed_download(
+        configurator_app.iter_file_chunks(stream), "kit.zip", "application/zip"
+    )
+
+    with pytest.raises(configurator_app.HTTPException):
+        configurator_app._streamed_download(url.rsplit("/", 1)[-1])
+    assert stream.closed
+
+
+def test_streamed_downloads_drop_the_oldest_when_full(monkeypatch):
+    monkeypatch.setattr(configurator_app, "MAX_STREAMED_DOWNLOADS", 1)
+    oldest = io.BytesIO(b"a")
+    configurator_app._register_streamed_download(
+        configurator_app.iter_file_chunks(oldest), "a.zip", "application/zip"
+    )
+    url = configurator_app._register_streamed_download(
+        iter([b"b"]), "b.zip", "application/zip"
+    )
+
+    assert oldest.closed
+    assert _take_streamed_download(url) == b"b"
+    assert not configurator_app._streamed_downloads
+
+
+def test_session_downloads_are_dropped_when_its_client_goes(monkeypatch):
+    fake_ui = _FakeUI()
+    monkeypatch.setattr(configurator_app, "ui", fake_ui)
+    monkeypatch.setattr(
+        configurator_app, "_ensure_viewer_running", lambda *_a, **_k: None
+    )
+    monkeypatch.setattr(configurator_app, "find_available_port", lambda **_k: 8623)
+    monkeypatch.setattr(configurator_app, "_build_model", lambda *_a, **_k: _Model())
+    spec = {"config_spec": {"root_node": "cfg", "fields": {}}}
+    configurator_app.run_configurator(_Partomatic(), spec)
+    mine, other = io.BytesIO(b"a"), io.BytesIO(b"b")
+    configurator_app._register_streamed_download(
+        configurator_app.iter_file_chunks(mine), "a.zip", "application/zip", "client-1"
+    )
+    url = configurator_app._register_streamed_download(
+        configurator_app.iter_file_chunks(other), "b.zip", "application/zip", "client-2"
+    )
+
+    for handler in fake_ui.context.client.delete_handlers:
+        handler()
+
+    assert mine.closed and not other.closed
+    assert _take_streamed_download(url) == b"b"
+    assert not configurator_app._streamed_downloads
 
 
 def test_run_configurator_early_returns_when_invalid(monkeypatch):
@@ -451,7 +659,7 @@ def test_run_configurator_early_returns_when_invalid(monkeypatch):
 
     for button in fake_ui.buttons:
         if button._on_click:
-            button._on_click()
+            _invoke_maybe_async(button._on_click)
 
     assert part._config.updated_with is None
 
@@ -553,7 +761,7 @@ def test_run_configurator_enter_key_triggers_rerender(monkeypatch):
     configurator_app.run_configurator(part, spec)
 
     component.value = 31
-    component.events["keydown.enter"](None)
+    _invoke_maybe_async(component.events["keydown.enter"], None)
 
     assert part._config.updated_with == {"size": 31}
     assert part.compile_called >= 2
@@ -617,11 +825,22 @@ def test_run_configurator_export_menu_downloads_yaml_and_zipped_stls(monkeypatch
     yaml_item._on_click()
     assert fake_ui.downloads[-1][1] == "cfg.yaml"
 
-    stl_item._on_click()
+    async def click_and_fetch():
+        await stl_item._on_click()
+        url, filename, media_type = fake_ui.downloads[-1]
+        assert filename == "cfg-stls.zip"
+        assert media_type == "application/zip"
+        # the zip is still to be streamed, so the notification stays up
+        assert not fake_ui.notifications[-1].dismissed
+        return await _fetch_streamed_download(url)
+
+    assert _invoke_maybe_async(click_and_fetch) == b"part-a.stlpart-b.stl"
     assert part._config.updated_with == {"size": 20, "enable_step_exports": False}
-    assert fake_ui.downloads[-1][1] == "cfg-stls.zip"
-    assert fake_ui.downloads[-1][2] == "application/zip"
+    (notification,) = fake_ui.notifications
+    assert notification.message == "Exported 2 of 2 STL parts"
+    assert notification.dismissed
     assert part.display_calls, "display() should be called on download"
+    assert part.display_calls[0]["force"] is True
     assert part.preview_state == PreviewState.CLEAN
 
 
@@ -668,15 +887,110 @@ def test_run_configurator_export_compiles_when_dirty(monkeypatch):
     }
 
     configurator_app.run_configurator(part, spec)
-    part._compiled_config_snapshot = None
+    component.value = 25
     before = part.compile_called
 
     stl_item = next(item for item in fake_ui.menu_items if item.text == "STL Files")
-    stl_item._on_click()
+    _invoke_maybe_async(stl_item._on_click)
 
     assert part.compile_called > before
 
 
+def test_run_configurator_passes_compile_isolation_limits(monkeypatch):
+    fake_ui = _FakeUI()
+    monkeypatch.setattr(configurator_app, "ui", fake_ui)
+    monkeypatch.setattr(
+        configurator_app, "_ensure_viewer_running", lambda *_a, **_k: None
+    )
+    monkeypatch.setattr(configurator_app, "find_available_port", lambda **_k: 8621)
+    monkeypatch.setattr(
+        configurator_app, "_viewer_embed_url", lambda _u: "http://127.0.0.1:3939/viewer"
+    )
+    monkeypatch.setattr(configurator_app, "_build_model", lambda *_a, **_k: _Model())
+
+    component = _Component(20)
+    monkeypatch.setattr(
+        configurator_app,
+        "_collect_components",
+        _collect_with_named_form_state(component, "size"),
+    )
+    monkeypatch.setattr(
+        configurator_app,
+        "_component_value",
+        lambda tree: {"size": tree["size"].value, "enable_step_exports": False},
+    )
+
+    part = _Partomatic(fail_display=False)
+    spec = {
+        "class_name": "Widget",
+        "viewer_url": "http://127.0.0.1:3939",
+        "config_spec": {
+            "root_node": "cfg",
+            "fields": {"size": {"kind": "float", "value": 20}},
+        },
+    }
+
+    configurator_app.run_configurator(
+        part, spec, compile_timeout=5, compile_memory_limit=2**31
+    )
+    stl_item = next(item for item in fake_ui.menu_items if item.text == "STL Files")
+    _invoke_maybe_async(stl_item._on_click)
+
+    assert part.compile_limits == [(5, 2**31), (5, 2**31)]
+    assert part.compile_pools == [None, None]
+
+
+def test_run_configurator_compiles_on_shared_worker_pool(monkeypatch):
+    fake_ui = _FakeUI()
+    monkeypatch.setattr(configurator_app, "ui", fake_ui)
+    monkeypatch.setattr(
+        configurator_app, "_ensure_viewer_running", lambda *_a, **_k: None
+    )
+    monkeypatch.setattr(configurator_app, "find_available_port", lambda **_k: 8624)
+    monkeypatch.setattr(
+        configurator_app, "_viewer_embed_url", lambda _u: "http://127.0.0.1:3939/viewer"
+    )
+    monkeypatch.setattr(configurator_app, "_build_model", lambda *_a, **_k: _Model())
+
+    component = _Component(20)
+    monkeypatch.setattr(
+        configurator_app,
+        "_collect_components",
+        _collect_with_named_form_state(component, "size"),
+    )
+    monkeypatch.setattr(
+        configurator_app,
+        "_component_value",
+        lambda tree: {"size": tree["size"].value, "enable_step_exports": False},
+    )
+
+    pool = object()
+    pool_requests = []
+
+    def _shared_worker_pool(**kwargs):
+        pool_requests.append(kwargs)
+        return pool
+
+    monkeypatch.setattr(configurator_app, "shared_worker_pool", _shared_worker_pool)
+
+    part = _Partomatic(fail_display=False)
+    spec = {
+        "class_name": "Widget",
+        "viewer_url": "http://127.0.0.1:3939",
+        "config_spec": {
+            "root_node": "cfg",
+            "fields": {"size": {"kind": "float", "value": 20}},
+        },
+    }
+
+    configurator_app.run_configurator(part, spec, compile_workers=None)
+    stl_item = next(item for item in fake_ui.menu_items if item.text == "STL Files")
+    _invoke_maybe_async(stl_item._on_click)
+
+    assert pool_requests == [{"max_workers": None, "preload_modules": [_Partomatic]}]
+    assert part.compile_pools == [pool, pool]
+
+
 def test_run_configurator_download_yaml_returns_early_when_invalid(monkeypatch):
     fake_ui = _FakeUI()
     monkeypatch.setattr(configurator_app, "ui", fake_ui)
@@ -772,7 +1086,7 @@ def test_run_configurator_export_error_sets_message_and_notifies(monkeypatch):
 
     configurator_app.run_configurator(part, spec)
     stl_item = next(item for item in fake_ui.menu_items if item.text == "STL Files")
-    stl_item._on_click()
+    _invoke_maybe_async(stl_item._on_click)
 
     assert fake_ui.last_notify is not None
     assert fake_ui.last_notify[1] == "negative"
@@ -867,10 +1181,16 @@ def test_run_configurator_step_download_visibility_and_single_file_download(
     step_item = next(item for item in fake_ui.menu_items if item.text == "STEP Files")
     assert step_item.visible is True
 
-    step_item._on_click()
+    part.parts = ["part"]
+    _invoke_maybe_async(step_item._on_click)
     assert part._config.updated_with == {"size": 20, "enable_step_exports": True}
-    assert fake_ui.downloads[-1][1] == "part.step"
-    assert fake_ui.downloads[-1][2] == "model/step"
+    assert fake_ui.downloads[-1] == (b"step", "part.step", "model/step")
+
+    three_mf_item = next(
+        item for item in fake_ui.menu_items if item.text == "3MF Files"
+    )
+    _invoke_maybe_async(three_mf_item._on_click)
+    assert fake_ui.downloads[-1] == (b"3mf", "part.3mf", "model/3mf")
 
 
 def test_run_configurator_load_yaml_upload_updates_form(monkeypatch):
@@ -926,7 +1246,11 @@ def test_run_configurator_load_yaml_upload_updates_form(monkeypatch):
     assert component.value == 33
     assert part._config.updated_with == {"size": 33}
     assert part.compile_called >= 3
-    assert part.display_calls[-1] == {"viewer_host": "127.0.0.1", "viewer_port": 3939}
+    assert part.display_calls[-1] == {
+        "viewer_host": "127.0.0.1",
+        "viewer_port": 3939,
+        "force": False,
+    }
     assert fake_ui.last_notify == ("Loaded configuration from input.yaml", "positive")
     assert upload.run_method_calls.count("reset") >= 2
 
@@ -979,3 +1303,177 @@ def test_run_configurator_load_yaml_upload_handles_invalid_yaml(monkeypatch):
     assert component.value == 20
     assert fake_ui.last_notify is not None
     assert fake_ui.last_notify[1] == "negative"
+
+
+def test_run_configurator_reports_infeasible_config_without_compiling(monkeypatch):
+    fake_ui = _FakeUI()
+    monkeypatch.setattr(configurator_app, "ui", fake_ui)
+    monkeypatch.setattr(
+        configurator_app, "_ensure_viewer_running", lambda *_a, **_k: None
+    )
+    monkeypatch.setattr(configurator_app, "find_available_port", lambda **_k: 8621)
+    monkeypatch.setattr(
+        configurator_app, "_viewer_embed_url", lambda _u: "http://127.0.0.1:3939/viewer"
+    )
+    monkeypatch.setattr(configurator_app, "_build_model", lambda *_a, **_k: _Model())
+
+    component = _Component(3)
+    monkeypatch.setattr(
+        configurator_app,
+        "_collect_components",
+        _collect_with_named_form_state(component, "size"),
+    )
+    monkeypatch.setattr(
+        configurator_app,
+        "_component_value",
+        lambda tree: {"size": tree["size"].value, "enable_step_exports": False},
+    )
+
+    part = _Partomatic(fail_display=False)
+    spec = {
+        "class_name": "Widget",
+        "viewer_url": "http://127.0.0.1:3939",
+        "config_spec": {
+            "root_node": "cfg",
+            "fields": {"size": {"kind": "float", "value": 3}},
+        },
+    }
+
+    configurator_app.run_configurator(part, spec)
+
+    assert part.compile_called == 0
+    assert any(label.text == "size must exceed value" for label in fake_ui.labels)
+    assert part.preview_state == PreviewState.DIRTY
+
+
+def test_run_configurator_reuses_cached_downloads(monkeypatch):
+    fake_ui = _FakeUI()
+    monkeypatch.setattr(configurator_app, "ui", fake_ui)
+    monkeypatch.setattr(
+        configurator_app, "_ensure_viewer_running", lambda *_a, **_k: None
+    )
+    monkeypatch.setattr(configurator_app, "find_available_port", lambda **_k: 8622)
+    monkeypatch.setattr(
+        configurator_app, "_viewer_embed_url", lambda _u: "http://127.0.0.1:3939/viewer"
+    )
+    monkeypatch.setattr(configurator_app, "_build_model", lambda *_a, **_k: _Model())
+
+    component = _Component(20)
+    monkeypatch.setattr(
+        configurator_app,
+        "_collect_components",
+        _collect_with_named_form_state(component, "size"),
+    )
+    monkeypatch.setattr(
+        configurator_app,
+        "_component_value",
+        lambda tree: {"size": tree["size"].value, "enable_step_exports": False},
+    )
+
+    part = _Partomatic(fail_display=False)
+    spec = {
+        "class_name": "Widget",
+        "viewer_url": "http://127.0.0.1:3939",
+        "config_spec": {
+            "root_node": "cfg",
+            "fields": {"size": {"kind": "float", "value": 20}},
+        },
+    }
+
+    configurator_app.run_configurator(part, spec)
+    stl_item = next(item for item in fake_ui.menu_items if item.text == "STL Files")
+    compiles_before_download = len(part.compile_limits)
+
+    _invoke_maybe_async(stl_item._on_click)
+    first = _take_streamed_download(fake_ui.downloads[-1][0])
+    _invoke_maybe_async(stl_item._on_click)
+    second = _take_streamed_download(fake_ui.downloads[-1][0])
+
+    assert first == second == b"part-a.stlpart-b.stl"
+    assert fake_ui.downloads[-1][1:] == ("cfg-stls.zip", "application/zip")
+    assert len(part.compile_limits) == compiles_before_download + 1
+
+    component.value = 30
+    _invoke_maybe_async(stl_item._on_click)
+    assert len(part.compile_limits) == compiles_before_download + 2
+
+
+def test_run_configurator_gives_each_session_its_own_instance(monkeypatch):
+    fake_ui = _FakeUI()
+    monkeypatch.setattr(configurator_app, "ui", fake_ui)
+    monkeypatch.setattr(
+        configurator_app, "_ensure_viewer_running", lambda *_a, **_k: None
+    )
+    monkeypatch.setattr(configurator_app, "find_available_port", lambda **_k: 8623)
+    monkeypatch.setattr(
+        configurator_app, "_viewer_embed_url", lambda _u: "http://127.0.0.1:3939/viewer"
+    )
+    monkeypatch.setattr(configurator_app, "_build_model", lambda *_a, **_k: _Model())
+
+    component = _Component(20)
+    monkeypatch.setattr(
+        configurator_app,
+        "_collect_components",
+        _collect_with_named_form_state(component, "size"),
+    )
+    monkeypatch.setattr(
+        configurator_app,
+        "_component_value",
+        lambda tree: {"size": tree["size"].value, "enable_step_exports": False},
+    )
+
+    sessions = []
+
+    class _SessionTemplate(_Partomatic):
+        def __deepcopy__(self, _memo):
+            session = _Partomatic(fail_display=False)
+            sessions.append(session)
+            return session
+
+    template = _SessionTemplate(fail_display=False)
+    spec = {
+        "class_name": "Widget",
+        "viewer_url": "http://127.0.0.1:3939",
+        "config_spec": {
+            "root_node": "cfg",
+            "fields": {"size": {"kind": "float", "value": 20}},
+        },
+    }
+
+    configurator_app.run_configurator(template, spec)
+    fake_ui.context = SimpleNamespace(client=_FakeClient("client-2"))
+    fake_ui.last_run["root"]()
+
+    first, second = sessions
+    assert (
+        first._config.updated_with
+        == second._config.updated_with
+        == {
+            "size": 20,
+            "enable_step_exports": False,
+        }
+    )
+    assert template._config.updated_with is None
+    # the second session adopts the geometry compiled for the first
+    assert (first.compile_called, second.compile_called) == (1, 0)
+    assert second.preview_state == PreviewState.CLEAN
+
+    component.value = 30
+    second_stl_item = [item for item in fake_ui.menu_items if item.text == "STL Files"][
+        -1
+    ]
+    _invoke_maybe_async(second_stl_item._on_click)
+
+    assert second._config.size == 30
+    assert first._config.size == 20
+    # each session renders into its own viewer
+    assert first.display_calls[0]["viewer_port"] == 3939
+    assert {call["viewer_port"] for call in second.display_calls} == {3940}
+    assert second.display_calls[0]["force"] is True
+
+    for handler in fake_ui.context.client.delete_handlers:
+        handler()
+    fake_ui.context = SimpleNamespace(client=_FakeClient("client-3"))
+    fake_ui.last_run["root"]()
+    # the closed session's viewer is reused
+    assert sessions[2].display_calls[0]["viewer_port"] == 3940
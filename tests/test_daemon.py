@@ -0,0 +1,198 @@
+import os
+import socket
+import stat
+import sys
+import threading
+import time
+
+import pytest
+
+from partomatic import (
+    BuildService,
+    DaemonUnavailableError,
+    send_daemon_request,
+    serve_daemon,
+)
+
+CUBE_SOURCE = """
+from build123d import Box
+from partomatic import AutomatablePart, Partomatic, PartomaticConfig
+
+BUILDS = []
+
+
+class CubeConfig(PartomaticConfig):
+    stl_folder: str = "out"
+    size: float = 10
+
+
+class Cube(Partomatic):
+    _config: CubeConfig = CubeConfig()
+
+    def compile(self):
+        BUILDS.append(self._config.size)
+        self.parts.clear()
+        self.parts.append(
+            AutomatablePart(
+                Box(self._config.size, {depth}, 1),
+                "cube",
+                stl_folder=self._config.stl_folder,
+            )
+        )
+"""
+
+
+@pytest.fixture
+def cube_file(tmp_path):
+    path = tmp_path / "cube.py"
+    path.write_text(CUBE_SOURCE.format(depth=1))
+    return path
+
+
+def _cube_module(service, cube_file):
+    return sys.modules[service.resolve_target(f"{cube_file}:Cube").__module__]
+
+
+class TestBuildService:
+    def test_build_exports_and_reuses_compiled_geometry(self, cube_file, tmp_path):
+        service = BuildService()
+
+        first = service.build(f"{cube_file}:Cube", formats=["3mf"])
+        second = service.build(f"{cube_file}:Cube", formats=["3mf"])
+        service.build(f"{cube_file}:Cube", "cube:\n  size: 4\n")
+
+        assert first == second
+        assert first["stl"] == [str(tmp_path / "out" / "cube.stl")]
+        assert (tmp_path / "out" / "cube.3mf").exists()
+        assert _cube_module(service, cube_file).BUILDS == [10, 4]
+
+    def test_changed_source_is_reloaded(self, cube_file):
+        service = BuildService()
+        service.build(f"{cube_file}:Cube")
+
+        cube_file.write_text(CUBE_SOURCE.format(depth=2))
+        stat = cube_file.stat()
+        os.utime(cube_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        service.build(f"{cube_file}:Cube")
+
+        assert _cube_module(service, cube_file).BUILDS == [10]
+        cube = service.resolve_target(f"{cube_file}:Cube")()
+        cube.compile()
+        assert cube.parts[0].part.volume == pytest.approx(20)
+
+    def test_bad_targets_are_reported(self, cube_file):
+        service = BuildService()
+        with pytest.raises(ValueError, match="module:ClassName"):
+            service.resolve_target("cube")
+        with pytest.raises(ValueError, match="no class named Sphere"):
+            service.resolve_target(f"{cube_file}:Sphere")
+        response = service.handle({"command": "build", "target": "cube"})
+        assert response["ok"] is False
+
+    def test_unknown_command(self):
+        assert BuildService().handle({"command": "jump"})["ok"] is False
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="requires Unix sockets")
+class TestDaemonServer:
+    def test_requests_are_served_until_shutdown(self, cube_file, tmp_path):
+        socket_path = tmp_path / "daemon.sock"
+        server = threading.Thread(
+            target=serve_daemon, args=(socket_path, ()), daemon=True
+        )
+        server.start()
+        for _ in range(100):
+            if socket_path.exists():
+                break
+            time.sleep(0.05)
+
+        assert send_daemon_request({"command": "ping"}, socket_path)["ok"]
+        response = send_daemon_request(
+            {"command": "build", "target": f"{cube_file}:Cube"}, socket_path
+        )
+        assert response == {
+            "ok": True,
+            "exports": {"stl": [str(tmp_path / "out" / "cube.stl")]},
+        }
+        with pytest.raises(RuntimeError, match="already running"):
+            serve_daemon(socket_path, ())
+
+        send_daemon_request({"command": "shutdown"}, socket_path)
+        server.join(timeout=10)
+        assert not server.is_alive()
+        assert not socket_path.exists()
+
+    def test_missing_daemon_is_unavailable(self, tmp_path):
+        with pytest.raises(DaemonUnavailableError):
+            send_daemon_request({"command": "ping"}, tmp_path / "missing.sock")
+
+    def test_socket_is_private_to_its_owner(self, tmp_path):
+        socket_path = tmp_path / "daemon.sock"
+        server = threading.Thread(
+            target=serve_daemon, args=(socket_path, ()), daemon=True
+        )
+        server.start()
+        for _ in range(100):
+            if socket_path.exists():
+                break
+            time.sleep(0.05)
+        try:
+            assert stat.S_IMODE(socket_path.lstat().st_mode) == 0o600
+        finally:
+            send_daemon_request({"command": "shutdown"}, socket_path)
+            server.join(timeout=10)
+
+    def test_foreign_socket_is_refused(self, tmp_path, monkeypatch):
+        socket_path = tmp_path / "daemon.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(str(socket_path))
+            listener.listen()
+            monkeypatch.setattr(os, "getuid", lambda: os.geteuid() + 1)
+            with pytest.raises(DaemonUnavailableError, match="owned by this user"):
+                send_daemon_request({"command": "ping"}, socket_path)
+            with pytest.raises(RuntimeError, match="Refusing to replace"):
+                serve_daemon(socket_path, ())
+        assert socket_path.exists()
+
+    def test_regular_file_is_not_a_daemon(self, tmp_path):
+        socket_path = tmp_path / "daemon.sock"
+        socket_path.write_text("not a socket")
+        with pytest.raises(DaemonUnavailableError, match="owned by this user"):
+            send_daemon_request({"command": "ping"}, socket_path)
+        with pytest.raises(RuntimeError, match="Refusing to replace"):
+            serve_daemon(socket_path, ())
+        assert socket_path.read_text() == "not a socket"
+
+    @pytest.mark.parametrize(
+        "reply, message",
+        [
+            (b"", "without responding"),
+            (b"{not json\n", "malformed response"),
+            (None, "did not respond"),
+        ],
+    )
+    def test_broken_responses_are_unavailable(self, tmp_path, reply, message):
+        socket_path = tmp_path / "daemon.sock"
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(socket_path))
+        listener.listen()
+        done = threading.Event()
+
+        def answer():
+            connection, _ = listener.accept()
+            with connection:
+                connection.makefile("rb").readline()
+                if reply is None:
+                    done.wait(5)
+                else:
+                    connection.sendall(reply)
+
+        responder = threading.Thread(target=answer, daemon=True)
+        responder.start()
+        try:
+            with pytest.raises(DaemonUnavailableError, match=message):
+                send_daemon_request({"command": "ping"}, socket_path, timeout=0.2)
+        finally:
+            done.set()
+            responder.join(timeout=5)
+            listener.close()
@@ -0,0 +1,100 @@
+import io
+import os
+
+import pytest
+
+from partomatic import ExportCache, iter_file_chunks
+from test_partomatic import Widget
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExportCache(tmp_path / "cache", max_bytes=100)
+
+
+class TestExportCache:
+    def test_key_follows_config_and_format(self, cache):
+        widget = Widget()
+        key = cache.key(widget, "stl")
+
+        assert cache.key(Widget(), "STL") == key
+        assert cache.key(widget, "step") != key
+        widget._config.radius = 6
+        assert cache.key(widget, "stl") != key
+
+    def test_put_and_get_round_trip(self, cache):
+        assert cache.get("abc") is None
+
+        cache.put("abc", "wheel.stl", b"solid")
+        path = cache.get("abc")
+
+        assert path.read_bytes() == b"solid"
+        assert ExportCache.file_name(path) == "wheel.stl"
+
+    def test_least_recently_used_entries_are_evicted(self, cache):
+        cache.put("old", "old.stl", b"o" * 40)
+        cache.put("used", "used.stl", b"u" * 40)
+        os.utime(cache.get("old"), ns=(0, 0))
+        os.utime(cache.get("used"), ns=(0, 1))
+        cache.get("old")
+
+        cache.put("new", "new.stl", b"n" * 40)
+
+        assert cache.get("used") is None
+        assert cache.get("old") is not None
+        assert cache.get("new") is not None
+
+    def test_store_chunks_commits_only_complete_payloads(self, cache):
+        abandoned = cache.store_chunks("part", "kit.zip", iter([b"a", b"b"]))
+        assert next(abandoned) == b"a"
+        abandoned.close()
+        assert cache.get("part") is None
+
+        assert list(cache.store_chunks("done", "kit.zip", [b"a", b"b"])) == [b"a", b"b"]
+        assert cache.get("done").read_bytes() == b"ab"
+        assert list(cache.directory.iterdir()) == [cache.get("done")]
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="requires POSIX owners")
+    def test_cache_folder_is_private_to_its_owner(self, tmp_path):
+        cache = ExportCache(tmp_path / "private")
+        assert cache.directory.stat().st_mode & 0o777 == 0o700
+
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        shared.chmod(0o777)
+        with pytest.raises(PermissionError, match="writable by other users"):
+            ExportCache(shared)
+
+        (tmp_path / "link").symlink_to(tmp_path / "private")
+        with pytest.raises(PermissionError, match="not a directory"):
+            ExportCache(tmp_path / "link")
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="requires POSIX owners")
+    def test_cache_folder_of_another_user_is_refused(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(os, "getuid", lambda: os.stat(tmp_path).st_uid + 1)
+        with pytest.raises(PermissionError, match="another user"):
+            ExportCache(tmp_path)
+
+    def test_default_folder_is_in_the_user_cache(self, tmp_path, monkeypatch):
+        from partomatic import default_export_cache_dir
+
+        monkeypatch.delenv("PARTOMATIC_EXPORT_CACHE", raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert default_export_cache_dir() == tmp_path / "partomatic" / "exports"
+        monkeypatch.setenv("PARTOMATIC_EXPORT_CACHE", str(tmp_path / "elsewhere"))
+        assert default_export_cache_dir() == tmp_path / "elsewhere"
+
+    def test_file_chunks_survive_eviction(self, cache):
+        path = cache.put("abc", "wheel.stl", b"x" * 10)
+        chunks = iter_file_chunks(path, chunk_size=4)
+
+        cache.clear()
+
+        assert list(chunks) == [b"xxxx", b"xxxx", b"xx"]
+
+    def test_file_chunks_read_open_streams_from_the_start(self):
+        stream = io.BytesIO()
+        stream.write(b"x" * 6)
+
+        assert list(iter_file_chunks(stream, chunk_size=4)) == [b"xxxx", b"xx"]
+        assert stream.closed
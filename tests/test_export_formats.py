@@ -0,0 +1,188 @@
+import io
+import json
+import struct
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from build123d import Box, Cylinder, Part, Sphere
+
+from partomatic import (
+    ExportFormat,
+    TriangleMesh,
+    get_export_format,
+    iter_zip_chunks,
+    mesh_shapes,
+    register_export_format,
+    registered_export_formats,
+    set_mesh_threads,
+    tessellate,
+    triangle_count,
+    write_3mf,
+    write_stl,
+    write_glb,
+)
+from partomatic.export_formats import _export_formats
+
+
+@pytest.fixture
+def box_mesh():
+    return tessellate(Box(10, 20, 30))
+
+
+class TestTessellate:
+    def test_box_mesh_buffers(self, box_mesh):
+        assert box_mesh.vertices.dtype == np.float32
+        assert box_mesh.triangles.dtype == np.uint32
+        assert box_mesh.triangle_count == 12
+        minimum, maximum = box_mesh.bounds()
+        assert np.allclose(minimum, [-5, -10, -15])
+        assert np.allclose(maximum, [5, 10, 15])
+
+    def test_facet_normals_point_outward(self, box_mesh):
+        normals = box_mesh.facet_normals()
+        centers = box_mesh.triangle_vertices.mean(axis=1)
+        assert np.all(np.einsum("ij,ij->i", normals, centers) > 0)
+
+    @pytest.mark.parametrize("shape", [Box(10, 20, 30), Sphere(5), Cylinder(2, 8)])
+    def test_meshes_of_solids_are_closed(self, shape):
+        mesh = tessellate(shape)
+        edges = np.sort(mesh.triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+
+        _, uses = np.unique(edges, axis=0, return_counts=True)
+
+        assert np.all(uses == 2)
+        assert len(np.unique(mesh.vertices, axis=0)) == len(mesh.vertices)
+
+    def test_null_shape_raises_and_faceless_shape_is_empty(self):
+        with pytest.raises(ValueError, match="empty shape"):
+            tessellate(Part())
+
+        mesh = tessellate(Box(1, 1, 1) - Box(2, 2, 2))
+        assert mesh.vertices.shape == (0, 3)
+        assert mesh.triangle_count == 0
+
+    def test_box_mesh_shares_corner_vertices(self, box_mesh):
+        assert box_mesh.vertices.shape == (8, 3)
+
+    def test_mesh_shapes_meshes_each_shape_as_alone(self):
+        together = [Sphere(5), Cylinder(2, 8)]
+        alone = [Sphere(5), Cylinder(2, 8)]
+
+        mesh_shapes(together, 1e-3, 0.1)
+        for shape in alone:
+            mesh_shapes([shape], 1e-3, 0.1, parallel=False)
+
+        counts = [triangle_count(shape) for shape in together]
+        assert counts == [triangle_count(shape) for shape in alone]
+        assert all(count > 0 for count in counts)
+
+    def test_set_mesh_threads_sizes_occ_pool(self):
+        try:
+            assert set_mesh_threads(2) == 2
+        finally:
+            set_mesh_threads()
+
+
+class TestExportFormatRegistry:
+    def test_builtin_formats_are_registered(self):
+        names = [export_format.name for export_format in registered_export_formats()]
+        assert names[:4] == ["stl", "step", "3mf", "glb"]
+        assert get_export_format("3MF").suffix == ".3mf"
+        assert get_export_format("glb").is_mesh_based
+
+    def test_unknown_format_raises(self):
+        with pytest.raises(ValueError, match="Unknown export format"):
+            get_export_format("obj")
+
+    def test_register_rejects_duplicates_unless_replacing(self):
+        custom = ExportFormat(
+            "custom",
+            ".bin",
+            "application/octet-stream",
+            "Custom",
+            mesh_writer=write_glb,
+        )
+        try:
+            register_export_format(custom)
+            with pytest.raises(ValueError, match="already registered"):
+                register_export_format(custom)
+            register_export_format(custom, replace=True)
+            assert get_export_format("custom") is custom
+        finally:
+            _export_formats.pop("custom", None)
+
+    def test_format_requires_a_writer(self):
+        with pytest.raises(ValueError, match="needs a shape_writer"):
+            ExportFormat("empty", ".x", "application/octet-stream", "Empty")
+
+
+class TestMeshWriters:
+    def test_write_3mf_produces_model_package(self, box_mesh, tmp_path):
+        target = tmp_path / "box.3mf"
+        write_3mf(box_mesh, target)
+        with zipfile.ZipFile(target) as archive:
+            assert "[Content_Types].xml" in archive.namelist()
+            model = archive.read("3D/3dmodel.model").decode("utf-8")
+        assert 'name="box"' in model
+        assert model.count("<vertex ") == box_mesh.vertices.shape[0]
+        assert model.count("<triangle ") == 12
+
+    def test_write_glb_to_stream(self, box_mesh):
+        stream = io.BytesIO()
+        write_glb(box_mesh, stream)
+        data = stream.getvalue()
+        magic, version, length = struct.unpack_from("<4sII", data)
+        assert (magic, version, length) == (b"glTF", 2, len(data))
+        json_length, chunk_type = struct.unpack_from("<I4s", data, 12)
+        assert chunk_type == b"JSON"
+        document = json.loads(data[20 : 20 + json_length])
+        assert document["accessors"][0]["count"] == 36
+        assert document["accessors"][1]["max"] == pytest.approx([5, 10, 15])
+
+    def test_write_stl_matches_build123d_import(self, box_mesh, tmp_path):
+        from build123d import import_stl
+
+        target = tmp_path / "box.stl"
+        write_stl(box_mesh, target)
+        assert target.stat().st_size == 84 + 50 * 12
+        assert import_stl(str(target)).area == pytest.approx(2200, rel=1e-3)
+
+    def test_empty_mesh_is_rejected(self):
+        empty = TriangleMesh(
+            vertices=np.zeros((0, 3), dtype=np.float32),
+            triangles=np.zeros((0, 3), dtype=np.uint32),
+        )
+        with pytest.raises(ValueError, match="no triangles"):
+            write_glb(empty, io.BytesIO())
+
+
+class TestStreamingExports:
+    def test_write_stream_handles_mesh_and_shape_formats(self):
+        mesh_stream = io.BytesIO()
+        get_export_format("glb").write_stream(Box(10, 20, 30), mesh_stream)
+        assert mesh_stream.getvalue()[:4] == b"glTF"
+
+        step_stream = io.BytesIO()
+        get_export_format("step").write_stream(Box(10, 20, 30), step_stream)
+        assert step_stream.getvalue().startswith(b"ISO-10303-21")
+
+    def test_zip_chunks_are_yielded_per_member(self):
+        written = []
+
+        def writer(name):
+            def write(stream):
+                written.append(name)
+                stream.write(name.encode() * 100)
+
+            return write
+
+        chunks = iter_zip_chunks((name, writer(name)) for name in ("a", "b"))
+        first = next(chunks)
+        assert written == ["a"]
+        assert first.startswith(b"PK")
+
+        archive = zipfile.ZipFile(io.BytesIO(first + b"".join(chunks)))
+        assert archive.namelist() == ["a", "b"]
+        assert archive.read("b") == b"b" * 100
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from partomatic import CompileCrashedError, CompileTimeoutError, compile_isolated
+from test_partomatic import Widget
+
+
+class HangingWidget(Widget):
+    def compile(self):
+        time.sleep(60)
+
+
+class CrashingWidget(Widget):
+    def compile(self):
+        os._exit(3)
+
+
+class FailingWidget(Widget):
+    def compile(self):
+        raise ValueError("radius too large")
+
+
+class HungryWidget(Widget):
+    def compile(self):
+        self.hoard = bytearray(4 * 2**30)
+
+
+def _virtual_memory_size() -> int:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmSize:"):
+            return int(line.split()[1]) * 1024
+    raise RuntimeError("VmSize not reported")
+
+
+class TestCompileIsolated:
+    def test_parts_come_back_from_child(self):
+        widget = Widget(radius=4)
+
+        parts = widget.compile_isolated(timeout=60)
+
+        assert widget.parts is parts
+        assert parts[0].part.volume == pytest.approx(
+            Widget(radius=4).complete_wheel().volume
+        )
+        assert parts[0].file_name_base == "test"
+        assert widget.is_dirty is False
+
+    def test_hung_compile_is_killed(self):
+        widget = HangingWidget()
+        started = time.monotonic()
+
+        with pytest.raises(CompileTimeoutError, match="within 3 seconds"):
+            widget.compile_isolated(timeout=3)
+
+        assert time.monotonic() - started < 30
+        assert widget.parts == []
+        assert widget.is_dirty is True
+
+    def test_crashed_compile_is_reported(self):
+        with pytest.raises(CompileCrashedError, match="exited with code 3"):
+            compile_isolated(CrashingWidget(), timeout=60)
+
+    def test_compile_errors_are_reraised(self):
+        with pytest.raises(ValueError, match="radius too large"):
+            compile_isolated(FailingWidget(), timeout=60)
+
+    @pytest.mark.skipif(
+        not sys.platform.startswith("linux"), reason="reads /proc for VmSize"
+    )
+    def test_memory_limit_stops_runaway_allocation(self):
+        limit = _virtual_memory_size() + 2**30
+
+        with pytest.raises(MemoryError):
+            compile_isolated(HungryWidget(), timeout=60, memory_limit=limit)
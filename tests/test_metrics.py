@@ -0,0 +1,72 @@
+import csv
+
+import numpy as np
+import pytest
+
+from partomatic import MetricsTable, grid_points, partomate_batch, partomate_sweep
+from test_partomatic import Widget
+from test_sweep import SweptWidget
+
+
+@pytest.fixture
+def sweep_results(tmp_path):
+    widget = SweptWidget(stl_folder=str(tmp_path))
+    points = grid_points({"radius": [6, 7, 12], "sub.sub_enum": ["TWO"]})
+    for point in points:
+        point["file_suffix"] = f"-{point['radius']}"
+    return partomate_sweep(widget, points, parallel=False)
+
+
+class TestMetricsTable:
+    def test_from_results_keys_rows_by_parameters(self, sweep_results):
+        table = MetricsTable.from_results(sweep_results)
+
+        assert len(table) == 3
+        assert list(table["radius"]) == [6, 7, 12]
+        assert list(table["sub.sub_enum"]) == ["TWO", "TWO", "TWO"]
+        assert list(table["ok"]) == [1, 1, 0]
+        assert table["volume"][0] > table["volume"][1]
+        assert np.isnan(table["volume"][2])
+        assert (table["triangles"][:2] > 0).all()
+        assert (table["stl_bytes"][:2] > 0).all()
+        assert list(table["part"]) == ["test", "test", ""]
+
+    def test_yaml_configurations_share_parameter_columns(self, tmp_path):
+        config_path = tmp_path / "widget.yml"
+        config_path.write_text("Widget:\n  radius: 9\n  file_suffix: '-a'\n")
+        results = partomate_batch(
+            Widget(stl_folder=str(tmp_path)),
+            [str(config_path), {"radius": 8, "file_suffix": "-b"}],
+        )
+
+        table = MetricsTable.from_results(results)
+
+        assert "configuration" not in table.columns
+        assert list(table["radius"]) == [9, 8]
+        assert list(table["file_suffix"]) == ["-a", "-b"]
+
+    def test_csv_leaves_missing_metrics_empty(self, sweep_results, tmp_path):
+        table = MetricsTable.from_results(sweep_results)
+        path = tmp_path / "metrics.csv"
+
+        table.to_csv(path)
+
+        with open(path, newline="") as stream:
+            rows = list(csv.DictReader(stream))
+        assert list(rows[0])[:2] == ["radius", "sub.sub_enum"]
+        assert rows[0]["radius"] == "6"
+        assert float(rows[0]["volume"]) == pytest.approx(table["volume"][0])
+        assert rows[2]["volume"] == ""
+
+    def test_npz_round_trip(self, tmp_path):
+        table = MetricsTable.from_rows(
+            [{"radius": 6, "label": "a", "volume": 1.5}, {"radius": 7, "label": "b"}]
+        )
+        path = tmp_path / "metrics.npz"
+
+        table.to_npz(path)
+        restored = MetricsTable.from_npz(path)
+
+        assert list(restored.columns) == ["radius", "label", "volume"]
+        assert list(restored["label"]) == ["a", "b"]
+        np.testing.assert_array_equal(restored["volume"], [1.5, np.nan])
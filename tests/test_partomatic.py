@@ -1,17 +1,32 @@
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from enum import Enum, auto
+import io
 from _pytest.logging import caplog
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from pathlib import Path
 
+import numpy as np
+import ocp_vscode
+
 from partomatic import AutomatablePart, PartomaticConfig, Partomatic
+from partomatic.export_formats import _export_formats, get_export_format
 from build123d import BuildPart, Box, Part, Sphere, Align, Mode, Location
 
 import logging
 from sys import stdout
 
 
+@contextmanager
+def patched_stl_writer():
+    """Swap the registered STL mesh writer for a mock."""
+    writer = MagicMock()
+    stl = replace(get_export_format("stl"), mesh_writer=writer)
+    with patch.dict(_export_formats, {"stl": stl}):
+        yield writer
+
+
 class FakeEnum(Enum):
     ONE = auto()
     TWO = auto()
@@ -66,12 +81,45 @@ class Widget(Partomatic):
         )
 
 
+class StreamingWidget(Widget):
+
+    def compile(self):
+        self.build_log.append("first")
+        yield AutomatablePart(
+            self.complete_wheel(),
+            "first",
+            stl_folder=self._config.stl_folder,
+        )
+        self.build_log.append("second")
+        yield AutomatablePart(
+            self.complete_wheel(),
+            "second",
+            stl_folder=self._config.stl_folder,
+        )
+
+
+class ProfileConfig(WidgetConfig):
+    profile: np.ndarray = field(default_factory=lambda: np.zeros(3))
+
+
+class ProfileWidget(Widget):
+    _config: ProfileConfig = ProfileConfig()
+
+
+class LabelledWidget(Widget):
+    _transient_state = Widget._transient_state | {"scratch"}
+
+    def __init__(self, label, **kwargs):
+        super().__init__(**kwargs)
+        self.label = label
+        self.scratch = object()
+
+
 class TestPartomatic:
 
     def test_complete_file_path_helpers_and_wrap_compile_idempotent(self):
         foo = Widget()
         foo.compile()
-        wrapped_compile = foo.compile
 
         stl_path = foo.complete_stl_file_path(foo.parts[0])
         step_path = foo.complete_step_file_path(foo.parts[0])
@@ -79,8 +127,22 @@ class TestPartomatic:
         assert stl_path.endswith(".stl")
         assert step_path.endswith(".step")
 
-        foo._wrap_compile_method()
-        assert foo.compile is wrapped_compile
+        class InheritedWidget(Widget):
+            pass
+
+        class OverridingWidget(Widget):
+            def compile(self):
+                super().compile()
+
+        assert "compile" not in vars(foo)
+        assert InheritedWidget.compile is Widget.compile
+        assert OverridingWidget.compile.__wrapped__.__name__ == "compile"
+        assert OverridingWidget._compile_function() is not Widget._compile_function()
+
+        overriding = OverridingWidget()
+        overriding.compile()
+        assert len(overriding.parts) == 1
+        assert overriding.is_dirty is False
 
     def test_dirty_state_tracks_config_against_last_compile(self):
         foo = Widget()
@@ -109,7 +171,7 @@ class TestPartomatic:
             patch("pathlib.Path.is_dir"),
             patch("ocp_vscode.show_clear"),
             patch("ocp_vscode.show"),
-            patch("partomatic.partomatic.export_stl") as export_stl,
+            patched_stl_writer() as export_stl,
             patch("partomatic.partomatic.export_step") as export_step,
         ):
             foo.display()
@@ -122,7 +184,7 @@ class TestPartomatic:
             patch("pathlib.Path.exists"),
             patch("pathlib.Path.is_dir"),
             patch("ocp_vscode.show_clear"),
-            patch("partomatic.partomatic.export_stl") as export_stl,
+            patched_stl_writer() as export_stl,
             patch("partomatic.partomatic.export_step") as export_step,
         ):
             foo.partomate(export_steps=True)
@@ -141,7 +203,7 @@ class TestPartomatic:
             patch("pathlib.Path.mkdir"),
             patch("pathlib.Path.exists", return_value=True),
             patch("pathlib.Path.is_dir", return_value=True),
-            patch("partomatic.partomatic.export_stl") as export_stl,
+            patched_stl_writer() as export_stl,
             patch("partomatic.partomatic.export_step") as export_step,
         ):
             stl_paths = foo.export_stls_to_directory("bundle")
@@ -152,6 +214,298 @@ class TestPartomatic:
         export_stl.assert_called_once()
         export_step.assert_called_once()
 
+    def test_export_registered_formats(self, tmp_path):
+        foo = Widget(stl_folder=str(tmp_path))
+        foo.compile()
+
+        paths = foo.export("3mf", output_dir=tmp_path / "bundle")
+        assert [path.suffix for path in paths] == [".3mf"]
+        assert paths[0].exists()
+
+        with patched_stl_writer() as export_stl:
+            foo.partomate(formats=("stl", "step"))
+        export_stl.assert_called_once()
+        assert (tmp_path / "stls" / "test.step").exists()
+
+        with pytest.raises(ValueError, match="Unknown export format"):
+            foo.export("obj")
+
+    def test_partomate_tessellates_once_for_several_mesh_formats(self, tmp_path):
+        from partomatic.tessellation import tessellate
+
+        foo = Widget(stl_folder=str(tmp_path))
+        with patch(
+            "partomatic.automatable_part.tessellate", side_effect=tessellate
+        ) as tessellate_mock:
+            foo.partomate(export_steps=True, formats=("3mf", "glb"))
+
+        tessellate_mock.assert_called_once()
+        stl_path = tmp_path / "stls" / "test.stl"
+        triangle_count = int.from_bytes(stl_path.read_bytes()[80:84], "little")
+        assert triangle_count > 0
+        assert stl_path.stat().st_size == 84 + 50 * triangle_count
+        for suffix in (".3mf", ".glb", ".step"):
+            assert (tmp_path / "stls" / f"test{suffix}").exists()
+
+    def test_partomate_reuse_compiled_skips_clean_compile(self, tmp_path):
+        foo = StreamingWidget(stl_folder=str(tmp_path))
+        foo.build_log = []
+        foo.compile()
+
+        with patched_stl_writer() as export_stl:
+            foo.partomate(reuse_compiled=True)
+            assert foo.build_log == ["first", "second"]
+            assert export_stl.call_count == 2
+
+            foo._config.radius = 6
+            foo.partomate(reuse_compiled=True)
+            assert foo.build_log == ["first", "second"] * 2
+
+    def test_partomate_routes_exports_through_overridden_hooks(self, tmp_path):
+        class QuietStreamingWidget(StreamingWidget):
+            def export_stls(self):
+                self.exported = [part.file_name_base for part in self.parts]
+                return []
+
+        foo = QuietStreamingWidget(stl_folder=str(tmp_path))
+        foo.build_log = []
+
+        with patched_stl_writer() as export_stl:
+            foo.partomate(formats=("3mf", "step"))
+
+        export_stl.assert_not_called()
+        assert foo.exported == ["first", "second"]
+        exported = sorted(path.name for path in tmp_path.iterdir())
+        assert exported == ["first.3mf", "first.step", "second.3mf", "second.step"]
+
+    def test_infeasible_config_fails_before_compile(self):
+        from partomatic import InfeasibleConfigError
+
+        class SlenderConfig(WidgetConfig):
+            radius: float = field(
+                default=10, metadata={"feasible": lambda c: c.radius < c.length}
+            )
+
+        class SlenderWidget(Widget):
+            _config: SlenderConfig = SlenderConfig()
+
+            def compile(self):
+                self.compiled = True
+                super().compile()
+
+        foo = SlenderWidget(radius=20)
+
+        with pytest.raises(InfeasibleConfigError, match="radius is infeasible"):
+            foo.compile()
+        with pytest.raises(InfeasibleConfigError):
+            list(foo.iter_compile())
+        assert not hasattr(foo, "compiled")
+        assert foo.is_dirty is True
+
+    def test_generator_compile_collects_parts(self):
+        foo = StreamingWidget()
+        foo.build_log = []
+        assert foo.compiles_incrementally is True
+        assert Widget().compiles_incrementally is False
+
+        foo.compile()
+        assert [part.file_name_base for part in foo.parts] == ["first", "second"]
+        assert foo.is_dirty is False
+
+    def test_iter_compile_yields_before_later_parts_are_built(self):
+        foo = StreamingWidget()
+        foo.build_log = []
+        parts = foo.iter_compile()
+
+        first = next(parts)
+        assert first.file_name_base == "first"
+        assert foo.build_log == ["first"]
+        assert foo.is_dirty is True
+
+        assert [part.file_name_base for part in parts] == ["second"]
+        assert foo.build_log == ["first", "second"]
+        assert len(foo.parts) == 2
+        assert foo.is_dirty is False
+
+    def test_streaming_partomate_exports_and_releases_geometry(self, tmp_path):
+        foo = StreamingWidget(stl_folder=str(tmp_path))
+        foo.build_log = []
+
+        foo.partomate(formats=("3mf",), release_geometry=True)
+
+        for name in ("first", "second"):
+            assert (tmp_path / f"{name}.stl").exists()
+            assert (tmp_path / f"{name}.3mf").exists()
+        assert all(part.part is None for part in foo.parts)
+        assert foo.is_dirty is True
+
+    def test_instances_own_independent_configs(self):
+        class ContainerWidget(Widget):
+            _config: ContainerConfig = ContainerConfig()
+
+        first = ContainerWidget(container_field="first")
+        second = ContainerWidget()
+        first._config.sub.sub_field = "changed"
+
+        assert second._config.container_field == "container_default"
+        assert second._config.sub.sub_field == "sub_default"
+        assert ContainerWidget._config.container_field == "container_default"
+        assert ContainerWidget._config.sub.sub_field == "sub_default"
+
+    def test_instances_compile_concurrently_in_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        widgets = [Widget(radius=radius, length=17) for radius in (8, 9, 10, 11)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda widget: widget.compile(), widgets))
+
+        volumes = [widget.parts[0].part.volume for widget in widgets]
+        assert volumes == sorted(volumes, reverse=True)
+        assert [widget._config.radius for widget in widgets] == [8, 9, 10, 11]
+        assert not any(widget.is_dirty for widget in widgets)
+
+    def test_pickle_ships_config_snapshot_only(self):
+        import pickle
+
+        foo = Widget(radius=7.5)
+        foo.compile()
+        state = foo.__getstate__()
+        assert set(state) == {"config"}
+
+        with patch.object(WidgetConfig, "load_config") as load_config:
+            clone = pickle.loads(pickle.dumps(foo))
+        load_config.assert_not_called()
+        assert type(clone) is Widget
+        assert type(clone._config) is WidgetConfig
+        assert clone._config is not foo._config
+        assert clone._config.radius == 7.5
+        assert clone.parts == []
+        assert clone.is_dirty is True
+
+        clone.compile()
+        assert clone.parts[0].part.volume == pytest.approx(foo.parts[0].part.volume)
+
+    def test_copies_keep_attributes_set_by_subclasses(self):
+        import copy
+        import pickle
+
+        foo = LabelledWidget("hub", radius=7.5)
+        foo.compile()
+        assert set(foo.__getstate__()["attributes"]) == {"label"}
+        clones = [
+            copy.copy(foo),
+            copy.deepcopy(foo),
+            pickle.loads(pickle.dumps(foo)),
+        ]
+
+        for clone in clones:
+            assert clone.label == "hub"
+            assert not hasattr(clone, "scratch")
+            assert clone._config.radius == 7.5
+            assert clone.parts == []
+
+    def test_array_config_fields_snapshot_by_digest(self):
+        import pickle
+
+        foo = ProfileWidget()
+        foo._config.profile = np.linspace(0, 1, 1000)
+        foo.compile()
+        assert foo.is_dirty is False
+        assert foo._compiled_config_snapshot["profile"][:3] == (
+            "ndarray",
+            "float64",
+            (1000,),
+        )
+
+        foo._config.profile = foo._config.profile * 2
+        assert foo.is_dirty is True
+
+        clone = pickle.loads(pickle.dumps(foo))
+        np.testing.assert_array_equal(clone._config.profile, foo._config.profile)
+
+    def test_read_only_array_digest_is_computed_once_per_array(self):
+        import hashlib
+
+        foo = ProfileWidget()
+        # linspace returns a view; copy so nothing writable backs the array
+        profile = np.linspace(0, 1, 1000).copy()
+        profile.flags.writeable = False
+        foo._config.profile = profile
+        foo.compile()
+
+        with patch("hashlib.sha256", wraps=hashlib.sha256) as sha256:
+            assert foo.is_dirty is False
+            assert foo.is_dirty is False
+            sha256.assert_not_called()
+
+            copied = foo._config.profile.copy()
+            copied.flags.writeable = False
+            foo._config.profile = copied
+            assert foo.is_dirty is False
+            assert foo.is_dirty is False
+        assert sha256.call_count == 1
+
+    def test_in_place_array_edits_mark_config_dirty(self, tmp_path):
+        from partomatic import ExportCache
+
+        foo = ProfileWidget()
+        foo._config.profile = np.linspace(0, 1, 1000)
+        foo.compile()
+        cache = ExportCache(tmp_path)
+        key = cache.key(foo, "stl")
+
+        foo._config.profile[0] = 5
+        assert foo.is_dirty is True
+        assert cache.key(foo, "stl") != key
+
+        # a read-only view of a writable array can still change
+        view = foo._config.profile[:]
+        view.flags.writeable = False
+        foo._config.profile = view
+        foo.compile()
+        view.base[1] = 5
+        assert foo.is_dirty is True
+
+    def test_export_to_stream_and_zip_without_disk(self, tmp_path):
+        import io
+        import zipfile
+
+        foo = Widget(stl_folder=str(tmp_path), file_prefix="big-")
+        foo.compile()
+        foo.parts.append(AutomatablePart(Box(1, 1, 1), "cube"))
+
+        buffer = io.BytesIO()
+        assert foo.export_to_stream("stl", foo.parts[1], buffer) == "big-cube.stl"
+        assert len(buffer.getvalue()) == 84 + 12 * 50
+
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(foo.iter_export_zip("3mf"))))
+        assert archive.namelist() == ["big-test.3mf", "big-cube.3mf"]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_file_prefix_folder_is_kept(self, tmp_path):
+        import io
+
+        foo = Widget(stl_folder=str(tmp_path), file_prefix="sub/big-")
+        foo.compile()
+
+        assert foo.export_stls() == [tmp_path / "stls" / "sub" / "big-test.stl"]
+        assert foo.export_stls()[0].exists()
+        assert foo.export_to_stream("stl", foo.parts[0], io.BytesIO()) == (
+            "sub/big-test.stl"
+        )
+
+    def test_pickled_generator_compile_round_trips(self):
+        import pickle
+
+        foo = StreamingWidget(length=12)
+        clone = pickle.loads(pickle.dumps(foo))
+        clone.build_log = []
+        assert [part.file_name_base for part in clone.iter_compile()] == [
+            "first",
+            "second",
+        ]
+        assert clone._config.length == 12
+
     def test_bad_stl_output_folder(self, caplog):
         logging.getLogger("partomatic").addHandler(logging.StreamHandler())
         foo = Widget(stl_folder="/bad/path")
@@ -161,7 +515,6 @@ class TestPartomatic:
             patch("pathlib.Path.exists", return_value=False),
             patch("pathlib.Path.is_dir"),
             patch("ocp_vscode.show"),
-            patch("build123d.export_stl"),
             patch("build123d.export_step"),
         ):
             foo.display()
@@ -180,7 +533,12 @@ class TestPartomatic:
             foo.display(viewer_host="127.0.0.1", viewer_port=4040)
 
         set_port.assert_called_once_with(4040, host="127.0.0.1")
-        # show() is called without port parameter to use VS Code integration
+        # the port goes with the call, since set_port() is process-wide
+        assert show.call_args.kwargs["port"] == 4040
+
+        with patch("ocp_vscode.show") as show:
+            foo.display(force=True)
+        # without a port, show() can use the VS Code integration
         assert "port" not in show.call_args.kwargs
 
     def test_display_maintains_consistent_bounding_boxes(self):
@@ -196,9 +554,9 @@ class TestPartomatic:
             first_call_parts = show.call_args[0][0]
             first_bboxes = [part.bounding_box() for part in first_call_parts]
 
-        # Call display again without changing config
+        # Force a resend without changing config
         with patch("ocp_vscode.show_clear"), patch("ocp_vscode.show") as show:
-            foo.display()
+            foo.display(force=True)
             second_call_parts = show.call_args[0][0]
             second_bboxes = [part.bounding_box() for part in second_call_parts]
 
@@ -223,6 +581,143 @@ class TestPartomatic:
                 and abs(first_max.Z - second_max.Z) < 1e-6
             ), f"Part {i} max coordinate changed: {first_max} -> {second_max}"
 
+    def test_display_skips_viewer_that_already_shows_parts(self):
+        foo = Widget()
+        foo.compile()
+
+        with patch("ocp_vscode.show") as show:
+            assert foo.display() is True
+            # a fresh compile of the same config has the same geometry hash
+            other = Widget()
+            other.compile()
+            assert other.display() is False
+            foo.parts[0].display_location = Location((0, 0, 30))
+            assert foo.display() is True
+            assert foo.display(viewer_port=4040) is True
+
+        assert show.call_count == 3
+        assert "reset_camera" not in show.call_args_list[0].kwargs
+        assert show.call_args_list[1].kwargs["reset_camera"] == ocp_vscode.Camera.KEEP
+
+    def test_display_reuses_export_triangulation(self, tmp_path):
+        import io
+        from OCP.BRep import BRep_Tool
+        from OCP.TopLoc import TopLoc_Location
+        from partomatic.tessellation import mesh_shapes, tessellate
+
+        foo = Widget(stl_folder=str(tmp_path))
+        foo.compile()
+        part = foo.parts[0]
+        part.display_location = Location((0, 0, 30))
+        foo.export("glb")
+
+        with (
+            patch("ocp_vscode.show") as show,
+            patch(
+                "partomatic.automatable_part.mesh_shapes", wraps=mesh_shapes
+            ) as mesh_mock,
+        ):
+            foo.display()
+        shown = show.call_args.args[0][0]
+
+        # a moved view of the stored shape, carrying its export triangulation
+        mesh_mock.assert_not_called()
+        assert shown.wrapped.IsPartner(part.part.wrapped)
+        assert shown.location.position.Z == pytest.approx(30)
+        assert all(
+            BRep_Tool.Triangulation_s(face.wrapped, TopLoc_Location()) is not None
+            for face in shown.faces()
+        )
+        with patch(
+            "partomatic.automatable_part.tessellate", wraps=tessellate
+        ) as tessellate_mock:
+            foo.export_to_stream("3mf", part, io.BytesIO())
+        tessellate_mock.assert_not_called()
+
+    def test_display_leaves_meshing_to_the_viewer(self, tmp_path):
+        from OCP.BRepMesh import BRepMesh_IncrementalMesh
+        from partomatic.tessellation import mesh_shapes
+
+        def viewer_mesh(shapes, **kwargs):
+            # the viewer meshes the shared shapes in place at its own quality
+            for shape in shapes:
+                BRepMesh_IncrementalMesh(shape.wrapped, 2e-3, False, 0.05, True)
+
+        foo, fresh = Widget(stl_folder=str(tmp_path)), Widget()
+        foo.compile()
+        fresh.compile()
+        with (
+            patch("ocp_vscode.show", side_effect=viewer_mesh),
+            patch(
+                "partomatic.automatable_part.mesh_shapes", wraps=mesh_shapes
+            ) as mesh_mock,
+        ):
+            foo.display()
+        mesh_mock.assert_not_called()
+
+        exported = foo.parts[0].triangle_mesh(*foo._mesh_settings(foo.parts[0]))
+        expected = fresh.parts[0].triangle_mesh(*fresh._mesh_settings(fresh.parts[0]))
+        assert exported.triangle_count == expected.triangle_count
+
+    def test_mesh_settings_reach_exports(self, tmp_path):
+        foo = Widget(stl_folder=str(tmp_path))
+        foo._config.mesh_angular_tolerance = 0.5
+        foo._config.adaptive_mesh_tolerance = True
+        foo.compile()
+        part = foo.parts[0]
+        tolerance = 1e-3 * part.part.bounding_box().diagonal
+
+        with patched_stl_writer() as export_stl:
+            foo.export_stls()
+        assert part._meshed_at[1] == (pytest.approx(tolerance), 0.5, False)
+        mesh = part.triangle_mesh(*foo._mesh_settings(part))
+        assert export_stl.call_args.args[0] is mesh
+        streamed = io.BytesIO()
+        foo.export_to_stream("stl", part, streamed)
+        written = foo.export("stl")[0].read_bytes()
+        assert written[80:] == streamed.getvalue()[80:]
+
+        default = Widget(stl_folder=str(tmp_path / "default"))
+        default.compile()
+        coarse = foo.export("3mf")[0]
+        fine = default.export("3mf")[0]
+        assert coarse.stat().st_size < fine.stat().st_size
+
+    def test_parts_sharing_mesh_settings_are_meshed_together(self, tmp_path):
+        from partomatic.tessellation import mesh_shapes
+
+        foo = Widget(stl_folder=str(tmp_path))
+        foo.compile()
+        folder = str(tmp_path)
+        foo.parts.append(AutomatablePart(Box(4, 4, 4), "cube", stl_folder=folder))
+        foo.parts.append(
+            AutomatablePart(Sphere(3), "ball", stl_folder=folder, mesh_tolerance=0.1)
+        )
+
+        with (
+            patch(
+                "partomatic.automatable_part.mesh_shapes", wraps=mesh_shapes
+            ) as mesh_mock,
+            patch("ocp_vscode.show"),
+        ):
+            foo.display()
+            foo.export_many(["3mf", "glb"])
+
+        grouped = sorted(len(call.args[0]) for call in mesh_mock.call_args_list)
+        assert grouped == [1, 2]
+        assert all(call.kwargs["parallel"] for call in mesh_mock.call_args_list)
+
+    def test_geometry_hash_ignores_triangulation(self):
+        foo, meshed = Widget(), Widget()
+        foo.compile()
+        meshed.compile()
+        part = meshed.parts[0]
+        part.part.mesh(1e-3, 0.1)
+
+        assert part.geometry_hash() == foo.parts[0].geometry_hash()
+        part.release_geometry()
+        assert part.geometry_hash() is None
+
     def test_main_block(self):
         from unittest.mock import patch
         import runpy
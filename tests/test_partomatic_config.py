@@ -297,6 +297,163 @@ Wheel:
         assert spec["fields"]["mode"]["kind"] == "enum"
         assert spec["fields"]["sub"]["kind"] == "object"
 
+    def test_constraint_violations_cover_nested_and_length_metadata(self):
+        from partomatic import ConstraintViolationError
+
+        class LimitedConfig(PartomaticConfig):
+            amount: float = field(default=1.5, metadata={"gt": 0.0, "le": 2.0})
+            label: str = field(default="abc", metadata={"max_length": 5})
+
+        class OuterConfig(PartomaticConfig):
+            limited: LimitedConfig = field(default_factory=LimitedConfig)
+            count: int = field(default=3, metadata={"ge": 1, "description": "n"})
+
+        config = OuterConfig()
+        assert config.constraint_violations() == []
+        config.validate_constraints()
+
+        config.limited.amount = 0
+        config.limited.label = "too long"
+        config.count = 0
+        assert config.constraint_violations() == [
+            "limited.amount must be > 0.0, got 0",
+            "limited.label length must be <= 5, got 8",
+            "count must be >= 1, got 0",
+        ]
+        with pytest.raises(ConstraintViolationError, match="count must be >= 1"):
+            config.validate_constraints()
+
+    def test_feasibility_predicates_from_metadata_and_methods(self):
+        from partomatic import InfeasibleConfigError, feasibility_check
+
+        class BearingConfig(PartomaticConfig):
+            radius: float = 4
+
+            @feasibility_check
+            def positive_radius(self):
+                return self.radius > 0
+
+        class HubConfig(PartomaticConfig):
+            radius: float = field(
+                default=10,
+                metadata={
+                    "feasible": lambda config: config.bearing.radius
+                    < config.radius - config.wall,
+                    "infeasible_message": "bearing must fit inside the wall",
+                },
+            )
+            wall: float = 2
+            bearing: BearingConfig = field(default_factory=BearingConfig)
+
+            @feasibility_check(message="wall must be thinner than the radius")
+            def thin_wall(self):
+                return self.wall < self.radius
+
+        config = HubConfig()
+        assert config.feasibility_violations() == []
+        config.validate_feasibility()
+
+        config.update_from_mapping({"wall": 12, "bearing": {"radius": -1}})
+        assert config.feasibility_violations() == [
+            "bearing.positive_radius failed",
+            "bearing must fit inside the wall",
+            "wall must be thinner than the radius",
+        ]
+        config.update_from_mapping({"wall": 7, "bearing": {"radius": 4}})
+        with pytest.raises(InfeasibleConfigError, match="bearing must fit"):
+            config.validate_feasibility()
+
+    def test_validate_configs_reports_errors_per_mapping(self):
+        from partomatic import validate_configs
+
+        class LimitedConfig(PartomaticConfig):
+            amount: float = field(default=1.5, metadata={"gt": 0.0, "le": 2.0})
+            mode: FakeEnum = FakeEnum.ONE
+
+        class CatalogConfig(PartomaticConfig):
+            label: str = field(default="abc", metadata={"max_length": 5})
+            limited: LimitedConfig = field(default_factory=LimitedConfig)
+
+        errors = validate_configs(
+            CatalogConfig,
+            [
+                {"label": "ok", "limited": {"amount": 2, "mode": "two"}},
+                {"label": "much too long", "limited": {"amount": 0}},
+                {"limited": {"mode": "NINE"}, "unknown": 1},
+                "not a mapping",
+            ],
+        )
+
+        assert errors[0] == []
+        assert errors[1] == [
+            "label: String should have at most 5 characters",
+            "limited.amount: Input should be greater than 0",
+        ]
+        assert errors[2] == [
+            "limited.mode: Value error, must be one of ONE, TWO, THREE"
+        ]
+        assert errors[3] == ["Input should be a valid dictionary"]
+        assert validate_configs(CatalogConfig, []) == []
+
+    def test_construct_rebuilds_snapshot_without_loading(self):
+        class DerivedConfig(WheelConfig):
+            corners: tuple = (1, 2)
+
+            def __post_init__(self):
+                self.diameter = self.radius * 2
+
+        snapshot = DerivedConfig().as_dict()
+        snapshot.update(radius=30, number="TWO", corners=[3, 4])
+        snapshot["bearing"]["number"] = "THREE"
+        del snapshot["depth"]
+
+        with patch.object(PartomaticConfig, "load_config") as load_config:
+            config = DerivedConfig.construct(snapshot)
+
+        load_config.assert_not_called()
+        assert type(config) is DerivedConfig
+        assert config.radius == 30
+        assert config.depth == 2
+        assert config.number == FakeEnum.TWO
+        assert config.corners == (3, 4)
+        assert type(config.bearing) is BearingConfig
+        assert config.bearing.number == FakeEnum.THREE
+        assert config.diameter == 60
+        assert config.as_dict() == DerivedConfig.construct(config.as_dict()).as_dict()
+
+    def test_array_fields_use_memory_mapped_npy_sidecars(self, tmp_path):
+        import numpy as np
+
+        class SurfaceConfig(PartomaticConfig):
+            heights: np.ndarray = field(default_factory=lambda: np.zeros((2, 2)))
+
+        class LithophaneConfig(PartomaticConfig):
+            points: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+            surface: SurfaceConfig = field(default_factory=SurfaceConfig)
+
+        config = LithophaneConfig()
+        config.points = np.arange(12.0).reshape(4, 3)
+        config.surface.heights = np.eye(3)
+        path = tmp_path / "litho.yaml"
+
+        config.save_yaml(path)
+
+        saved = yaml.safe_load(path.read_text())["lithophane"]
+        assert saved["points"] == {"npy": "litho.points.npy"}
+        assert saved["surface"]["heights"] == {"npy": "litho.surface.heights.npy"}
+        loaded = LithophaneConfig(str(path))
+        assert isinstance(loaded.points, np.memmap)
+        np.testing.assert_array_equal(loaded.points, config.points)
+        np.testing.assert_array_equal(loaded.surface.heights, np.eye(3))
+
+        loaded.save_yaml(path)
+        np.testing.assert_array_equal(LithophaneConfig(str(path)).points, loaded.points)
+
+        inline = yaml.safe_load(config.to_yaml())["lithophane"]
+        assert inline["surface"]["heights"][0] == [1.0, 0.0, 0.0]
+        assert LithophaneConfig(config.to_yaml()).points.shape == (4, 3)
+        assert "points" not in config._editor_spec()["fields"]
+
     def test_update_from_mapping_updates_nested_fields_and_enums(self):
         config = WheelConfig()
 
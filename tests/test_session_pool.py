@@ -0,0 +1,171 @@
+import io
+from threading import Lock, Thread
+import time
+from unittest.mock import patch
+
+import pytest
+
+from partomatic import (
+    CompiledPartsCache,
+    PartomaticSessionPool,
+    PreviewState,
+    ViewerPortPool,
+)
+from test_partomatic import Widget
+
+
+class CountingWidget(Widget):
+    compiles = 0
+
+    def compile(self):
+        type(self).compiles += 1
+        super().compile()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("partomatic.session_pool.time.monotonic", lambda: now[0])
+    return now
+
+
+class TestCompiledPartsCache:
+    def test_matching_configs_share_compiled_parts(self):
+        CountingWidget.compiles = 0
+        cache = CompiledPartsCache()
+        first, second = CountingWidget(radius=4), CountingWidget(radius=4)
+
+        cache.compile_for_preview(first)
+        cache.compile_for_preview(second)
+
+        assert CountingWidget.compiles == 1
+        assert second.parts[0] is first.parts[0]
+        assert second.preview_state == PreviewState.CLEAN
+
+    def test_different_configs_compile_separately(self):
+        CountingWidget.compiles = 0
+        cache = CompiledPartsCache()
+
+        cache.compile_for_preview(CountingWidget(radius=4))
+        cache.compile_for_preview(CountingWidget(radius=5))
+
+        assert CountingWidget.compiles == 2
+        assert len(cache) == 2
+
+    def test_sessions_export_shared_parts_concurrently(self):
+        from partomatic.tessellation import mesh_shapes
+
+        cache = CompiledPartsCache()
+        alice, bob = Widget(radius=4), Widget(radius=4)
+        cache.compile_for_preview(alice)
+        cache.compile_for_preview(bob)
+        assert alice.parts[0] is bob.parts[0]
+        expected = io.BytesIO()
+        fresh = Widget(radius=4)
+        fresh.compile()
+        fresh.export_to_stream("stl", fresh.parts[0], expected)
+
+        calls, calls_lock = [], Lock()
+
+        def slow_mesh_shapes(*args, **kwargs):
+            with calls_lock:
+                calls.append(None)
+                first = len(calls) == 1
+            if not first:
+                # let the first export read while this one has cleaned the part
+                time.sleep(0.4)
+            mesh_shapes(*args, **kwargs)
+            if first:
+                # window for the other session to clean the shared shape
+                time.sleep(0.2)
+
+        streams = {}
+
+        def export(session):
+            streams[session] = io.BytesIO()
+            session.export_to_stream("stl", session.parts[0], streams[session])
+
+        with patch(
+            "partomatic.automatable_part.mesh_shapes", side_effect=slow_mesh_shapes
+        ):
+            threads = [Thread(target=export, args=(s,)) for s in (alice, bob)]
+            for thread in threads:
+                thread.start()
+                time.sleep(0.05)
+            for thread in threads:
+                thread.join()
+
+        assert len(calls) == 1
+        for stream in streams.values():
+            assert stream.getvalue()[80:] == expected.getvalue()[80:]
+
+    def test_oldest_entries_are_dropped(self):
+        cache = CompiledPartsCache(max_entries=2)
+
+        for key in ("a", "b", "c"):
+            cache.put(key, [key])
+
+        assert cache.get("a") is None
+        assert cache.get("c") == ["c"]
+
+
+class TestPartomaticSessionPool:
+    def test_sessions_get_independent_copies(self):
+        template = Widget(radius=4)
+        pool = PartomaticSessionPool(template)
+
+        alice, bob = pool.acquire("alice"), pool.acquire("bob")
+        alice._config.radius = 6
+
+        assert pool.acquire("alice") is alice
+        assert alice is not template and bob is not template
+        assert bob._config.radius == 4
+        assert template._config.radius == 4
+
+    def test_full_pool_drops_least_recently_used_session(self, clock):
+        pool = PartomaticSessionPool(Widget(), max_sessions=2)
+        first = pool.acquire("a")
+        pool.acquire("b")
+        pool.acquire("a")
+
+        pool.acquire("c")
+
+        assert "b" not in pool
+        assert pool.acquire("a") is first
+
+    def test_idle_sessions_are_dropped(self, clock):
+        pool = PartomaticSessionPool(Widget(), idle_timeout=60)
+        idle = pool.acquire("a")
+        clock[0] += 61
+
+        assert pool.acquire("a") is not idle
+        assert len(pool) == 1
+
+    def test_pool_needs_room_for_a_session(self):
+        with pytest.raises(ValueError, match="at least one session"):
+            PartomaticSessionPool(Widget(), max_sessions=0)
+
+
+class TestViewerPortPool:
+    def test_sessions_get_their_own_ports(self):
+        pool = ViewerPortPool(3939, max_viewers=3)
+
+        assert [pool.acquire(session) for session in "abc"] == [3939, 3940, 3941]
+        assert pool.acquire("b") == 3940
+
+        pool.release("a")
+        assert pool.acquire("d") == 3939
+
+    def test_full_pool_hands_over_least_recently_used_port(self):
+        pool = ViewerPortPool(3939, max_viewers=2)
+        pool.acquire("a")
+        pool.acquire("b")
+        pool.acquire("a")
+
+        assert pool.acquire("c") == 3940
+        assert pool.acquire("b") == 3939
+        assert len(pool) == 2
+
+    def test_pool_needs_room_for_a_viewer(self):
+        with pytest.raises(ValueError, match="at least one viewer"):
+            ViewerPortPool(3939, max_viewers=0)
@@ -0,0 +1,89 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event
+import time
+
+import pytest
+
+from partomatic import SingleFlight, config_hash, single_flight_compile
+from test_partomatic import Widget
+
+
+class GatedWidget(Widget):
+    compiles = 0
+    started = Event()
+    release = Event()
+
+    def compile(self):
+        type(self).compiles += 1
+        type(self).started.set()
+        type(self).release.wait(10)
+        super().compile()
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        started, release = Event(), Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            started.set()
+            release.wait(10)
+            return "done"
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            leader = executor.submit(flight.do, "key", work)
+            started.wait(10)
+            followers = [executor.submit(flight.do, "key", work) for _ in range(2)]
+            time.sleep(0.5)
+            release.set()
+            outcomes = [leader.result()] + [future.result() for future in followers]
+
+        assert calls == [1]
+        assert outcomes == [("done", True), ("done", False), ("done", False)]
+        assert len(flight) == 0
+
+    def test_finished_calls_are_not_cached(self):
+        flight = SingleFlight()
+
+        assert flight.do("key", lambda: 1) == (1, True)
+        assert flight.do("key", lambda: 2) == (2, True)
+
+    def test_errors_reach_every_caller(self):
+        flight = SingleFlight()
+        pending = Future()
+        joined = flight.submit("key", lambda: pending)
+
+        pending.set_exception(ValueError("radius too large"))
+
+        with pytest.raises(ValueError, match="radius too large"):
+            joined.result()
+        assert flight.submit("key", Future) is not pending
+
+
+class TestSingleFlightCompile:
+    def test_identical_configs_compile_once(self):
+        GatedWidget.compiles = 0
+        GatedWidget.started.clear()
+        GatedWidget.release.clear()
+        widgets = [GatedWidget(radius=4) for _ in range(3)]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(single_flight_compile, widget) for widget in widgets
+            ]
+            GatedWidget.started.wait(10)
+            # let the other callers reach the in-flight compile
+            time.sleep(0.5)
+            GatedWidget.release.set()
+            parts = [future.result() for future in futures]
+
+        assert GatedWidget.compiles == 1
+        assert parts[0][0] is parts[1][0] is parts[2][0]
+        assert not any(widget.is_dirty for widget in widgets)
+
+    def test_config_hash_follows_class_and_config(self):
+        assert config_hash(Widget(radius=4)) == config_hash(Widget(radius=4))
+        assert config_hash(Widget(radius=4)) != config_hash(Widget(radius=5))
+        assert config_hash(Widget(radius=4)) != config_hash(GatedWidget(radius=4))
@@ -0,0 +1,129 @@
+from dataclasses import field
+
+import numpy as np
+import pytest
+
+from partomatic import (
+    ConstraintViolationError,
+    InfeasibleConfigError,
+    PartomaticWorkerPool,
+    feasibility_check,
+    grid_points,
+    latin_hypercube_points,
+    partomate_sweep,
+    sweep_configurations,
+)
+from test_partomatic import FakeEnum, SubConfig, Widget, WidgetConfig
+
+
+class SweptConfig(WidgetConfig):
+    radius: float = field(default=8, metadata={"ge": 5, "le": 10})
+    sub: SubConfig = field(default_factory=SubConfig)
+
+    @feasibility_check(message="radius must stay below the length")
+    def radius_fits(self):
+        return self.radius < self.length
+
+
+class SweptWidget(Widget):
+    _config: SweptConfig = SweptConfig()
+
+
+class TestSweepPoints:
+    def test_grid_points_form_cartesian_product(self):
+        points = grid_points({"radius": np.linspace(6, 8, 3), "sub.sub_enum": ["TWO"]})
+
+        assert points == [
+            {"radius": 6.0, "sub.sub_enum": "TWO"},
+            {"radius": 7.0, "sub.sub_enum": "TWO"},
+            {"radius": 8.0, "sub.sub_enum": "TWO"},
+        ]
+        assert type(points[0]["radius"]) is float
+
+    def test_latin_hypercube_uses_every_stratum_once(self):
+        points = latin_hypercube_points(
+            {"radius": (5.0, 10.0), "length": (10, 19), "sub.sub_enum": ["ONE", "TWO"]},
+            samples=10,
+            seed=3,
+        )
+
+        radius_strata = sorted(int((point["radius"] - 5.0) / 0.5) for point in points)
+        assert radius_strata == list(range(10))
+        assert sorted(point["length"] for point in points) == list(range(10, 20))
+        assert [point["sub.sub_enum"] for point in points].count("ONE") == 5
+        assert points == latin_hypercube_points(
+            {"radius": (5.0, 10.0), "length": (10, 19), "sub.sub_enum": ["ONE", "TWO"]},
+            samples=10,
+            seed=3,
+        )
+
+    def test_latin_hypercube_needs_samples(self):
+        with pytest.raises(ValueError, match="at least one sample"):
+            latin_hypercube_points({"radius": (5.0, 10.0)}, samples=0)
+
+
+class TestSweepConfigurations:
+    def test_points_apply_nested_paths_and_check_constraints(self):
+        widget = SweptWidget()
+
+        (good_point, good), (_, bad) = sweep_configurations(
+            widget,
+            [{"radius": 6, "sub.sub_enum": "TWO"}, {"radius": 12}],
+        )
+
+        assert good_point == {"radius": 6, "sub.sub_enum": "TWO"}
+        assert good.radius == 6
+        assert good.sub.sub_enum == FakeEnum.TWO
+        assert isinstance(bad, ConstraintViolationError)
+        assert bad.violations == ["radius must be <= 10, got 12"]
+        assert widget._config.radius == 8
+
+    def test_infeasible_points_are_reported_before_compile(self):
+        (_, infeasible), (_, out_of_range) = sweep_configurations(
+            SweptWidget(), [{"radius": 9, "length": 8}, {"radius": 12, "length": 8}]
+        )
+
+        assert isinstance(infeasible, InfeasibleConfigError)
+        assert infeasible.violations == ["radius must stay below the length"]
+        assert type(out_of_range) is ConstraintViolationError
+
+    def test_unknown_paths_are_rejected(self):
+        with pytest.raises(ValueError, match="Unknown config field sub.missing"):
+            sweep_configurations(SweptWidget(), [{"sub.missing": 1}])
+        with pytest.raises(ValueError, match="is not nested"):
+            sweep_configurations(SweptWidget(), [{"radius.value": 1}])
+
+
+class TestPartomateSweep:
+    def test_sequential_sweep_skips_infeasible_points(self, tmp_path):
+        widget = SweptWidget(stl_folder=str(tmp_path))
+        points = grid_points({"radius": [6, 12], "file_suffix": ["-a"]})
+
+        results = partomate_sweep(widget, points, parallel=False)
+
+        assert [result.configuration for result in results] == points
+        assert results[0].ok
+        assert results[0].parts[0].export_paths["stl"].name == "test-a.stl"
+        assert isinstance(results[1].error, ConstraintViolationError)
+        assert widget._config.radius == 8
+        assert widget.parts == []
+
+    def test_parallel_sweep_builds_on_pool(self, tmp_path):
+        widget = SweptWidget(stl_folder=str(tmp_path))
+        points = [
+            {"radius": 6, "file_suffix": "-six"},
+            {"radius": 7, "file_suffix": "-seven"},
+        ]
+
+        with PartomaticWorkerPool(max_workers=2, preload_modules=[SweptWidget]) as pool:
+            results = partomate_sweep(widget, points, pool=pool)
+
+        assert [result.ok for result in results] == [True, True]
+        assert results[0].parts[0].volume > results[1].parts[0].volume
+        assert (tmp_path / "stls" / "test-seven.stl").exists()
+
+    def test_stop_on_error_raises_constraint_violations(self):
+        with pytest.raises(ConstraintViolationError):
+            partomate_sweep(
+                SweptWidget(), [{"radius": 1}], parallel=False, stop_on_error=True
+            )
@@ -0,0 +1,99 @@
+from OCP.BRep import BRep_Tool
+from OCP.TopLoc import TopLoc_Location
+import pytest
+
+from partomatic import (
+    PartomaticWorkerPool,
+    PreviewState,
+    partomate_batch,
+    shared_worker_pool,
+    shutdown_shared_worker_pool,
+)
+from test_partomatic import Widget
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with PartomaticWorkerPool(max_workers=1, preload_modules=[Widget]) as pool:
+        yield pool
+
+
+class TestPartomaticWorkerPool:
+    def test_preload_modules_accept_classes(self):
+        pool = PartomaticWorkerPool(max_workers=1, preload_modules=[Widget, "json"])
+        try:
+            assert pool.preload_modules[:3] == ("build123d", "OCP", "partomatic")
+            assert pool.preload_modules[3:] == ("test_partomatic", "json")
+        finally:
+            pool.shutdown()
+
+    def test_mesh_threads_are_shared_between_workers(self, monkeypatch):
+        monkeypatch.setattr("partomatic.worker_pool.os.cpu_count", lambda: 8)
+        pools = [
+            PartomaticWorkerPool(max_workers=3),
+            PartomaticWorkerPool(max_workers=16),
+            PartomaticWorkerPool(max_workers=2, mesh_threads=6),
+        ]
+        try:
+            assert [pool.mesh_threads for pool in pools] == [2, 1, 6]
+        finally:
+            for pool in pools:
+                pool.shutdown()
+
+    def test_compile_in_worker_updates_instance(self, pool):
+        widget = Widget(radius=4)
+
+        parts = pool.compile(widget)
+
+        assert widget.parts is parts
+        assert parts[0].part.volume == pytest.approx(
+            Widget(radius=4).complete_wheel().volume
+        )
+        assert widget.is_dirty is False
+
+    def test_compile_for_preview_meshes_parts_in_worker(self, pool):
+        widget = Widget(radius=4)
+
+        widget.compile_for_preview(pool=pool)
+
+        face = widget.parts[0].part.faces()[0]
+        assert BRep_Tool.Triangulation_s(face.wrapped, TopLoc_Location()) is not None
+        assert widget.preview_state == PreviewState.CLEAN
+
+    def test_submit_partomate_exports_and_releases(self, pool, tmp_path):
+        widget = Widget(stl_folder=str(tmp_path), file_suffix="")
+
+        parts = pool.submit_partomate(widget, formats=("3mf",)).result()
+
+        assert parts[0].is_released
+        assert parts[0].export_paths["stl"] == tmp_path / "stls" / "test.stl"
+        assert (tmp_path / "stls" / "test.3mf").exists()
+        assert widget.parts == []
+
+    def test_batch_runs_variants_on_pool(self, pool, tmp_path):
+        widget = Widget(stl_folder=str(tmp_path))
+
+        results = partomate_batch(
+            widget,
+            [{"radius": 9, "file_suffix": "-a"}, "not: [valid", {"file_suffix": "-b"}],
+            pool=pool,
+        )
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert results[0].parts[0].export_paths["stl"].name == "test-a.stl"
+        assert results[2].parts[0].volume < results[0].parts[0].volume
+        assert widget.parts == []
+
+
+class TestSharedWorkerPool:
+    def test_shared_pool_is_reused_until_shutdown(self):
+        try:
+            first = shared_worker_pool(max_workers=1)
+            assert shared_worker_pool() is first
+        finally:
+            shutdown_shared_worker_pool()
+        second = shared_worker_pool(max_workers=1)
+        try:
+            assert second is not first
+        finally:
+            shutdown_shared_worker_pool()